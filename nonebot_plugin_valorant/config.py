@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from nonebot import get_driver
 from pydantic import Extra, BaseSettings
@@ -8,6 +9,9 @@ __all__ = (
     "plugin_config",
 )
 
+# 运行时生成的数据保存在机器人工作目录的 data 下，不写入插件的安装目录
+DATA_PATH = Path.cwd() / "data" / "valorant"
+
 
 class Config(BaseSettings, extra=Extra.ignore):
     """
@@ -16,20 +20,108 @@ class Config(BaseSettings, extra=Extra.ignore):
     Attributes:
         valorant_database (str): The path to the Valorant database.
         valorant_database_key_path (str): The path to the key file for Valorant database encryption.
+        valorant_database_pool_size (int): The number of connections kept open in the database pool.
+        valorant_database_max_overflow (int): The connections allowed beyond the pool size under load.
+        valorant_database_pool_recycle (int): The seconds after which a pooled connection is replaced.
+        valorant_database_batch_size (int): The rows written or keys looked up by each bulk statement.
         valorant_proxies (str): The list of proxy URLs for Valorant requests.
         valorant_timeout (int): The timeout duration for Valorant requests in seconds.
         valorant_to_me (bool): Whether to receive Valorant messages only addressed to the bot.
         valorant_command (Union[str, List[str]]): The command or list of commands to trigger Valorant actions.
         language_type (str): The type of language to use in the application's responses.
+        valorant_http_pool_limit (int): The total number of pooled connections shared by all hosts.
+        valorant_http_pool_limit_per_host (int): The number of pooled connections kept for each host.
+        valorant_http_keepalive_timeout (float): The idle seconds before a pooled connection is closed.
+        valorant_http_dns_cache_ttl (int): The seconds a resolved host address is cached.
+        valorant_version_ttl (int): The seconds the valorant-api.com version data is cached.
+        valorant_rate_limit_per_second (float): The requests per second allowed for each Riot shard host.
+        valorant_rate_limit_burst (int): The burst size allowed for each Riot shard host.
+        valorant_rate_limit_max_retries (int): The times a rate limited request is queued again.
+        valorant_rate_limit_max_retry_after (float): The upper bound in seconds for honouring Retry-After.
+        valorant_retry_attempts (int): The times a failed idempotent request is retried.
+        valorant_retry_backoff_base (float): The base delay in seconds of the exponential backoff.
+        valorant_retry_backoff_max (float): The upper bound in seconds of a single backoff delay.
+        valorant_breaker_failure_threshold (int): The consecutive failures before a host is marked degraded.
+        valorant_breaker_recovery_timeout (float): The seconds a degraded host waits before being probed.
+        valorant_catalog_streaming (bool): Whether catalogs without a typed decoder are parsed and written item by item.
+        valorant_catalog_batch_size (int): The number of catalog items written to the database per batch.
+        valorant_catalog_concurrency (int): The number of catalog resources refreshed at the same time.
+        valorant_catalog_snapshot_path (Path): The offline catalog snapshot used to start without fetching the catalog.
+        valorant_prefetch_enabled (bool): Whether to prefetch every user's store after the daily rotation.
+        valorant_prefetch_delay (int): The minutes after 00:00 UTC at which the prefetch job runs.
+        valorant_prefetch_concurrency (int): The number of stores fetched at the same time.
+        valorant_prefetch_shard_concurrency (int): The number of stores fetched at the same time from one shard.
+        valorant_prefetch_render (bool): Whether to render each prefetched store into the render cache.
+        valorant_render_cache_size (int): The number of rendered images kept in memory.
+        valorant_render_cache_disk_quota (int): The bytes of rendered images kept on disk.
+        valorant_render_cache_path (Path): The directory holding rendered images on disk.
+        valorant_render_backend (str): The storefront renderer, "html" for the browser or "pillow" for Pillow.
+        valorant_render_font_path (str): The font file used by the Pillow renderer, needed for CJK names.
+        valorant_render_font_size (int): The font size in pixels used by the Pillow renderer.
+        valorant_render_workers (int): The number of worker processes composing images.
+        valorant_asset_concurrency (int): The number of skin icons downloaded at the same time.
+        valorant_asset_attempts (int): The attempts made for each skin icon whose download is cut off mid-body.
+        valorant_asset_path (Path): The directory of the content-addressed asset store.
+        valorant_asset_disk_quota (int): The bytes of assets kept on disk before the least used are evicted.
+        valorant_asset_webp (bool): Whether to keep a WebP thumbnail of each icon for the browser renderer.
+        valorant_tile_cache_path (Path): The directory holding pre-rendered skin card tiles.
+        valorant_tile_cache_disk_quota (int): The bytes of tiles kept on disk before the least used are deleted.
+        valorant_render_job_timeout (float): The seconds an image composition job may run.
+        valorant_render_pages (int): The number of browser pages kept open for rendering.
+        valorant_render_timeout (float): The seconds a render may wait for a page or for images to load.
     """
 
     valorant_database: str = ""
     valorant_database_key_path: str = ""
+    valorant_database_pool_size: int = 10
+    valorant_database_max_overflow: int = 20
+    valorant_database_pool_recycle: int = 3600
+    valorant_database_batch_size: int = 500
     valorant_proxies: str = ""
     valorant_timeout: int
     valorant_to_me: bool = True
     valorant_command: str | list[str] = ""
     language_type: str = ""
+    valorant_http_pool_limit: int = 100
+    valorant_http_pool_limit_per_host: int = 10
+    valorant_http_keepalive_timeout: float = 60
+    valorant_http_dns_cache_ttl: int = 300
+    valorant_version_ttl: int = 3600
+    valorant_rate_limit_per_second: float = 5
+    valorant_rate_limit_burst: int = 10
+    valorant_rate_limit_max_retries: int = 3
+    valorant_rate_limit_max_retry_after: float = 60
+    valorant_retry_attempts: int = 2
+    valorant_retry_backoff_base: float = 0.5
+    valorant_retry_backoff_max: float = 8
+    valorant_breaker_failure_threshold: int = 5
+    valorant_breaker_recovery_timeout: float = 30
+    valorant_catalog_streaming: bool = True
+    valorant_catalog_batch_size: int = 200
+    valorant_catalog_concurrency: int = 4
+    valorant_catalog_snapshot_path: Path = DATA_PATH / "catalog.snapshot"
+    valorant_prefetch_enabled: bool = True
+    valorant_prefetch_delay: int = 5
+    valorant_prefetch_concurrency: int = 8
+    valorant_prefetch_shard_concurrency: int = 4
+    valorant_prefetch_render: bool = True
+    valorant_render_cache_size: int = 128
+    valorant_render_cache_disk_quota: int = 256 * 1024 * 1024
+    valorant_render_cache_path: Path = DATA_PATH / "render_cache"
+    valorant_render_backend: Literal["html", "pillow"] = "html"
+    valorant_render_font_path: str = ""
+    valorant_render_font_size: int = 16
+    valorant_render_workers: int = 2
+    valorant_asset_concurrency: int = 8
+    valorant_asset_attempts: int = 3
+    valorant_asset_path: Path = DATA_PATH / "assets"
+    valorant_asset_disk_quota: int = 512 * 1024 * 1024
+    valorant_asset_webp: bool = True
+    valorant_tile_cache_path: Path = DATA_PATH / "tiles"
+    valorant_tile_cache_disk_quota: int = 64 * 1024 * 1024
+    valorant_render_job_timeout: float = 10
+    valorant_render_pages: int = 2
+    valorant_render_timeout: float = 30
     resource_path = Path(__file__).parent / "resources" / "image" / "skin"
 
 
@@ -1,39 +1,99 @@
+import asyncio
+from datetime import datetime
+from collections.abc import AsyncIterator
+
 from nonebot import get_driver
 from nonebot.log import logger
-from cryptography.fernet import Fernet
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy_utils import create_database, database_exists
+from sqlalchemy import text, select, inspect, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from nonebot_plugin_valorant.config import plugin_config
 from nonebot_plugin_valorant.utils.errors import DatabaseError
-from nonebot_plugin_valorant.database.models import Tier, User, Version, BaseModel, SkinsStore, WeaponSkins  # UserShop,
+from nonebot_plugin_valorant.database.models import (  # UserShop,
+    Tier,
+    User,
+    Version,
+    BaseModel,
+    SkinsStore,
+    CatalogItem,
+    WeaponSkins,
+)
+
+
+def _engine_options(url: str) -> dict:
+    """连接池参数，SQLite 使用 SQLAlchemy 默认的连接池。"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": plugin_config.valorant_database_pool_size,
+        "max_overflow": plugin_config.valorant_database_max_overflow,
+        "pool_recycle": plugin_config.valorant_database_pool_recycle,
+        "pool_pre_ping": True,
+    }
 
-async_engine = create_async_engine(plugin_config.valorant_database)
+
+async_engine = create_async_engine(plugin_config.valorant_database, **_engine_options(plugin_config.valorant_database))
+# 每个操作使用独立的会话，提交后对象仍可读取
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine,
     class_=AsyncSession,
+    expire_on_commit=False,
 )
-session = AsyncSessionLocal()
 
-# 生成密钥
-database_key = Fernet.generate_key()
+_cipher_suite = None
+
+
+def _get_cipher_suite():
+    # cryptography 在首次加解密时才导入并生成密钥
+    global _cipher_suite
+    if _cipher_suite is None:
+        from cryptography.fernet import Fernet
 
-cipher_suite = Fernet(database_key)
+        _cipher_suite = Fernet(Fernet.generate_key())
+    return _cipher_suite
 
 
 def encrypt_data(data: str) -> bytes:
-    return cipher_suite.encrypt(data.encode())
+    return _get_cipher_suite().encrypt(data.encode())
 
 
 def decrypt_data(encrypted_data: bytes) -> str:
-    return cipher_suite.decrypt(encrypted_data).decode()
+    return _get_cipher_suite().decrypt(encrypted_data).decode()
 
 
 def calculate_hash(data: str) -> int:
     return hash(data)
 
 
+def _add_missing_columns(connection) -> list[str]:
+    """
+    为已有的表添加模型中存在而表中缺少的列。
+
+    create_all 不会修改已有的表，模型新增列后由此补齐；新增的列均可为空，不设默认值。
+
+    Returns:
+        list[str]: 添加的列，格式为 "表名.列名"。
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    added = []
+    for table in BaseModel.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(
+                text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                )
+            )
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
 class DB:
     @classmethod
     async def init(cls):
@@ -51,9 +111,17 @@ class DB:
         """
         创建数据库（如果不存在）。
         """
+        from sqlalchemy_utils import create_database, database_exists
+
+        url = async_engine.url
+        # sqlalchemy_utils 只支持同步驱动
+        if url.get_backend_name() == "mysql":
+            url = url.set(drivername="mysql+pymysql")
+        else:
+            url = url.set(drivername=url.get_backend_name())
         try:
-            if not database_exists(async_engine.url):
-                create_database(async_engine.url)
+            if not await asyncio.to_thread(database_exists, url):
+                await asyncio.to_thread(create_database, url)
                 logger.debug("创建数据库成功")
         except SQLAlchemyError as e:
             logger.error(f"创建数据库失败{e}")
@@ -61,14 +129,25 @@ class DB:
     @staticmethod
     async def _create_tables():
         """
-        创建表格。
+        创建表格，并为已有的表补充模型中新增的列。
         """
         try:
-            BaseModel.metadata.create_all(async_engine)
+            async with async_engine.begin() as conn:
+                await conn.run_sync(BaseModel.metadata.create_all)
+                added = await conn.run_sync(_add_missing_columns)
+            if added:
+                logger.info(f"已为数据表补充列: {', '.join(added)}")
             logger.info("创建表成功")
         except SQLAlchemyError as e:
             logger.error(f"创建表失败{e}")
 
+    @classmethod
+    async def upgrade(cls):
+        """
+        升级已有数据库的表结构，缺少的表和列会被创建，可重复执行。
+        """
+        await cls._create_tables()
+
     @staticmethod
     async def close():
         """
@@ -84,7 +163,8 @@ class DB:
         参数:
         - kwargs: 包含用户信息的关键字参数。
         """
-        await User.add(session, **kwargs)
+        async with AsyncSessionLocal.begin() as session:
+            await User.add(session, **kwargs)
 
     @classmethod
     async def logout(cls, qq_uid: str):
@@ -94,7 +174,8 @@ class DB:
         参数:
         - qq_uid: 用户的 QQ UID。
         """
-        await User.delete(session, qq_uid=qq_uid)
+        async with AsyncSessionLocal.begin() as session:
+            await User.delete(session, qq_uid=qq_uid)
         # todo 级联删除用户的所有数据(shop, user, misson, etc.)
 
     @classmethod
@@ -108,7 +189,46 @@ class DB:
         返回值:
         - user: 用户信息(Dict)。
         """
-        return (await User.get(session, qq_uid=qq_uid)).first()
+        async with AsyncSessionLocal() as session:
+            return (await User.get(session, qq_uid=qq_uid)).first()
+
+    @classmethod
+    async def get_users(cls, qq_uids: list[str]) -> dict[str, User]:
+        """
+        批量获取用户信息。
+
+        参数:
+        - qq_uids: 用户的 QQ UID 列表。
+
+        返回值:
+        - users: QQ UID 到用户信息的字典，按 qq_uids 的顺序排列，未登录的用户不包含在内。
+        """
+        async with AsyncSessionLocal() as session:
+            return await User.get_many(session, "qq_uid", qq_uids, plugin_config.valorant_database_batch_size)
+
+    @classmethod
+    async def iter_users(cls, batch_size: int = plugin_config.valorant_database_batch_size) -> AsyncIterator[User]:
+        """
+        按 puuid 分页遍历所有用户，每页使用一次短查询，不长期占用连接。
+
+        参数:
+        - batch_size: 每页的用户数。
+
+        返回值:
+        - users: 用户信息的异步迭代器。
+        """
+        last = ""
+        while True:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(User).where(User.puuid > last).order_by(User.puuid).limit(batch_size)
+                )
+                users = result.scalars().all()
+            for user in users:
+                yield user
+            if len(users) < batch_size:
+                return
+            last = users[-1].puuid
 
     @classmethod
     async def update_user(cls, filter_by: dict, update_values: dict):
@@ -116,11 +236,55 @@ class DB:
         更新用户信息。
 
         参数:
-        - session: SQLAlchemy 的 Session 对象。
         - filter_by: 用于筛选记录的字段和值。
         - update_values: 用于更新记录的字段和新值。
         """
-        await User.update(session, filter_by=filter_by, update_values=update_values)
+        async with AsyncSessionLocal.begin() as session:
+            await User.update(session, filter_by=filter_by, update_values=update_values)
+
+    @classmethod
+    async def upsert_skins(cls, data: dict) -> int:
+        """
+        批量写入皮肤信息，已存在的皮肤按 uuid 覆盖。
+
+        参数:
+        - data: uuid 到皮肤数据的字典，即 `get_skin` 的返回值。
+
+        返回值:
+        - 写入的条数。
+        """
+        async with AsyncSessionLocal.begin() as session:
+            return await WeaponSkins.upsert(session, list(data.values()), plugin_config.valorant_database_batch_size)
+
+    @classmethod
+    async def upsert_tiers(cls, data: dict) -> int:
+        """
+        批量写入皮肤等级信息，已存在的等级按 uuid 覆盖。
+
+        参数:
+        - data: uuid 到等级数据的字典，即 `get_tier` 的返回值。
+
+        返回值:
+        - 写入的条数。
+        """
+        async with AsyncSessionLocal.begin() as session:
+            return await Tier.upsert(session, list(data.values()), plugin_config.valorant_database_batch_size)
+
+    @classmethod
+    async def upsert_catalog(cls, category: str, data: dict) -> int:
+        """
+        批量写入没有独立数据表的目录资源，已存在的条目按 (category, uuid) 覆盖。
+
+        参数:
+        - category: 目录资源名称。
+        - data: uuid 到资源数据的字典。
+
+        返回值:
+        - 写入的条数。
+        """
+        rows = [{"category": category, "uuid": str(uuid), "data": item} for uuid, item in data.items()]
+        async with AsyncSessionLocal.begin() as session:
+            return await CatalogItem.upsert(session, rows, plugin_config.valorant_database_batch_size)
 
     @classmethod
     async def cache_skin(cls, data: dict):
@@ -128,13 +292,10 @@ class DB:
         缓存商店信息。
 
         参数:
+        - data: uuid 到皮肤数据的字典。
         """
-        for uuid, skin_data in data.items():
-            existing_skin = await WeaponSkins.get(session, uuid=uuid)
-            if existing_skin.first() is not None:
-                continue
-            await WeaponSkins.add(session, **skin_data)
-        logger.info("skin缓存完成")
+        count = await cls.upsert_skins(data)
+        logger.info(f"skin缓存完成, 共 {count} 条")
 
     @classmethod
     async def cache_tier(cls, data: dict):
@@ -142,13 +303,21 @@ class DB:
         缓存段位信息。
 
         参数:
+        - data: uuid 到等级数据的字典。
         """
-        for uuid, tier_data in data.items():
-            existing_tier = await Tier.get(session, uuid=uuid)
-            if existing_tier.first() is not None:
-                continue
-            await Tier.add(session, **tier_data)
-        logger.info("tier缓存完成")
+        count = await cls.upsert_tiers(data)
+        logger.info(f"tier缓存完成, 共 {count} 条")
+
+    @classmethod
+    async def cache_catalog(cls, category: str, data: dict):
+        """
+        批量缓存没有独立数据表的目录资源。
+
+        参数:
+        - category: 目录资源名称。
+        - data: uuid 到资源数据的字典。
+        """
+        await cls.upsert_catalog(category, data)
 
     # @classmethod
     # async def cache_version(cls, data: Dict):
@@ -168,14 +337,15 @@ class DB:
         返回值:
         - version: 版本信息。
         """
-        if args:
-            columns = [getattr(Version, name, None) for name in args]
-            if any(column is None for column in columns):
-                invalid_columns = [name for name, column in zip(args, columns) if column is None]
-                raise ValueError(f"无效的列名: {invalid_columns}")
-            return session.query(*columns).first()
-        else:
-            return session.query(Version).first()
+        async with AsyncSessionLocal() as session:
+            if args:
+                columns = [getattr(Version, name, None) for name in args]
+                if any(column is None for column in columns):
+                    invalid_columns = [name for name, column in zip(args, columns) if column is None]
+                    raise ValueError(f"无效的列名: {invalid_columns}")
+                return (await Version.get(session, *columns)).first()
+            else:
+                return (await Version.get(session)).first()
 
     @classmethod
     async def update_version(cls, **kwargs):
@@ -191,18 +361,21 @@ class DB:
             raise DatabaseError("版本信息不存在") from e
 
         if version_cache is None:
-            await Version.add(session, **kwargs)
+            async with AsyncSessionLocal.begin() as session:
+                await Version.add(session, **kwargs)
         elif version_cache.manifestId == kwargs["manifestId"]:
             logger.info("版本信息已是最新")
 
         else:
-            await Version.add(session, **kwargs)
-            await Version.delete(session, manifestId=version_cache.manifestId)
+            async with AsyncSessionLocal.begin() as session:
+                await Version.add(session, **kwargs)
+                await Version.delete(session, manifestId=version_cache.manifestId)
             logger.info("版本信息已刷新")
 
     @classmethod
     async def init_version(cls, filter_by: dict, update_value: dict):
-        await Version.update(session, filter_by, update_value)
+        async with AsyncSessionLocal.begin() as session:
+            await Version.update(session, filter_by, update_value)
 
     # @classmethod
     # async def update_user_store_offer(cls, **kwargs: object):
@@ -235,7 +408,21 @@ class DB:
         返回值:
         - skins: 武器皮肤信息。
         """
-        return (await WeaponSkins.get(session, uuid=uuid)).first()
+        return (await cls.get_skins([uuid])).get(uuid)
+
+    @classmethod
+    async def get_skins(cls, uuids: list[str]) -> dict[str, WeaponSkins]:
+        """
+        批量获取武器皮肤信息。
+
+        参数:
+        - uuids: 武器皮肤的 UUID 列表。
+
+        返回值:
+        - skins: UUID 到武器皮肤信息的字典，按 uuids 的顺序排列，不存在的皮肤不包含在内。
+        """
+        async with AsyncSessionLocal() as session:
+            return await WeaponSkins.get_many(session, "uuid", uuids, plugin_config.valorant_database_batch_size)
 
     @classmethod
     async def get_all_skins_icon(cls):
@@ -245,40 +432,101 @@ class DB:
         返回值:
         - skins: 武器皮肤图标。
         """
-        return (await WeaponSkins.get(session, WeaponSkins.uuid, WeaponSkins.icon)).all()
+        async with AsyncSessionLocal() as session:
+            return (await WeaponSkins.get(session, WeaponSkins.uuid, WeaponSkins.icon)).all()
+
+    @classmethod
+    async def get_skin_index_rows(cls):
+        """
+        获取构建皮肤索引所需的列。
+
+        返回值:
+        - skins: (uuid, names, icon, tier) 列表。
+        """
+        async with AsyncSessionLocal() as session:
+            return (
+                await WeaponSkins.get(session, WeaponSkins.uuid, WeaponSkins.names, WeaponSkins.icon, WeaponSkins.tier)
+            ).all()
+
+    @classmethod
+    async def get_all_tiers(cls):
+        """
+        获取所有皮肤等级信息。
+
+        返回值:
+        - tiers: (uuid, name, icon) 列表。
+        """
+        async with AsyncSessionLocal() as session:
+            return (await Tier.get(session, Tier.uuid, Tier.name, Tier.icon)).all()
 
     @classmethod
     async def cache_player_skins_store(cls, **kwargs):
         """
-        缓存用户商店信息。
+        缓存用户商店信息，已存在的记录按 puuid 覆盖。
 
         参数:
         - kwargs: 包含用户商店信息的关键字参数。
         """
-        await SkinsStore.add(session, **kwargs)
+        async with AsyncSessionLocal.begin() as session:
+            await SkinsStore.upsert(session, [kwargs])
 
     @classmethod
-    async def delete_player_skins_store(cls, qq_uid: str):
+    async def delete_player_skins_store(cls, puuid: str):
         """
         删除用户商店信息。
 
         参数:
-        - qq_uid: 用户的 QQ UID。
+        - puuid: 用户的 Riot PUUID。
         """
-        await SkinsStore.delete(session, qq_uid=qq_uid)
+        async with AsyncSessionLocal.begin() as session:
+            await SkinsStore.delete(session, puuid=puuid)
 
     @classmethod
-    async def get_player_skins_store(cls, qq_uid: str):
+    async def get_player_skins_store(cls, puuid: str):
         """
         获取用户商店信息。
 
         参数:
-        - qq_uid: 用户的 QQ UID。
+        - puuid: 用户的 Riot PUUID。
 
         返回值:
         - skins: 用户商店信息。
         """
-        return (await SkinsStore.get(session, qq_uid=qq_uid)).first()
+        return (await cls.get_player_stores([puuid])).get(puuid)
+
+    @classmethod
+    async def get_player_stores(cls, puuids: list[str]) -> dict[str, SkinsStore]:
+        """
+        批量获取用户商店信息。
+
+        参数:
+        - puuids: 用户的 Riot PUUID 列表。
+
+        返回值:
+        - stores: PUUID 到用户商店信息的字典，按 puuids 的顺序排列，不存在的商店不包含在内。
+        """
+        async with AsyncSessionLocal() as session:
+            return await SkinsStore.get_many(session, "puuid", puuids, plugin_config.valorant_database_batch_size)
+
+    @classmethod
+    async def get_active_offers(cls, now: datetime) -> set[tuple[str, int]]:
+        """
+        获取所有未过期商店中的皮肤报价。
+
+        参数:
+        - now: 当前 UTC 时间(不含时区信息)。
+
+        返回值:
+        - offers: (皮肤 UUID, 价格) 的集合。
+        """
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(SkinsStore).where(SkinsStore.expiry > now))
+            return {
+                (getattr(store, f"offer_{i}"), getattr(store, f"cost_{i}"))
+                for store in result.scalars()
+                for i in range(1, 5)
+                if getattr(store, f"offer_{i}") is not None
+            }
 
 
 get_driver().on_shutdown(DB.close)
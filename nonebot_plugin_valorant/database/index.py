@@ -0,0 +1,180 @@
+import asyncio
+from typing import Any
+
+import msgspec
+from nonebot.log import logger
+
+from nonebot_plugin_valorant.database.db import DB
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.database.snapshot import CatalogSnapshot
+
+
+class SkinEntry(msgspec.Struct, frozen=True, gc=False):
+    """索引中的武器皮肤，只保留配置语言的名称。"""
+
+    name: str | None
+    icon: str | None
+    tier: str | None
+
+
+class TierEntry(msgspec.Struct, frozen=True, gc=False):
+    """索引中的皮肤等级。"""
+
+    name: str | None
+    icon: str | None
+
+
+class _Snapshot(msgspec.Struct):
+    manifest_id: str | None
+    skins: dict[str, SkinEntry]
+    tiers: dict[str, TierEntry]
+
+
+def _localized(names: Any) -> str | None:
+    if isinstance(names, dict):
+        return names.get(plugin_config.language_type)
+    return names
+
+
+def _skin_entry(names: Any, icon: str | None, tier: str | None) -> SkinEntry:
+    return SkinEntry(name=_localized(names), icon=icon, tier=None if tier == "None" else tier)
+
+
+class CatalogIndex:
+    """
+    武器皮肤与皮肤等级的内存索引。
+
+    索引在启动时从数据库整体加载，之后按资源清单值(manifestId)整体替换：
+    新索引构建完成后才替换旧索引，查询方始终看到完整的一份数据。
+    索引中不存在的皮肤会回源数据库并补入当前索引。
+
+    挂载了离线快照(见 `database.snapshot`)且快照的资源清单值与数据库一致，或数据库中尚无目录时，
+    加载索引不再扫描数据库，未命中的皮肤先从快照中按需解码，再回源数据库。
+    """
+
+    def __init__(self) -> None:
+        self._snapshot = _Snapshot(manifest_id=None, skins={}, tiers={})
+        self._mapped: CatalogSnapshot | None = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def manifest_id(self) -> str | None:
+        """当前索引对应的资源清单值。"""
+        return self._snapshot.manifest_id
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def mapped(self) -> CatalogSnapshot | None:
+        """当前挂载的离线快照。"""
+        return self._mapped
+
+    def attach(self, snapshot: CatalogSnapshot) -> None:
+        """
+        挂载离线快照，在下次 `load` 时生效。
+
+        Args:
+            snapshot: 已打开的快照。
+        """
+        if self._mapped is not None and self._mapped is not snapshot:
+            self._mapped.close()
+        self._mapped = snapshot
+
+    def _detach(self) -> None:
+        if self._mapped is not None:
+            logger.info(f"目录快照 {self._mapped.manifest_id} 已过期, 改用数据库")
+            self._mapped.close()
+            self._mapped = None
+
+    async def load(self, manifest_id: str | None = None) -> None:
+        """
+        从数据库重建索引并替换当前索引。
+
+        Args:
+            manifest_id: 数据库中目录数据对应的资源清单值，默认读取 Version 表。
+        """
+        async with self._lock:
+            if manifest_id is None:
+                version = await DB.get_version("manifestId")
+                manifest_id = version[0] if version else None
+            mapped = self._mapped
+            if mapped is not None and manifest_id in (None, mapped.manifest_id):
+                self._snapshot = _Snapshot(manifest_id=mapped.manifest_id, skins={}, tiers={})
+                self._loaded = True
+                logger.info(f"皮肤索引使用目录快照: {mapped.skin_count} 个皮肤, 资源清单值 {mapped.manifest_id}")
+                return
+            self._detach()
+            skins = {uuid: _skin_entry(names, icon, tier) for uuid, names, icon, tier in await DB.get_skin_index_rows()}
+            tiers = {uuid: TierEntry(name=name, icon=icon) for uuid, name, icon in await DB.get_all_tiers()}
+            self._snapshot = _Snapshot(manifest_id=manifest_id, skins=skins, tiers=tiers)
+            self._loaded = True
+        logger.info(f"皮肤索引已加载: {len(skins)} 个皮肤, {len(tiers)} 个等级, 资源清单值 {manifest_id}")
+
+    async def refresh(self, manifest_id: str) -> None:
+        """
+        资源清单值与当前索引不一致时重建索引。
+
+        Args:
+            manifest_id: 最新的资源清单值。
+        """
+        if not self._loaded or manifest_id != self.manifest_id:
+            await self.load(manifest_id)
+
+    async def get_skin(self, uuid: str) -> SkinEntry | None:
+        """
+        获取武器皮肤，索引未命中时回源数据库。
+
+        Args:
+            uuid: 武器皮肤的 UUID。
+
+        Returns:
+            SkinEntry | None: 武器皮肤，数据库中也不存在时为 None。
+        """
+        return (await self.get_skins([uuid])).get(uuid)
+
+    async def get_skins(self, uuids: list[str]) -> dict[str, SkinEntry]:
+        """
+        批量获取武器皮肤，索引未命中的皮肤合并为一次数据库查询。
+
+        Args:
+            uuids: 武器皮肤的 UUID 列表。
+
+        Returns:
+            dict[str, SkinEntry]: UUID 到武器皮肤的字典，按 uuids 的顺序排列，不存在的皮肤不包含在内。
+        """
+        if not self._loaded:
+            await self.load()
+        snapshot = self._snapshot
+        missing = [uuid for uuid in uuids if uuid not in snapshot.skins]
+        if missing and self._mapped is not None:
+            for uuid in missing:
+                if (skin := self._mapped.get_skin(uuid)) is not None:
+                    snapshot.skins[uuid] = _skin_entry(skin["names"], skin["icon"], skin["tier"])
+            missing = [uuid for uuid in missing if uuid not in snapshot.skins]
+        if missing:
+            for uuid, skin in (await DB.get_skins(missing)).items():
+                snapshot.skins[uuid] = _skin_entry(skin.names, skin.icon, skin.tier)
+        return {uuid: snapshot.skins[uuid] for uuid in uuids if uuid in snapshot.skins}
+
+    def get_tier(self, uuid: str | None) -> TierEntry | None:
+        """
+        获取皮肤等级。
+
+        Args:
+            uuid: 皮肤等级的 UUID。
+
+        Returns:
+            TierEntry | None: 皮肤等级，不存在时为 None。
+        """
+        if not uuid:
+            return None
+        tier = self._snapshot.tiers.get(uuid)
+        if tier is None and self._mapped is not None and (record := self._mapped.get_tier(uuid)) is not None:
+            tier = self._snapshot.tiers[uuid] = TierEntry(name=record["name"], icon=record["icon"])
+        return tier
+
+
+catalog_index = CatalogIndex()
@@ -1,5 +1,10 @@
-from sqlalchemy.orm import Mapped, Session, declarative_base
-from sqlalchemy import DDL, JSON, BIGINT, VARCHAR, Column, Boolean, DateTime, func, event
+from collections.abc import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Result, ScalarResult
+from sqlalchemy.orm import Mapped, declarative_base
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+from sqlalchemy import DDL, JSON, BIGINT, VARCHAR, Column, Boolean, DateTime, func, event, delete, select, update
 
 Base = declarative_base()
 
@@ -13,26 +18,36 @@ class BaseModel(Base):
         __abstract__ (bool): True if this is an abstract class, False otherwise.
 
     Methods:
-        get(cls, session: Session, **kwargs):
-            Retrieve a list of instances of the model that match the provided keyword arguments.
+        get(cls, session: AsyncSession, *args, **kwargs):
+            Retrieve the instances (or the given columns) of the model that match the provided keyword arguments.
 
-        add(cls, session: Session, **kwargs):
+        add(cls, session: AsyncSession, **kwargs):
             Create a new instance of the model with the provided keyword arguments and add it to the session.
 
-        delete(cls, session: Session, **kwargs) -> bool:
+        delete(cls, session: AsyncSession, **kwargs) -> bool:
             Delete the instance(s) of the model that match the provided keyword arguments.
 
-        update(cls, q, **kwargs) -> bool:
-            Update the instance(s) of the model that match the provided query and keyword arguments.
+        update(cls, session: AsyncSession, filter_by: dict, update_values: dict):
+            Update the instance(s) of the model that match the provided filter.
+
+        merge_all(cls, session: AsyncSession, rows: list[dict]):
+            Insert or replace the instances described by rows, matched on primary key.
+
+        upsert(cls, session: AsyncSession, rows: list[dict], chunk_size: int = 500) -> int:
+            Insert or replace rows in chunked multi-row statements, matched on primary key.
+
+        get_many(cls, session: AsyncSession, key: str, values: Iterable, chunk_size: int = 500) -> dict:
+            Retrieve the instances whose column `key` is in values with chunked IN queries, keyed by that column.
 
     Note:
         - This class does not have a constructor (__init__) as it is an abstract class.
-        - The methods in this class are asynchronous.
+        - The methods in this class are asynchronous and never commit; the caller owns the transaction,
+          e.g. ``async with AsyncSessionLocal.begin() as session``.
 
     Example usage:
 
         # Get instance(s)
-        instances = await BaseModel.get(session, name='John')
+        instances = (await BaseModel.get(session, name='John')).all()
 
         # Add new instance
         await BaseModel.add(session, name='John', age=30)
@@ -41,43 +56,108 @@ class BaseModel(Base):
         deleted = await BaseModel.delete(session, age=30)
 
         # Update instance(s)
-        updated = await BaseModel.update(session, {'name': 'John'}, age=40)
+        await BaseModel.update(session, {'name': 'John'}, {'age': 40})
     """
 
     __abstract__ = True
 
     @classmethod
-    async def get(cls, session: Session, *args, **kwargs):
-        if args:
-            query = session.query(*args)
-        else:
-            query = session.query(cls)
+    async def get(cls, session: AsyncSession, *args, **kwargs) -> Result | ScalarResult:
+        query = select(*args) if args else select(cls)
 
         if kwargs:
             query = query.filter_by(**kwargs)
 
-        return query
+        result = await session.execute(query)
+        return result if args else result.scalars()
+
+    @classmethod
+    async def add(cls, session: AsyncSession, **kwargs):
+        session.add(cls(**kwargs))
 
     @classmethod
-    async def add(cls, session: Session, **kwargs):
-        instance = cls(**kwargs)
-        session.add(instance)
-        session.commit()
+    async def delete(cls, session: AsyncSession, **kwargs) -> bool:
+        result = await session.execute(delete(cls).filter_by(**kwargs))
+        return result.rowcount > 0
 
     @classmethod
-    async def delete(cls, session: Session, **kwargs) -> bool:
-        query = session.query(cls).filter_by(**kwargs).first()
-        if query is not None:
-            session.delete(query)
-            session.commit()
-            return True
-        return False
+    async def update(cls, session: AsyncSession, filter_by: dict, update_values: dict):
+        await session.execute(update(cls).filter_by(**filter_by).values(**update_values))
 
     @classmethod
-    async def update(cls, session: Session, filter_by: dict, update_values: dict):
-        query = session.query(cls).filter_by(**filter_by)
-        query.update(update_values)
-        session.commit()
+    async def merge_all(cls, session: AsyncSession, rows: list[dict]):
+        for row in rows:
+            await session.merge(cls(**row))
+
+    @classmethod
+    async def upsert(cls, session: AsyncSession, rows: list[dict], chunk_size: int = 500) -> int:
+        """
+        按主键批量插入或覆盖，每 chunk_size 行生成一条语句。
+
+        MySQL 使用 ON DUPLICATE KEY UPDATE，PostgreSQL 与 SQLite 使用 ON CONFLICT DO UPDATE，
+        其他数据库退回逐行 merge。
+
+        Args:
+            session: 数据库会话。
+            rows: 行数据，所有行的键须一致。
+            chunk_size: 每条语句包含的行数。
+
+        Returns:
+            int: 写入的行数。
+        """
+        if not rows:
+            return 0
+
+        dialect = session.get_bind().dialect.name
+        primary_keys = {column.name for column in cls.__table__.primary_key}
+        columns = [name for name in rows[0] if name not in primary_keys]
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            if dialect == "mysql":
+                stmt = mysql.insert(cls).values(chunk)
+                if columns:
+                    stmt = stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in columns})
+                else:
+                    stmt = stmt.prefix_with("IGNORE")
+            elif dialect in ("postgresql", "sqlite"):
+                stmt = (postgresql if dialect == "postgresql" else sqlite).insert(cls).values(chunk)
+                if columns:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=list(primary_keys),
+                        set_={name: stmt.excluded[name] for name in columns},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=list(primary_keys))
+            else:
+                await cls.merge_all(session, chunk)
+                continue
+            await session.execute(stmt)
+        return len(rows)
+
+    @classmethod
+    async def get_many(cls, session: AsyncSession, key: str, values: Iterable, chunk_size: int = 500) -> dict:
+        """
+        按列值批量查询，每 chunk_size 个值执行一条 IN 查询。
+
+        Args:
+            session: 数据库会话。
+            key: 查询的列名。
+            values: 列值，重复值只查询一次。
+            chunk_size: 每条查询包含的值数量。
+
+        Returns:
+            dict: 列值到实例的字典，按 values 中首次出现的顺序排列，不存在的值不包含在内。
+        """
+        values = list(dict.fromkeys(values))
+        column = getattr(cls, key)
+        found = {}
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start : start + chunk_size]
+            result = await session.execute(select(cls).where(column.in_(chunk)))
+            for instance in result.scalars():
+                found[getattr(instance, key)] = instance
+        return {value: found[value] for value in values if value in found}
 
     # @classmethod
     # async def get_all(cls, session: Session, *args):
@@ -124,7 +204,13 @@ class SkinsStore(BaseModel):
         offer_2 (str): Currency offer ID 2.
         offer_3 (str): Currency offer ID 3.
         offer_4 (str): Currency offer ID 4.
+        cost_1 (int): Price of offer 1.
+        cost_2 (int): Price of offer 2.
+        cost_3 (int): Price of offer 3.
+        cost_4 (int): Price of offer 4.
+        currency (str): Currency ID of the prices.
         duration (inT): Duration of the store.
+        expiry (datetime): UTC time at which the offers rotate.
         timestamp (datetime): Timestamp of the store.
     """
 
@@ -135,7 +221,13 @@ class SkinsStore(BaseModel):
     offer_2 = Column(VARCHAR(36))
     offer_3 = Column(VARCHAR(36))
     offer_4 = Column(VARCHAR(36))
+    cost_1 = Column(BIGINT)
+    cost_2 = Column(BIGINT)
+    cost_3 = Column(BIGINT)
+    cost_4 = Column(BIGINT)
+    currency = Column(VARCHAR(36))
     duration = Column(BIGINT)
+    expiry = Column(DateTime)
     timestamp = Column(DateTime, default=func.now(), onupdate=func.now())
 
     def __repr__(self):
@@ -145,7 +237,9 @@ class SkinsStore(BaseModel):
             f"offer_2='{self.offer_2}', "
             f"offer_3='{self.offer_3}', "
             f"offer_4='{self.offer_4}', "
+            f"currency='{self.currency}', "
             f"duration='{self.duration}', "
+            f"expiry='{self.expiry}', "
             f"timestamp='{self.timestamp}')>"
         )
 
@@ -413,3 +507,23 @@ class Title(BaseModel):
 
     def __repr__(self):
         return f"<Title(uuid='{self.uuid}', name='{self.name}', icon='{self.text}')>"
+
+
+class CatalogItem(BaseModel):
+    """
+    This class represents a valorant-api.com catalog entry that has no dedicated table.
+
+    Attributes:
+        category (str): The catalog the entry belongs to, e.g. "buddy" or "bundle".
+        uuid (str): The unique identifier of the entry within its catalog.
+        data (JSON): The parsed entry.
+    """
+
+    __tablename__ = "catalog_item"
+
+    category: Mapped[str] = Column(VARCHAR(32), primary_key=True)
+    uuid: Mapped[str] = Column(VARCHAR(255), primary_key=True)
+    data = Column(JSON)
+
+    def __repr__(self):
+        return f"<CatalogItem(category='{self.category}', uuid='{self.uuid}')>"
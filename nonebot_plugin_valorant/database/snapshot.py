@@ -0,0 +1,246 @@
+"""
+皮肤目录的离线快照。
+
+快照是一个可以直接 mmap 的二进制文件，记录某个资源清单值(manifestId)下的全部武器皮肤与皮肤等级，
+用于新节点在不访问 valorant-api.com 的情况下启动。文件结构(小端序):
+
+    头部      HEADER: 魔数, 格式版本, 皮肤数, 等级数, 元数据长度, 字符串区长度
+    元数据    JSON: {"version": 版本信息}，版本信息即 Version 表的一行
+    皮肤表    SKIN_RECORD * 皮肤数，按 uuid 的 16 字节排序: uuid, names 偏移/长度, icon 偏移/长度, 等级 uuid
+    等级表    TIER_RECORD * 等级数，按 uuid 排序: uuid, name 偏移/长度, icon 偏移/长度
+    字符串区  UTF-8 字符串，names 为各语言名称的 JSON
+
+查询时在皮肤表中二分查找，只解码命中的一条记录，打开快照不需要解析整个文件。
+长度为 NULL_LENGTH 的字符串表示 None；等级 uuid 全为 0 表示没有等级(数据库中的 "None")。
+"""
+
+import os
+import mmap
+import bisect
+import struct
+from uuid import UUID
+from typing import Any
+from pathlib import Path
+from collections.abc import Iterable, Iterator
+
+import msgspec
+from nonebot.log import logger
+
+MAGIC = b"VCAT"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHxxIIII")
+SKIN_RECORD = struct.Struct("<16sIIII16s")
+TIER_RECORD = struct.Struct("<16sIIII")
+NULL_LENGTH = 0xFFFFFFFF
+NO_TIER = bytes(16)
+
+
+class _Keys:
+    # 以序列的形式暴露表中的 uuid，供 bisect 在 mmap 上直接二分查找
+    def __init__(self, data: mmap.mmap, offset: int, count: int, size: int) -> None:
+        self.data, self.offset, self.count, self.size = data, offset, count, size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self.offset + index * self.size
+        return self.data[start : start + 16]
+
+
+class CatalogSnapshot:
+    """
+    以 mmap 打开的目录快照，只读。
+
+    Raises:
+        ValueError: 文件不是快照或已损坏。
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse_header()
+        except (ValueError, struct.error, msgspec.DecodeError) as e:
+            self._data.close()
+            raise ValueError(f"无效的目录快照 {path}: {e}") from e
+
+    def _parse_header(self) -> None:
+        magic, version, self.skin_count, self.tier_count, meta_length, heap_length = HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"不支持的格式 {magic!r} v{version}")
+        meta_offset = HEADER.size
+        self._skins_offset = meta_offset + meta_length
+        self._tiers_offset = self._skins_offset + self.skin_count * SKIN_RECORD.size
+        self._heap_offset = self._tiers_offset + self.tier_count * TIER_RECORD.size
+        if self._heap_offset + heap_length != len(self._data):
+            raise ValueError("文件长度与头部不一致")
+        meta = msgspec.json.decode(self._data[meta_offset : self._skins_offset])
+        self.version: dict[str, Any] = meta["version"]
+        self._skin_keys = _Keys(self._data, self._skins_offset, self.skin_count, SKIN_RECORD.size)
+        self._tier_keys = _Keys(self._data, self._tiers_offset, self.tier_count, TIER_RECORD.size)
+
+    @property
+    def manifest_id(self) -> str:
+        """快照对应的资源清单值。"""
+        return self.version["manifestId"]
+
+    def _string(self, offset: int, length: int) -> str | None:
+        if length == NULL_LENGTH:
+            return None
+        start = self._heap_offset + offset
+        return self._data[start : start + length].decode()
+
+    def _names(self, offset: int, length: int) -> Any:
+        if length == NULL_LENGTH:
+            return None
+        start = self._heap_offset + offset
+        return msgspec.json.decode(self._data[start : start + length])
+
+    @staticmethod
+    def _find(keys: _Keys, uuid: str) -> int | None:
+        try:
+            key = UUID(uuid).bytes
+        except ValueError:
+            return None
+        index = bisect.bisect_left(keys, key)
+        return index if index < len(keys) and keys[index] == key else None
+
+    def _skin_at(self, index: int) -> dict[str, Any]:
+        key, names_offset, names_length, icon_offset, icon_length, tier = SKIN_RECORD.unpack_from(
+            self._data, self._skins_offset + index * SKIN_RECORD.size
+        )
+        return {
+            "uuid": str(UUID(bytes=key)),
+            "names": self._names(names_offset, names_length),
+            "icon": self._string(icon_offset, icon_length),
+            "tier": "None" if tier == NO_TIER else str(UUID(bytes=tier)),
+        }
+
+    def _tier_at(self, index: int) -> dict[str, Any]:
+        key, name_offset, name_length, icon_offset, icon_length = TIER_RECORD.unpack_from(
+            self._data, self._tiers_offset + index * TIER_RECORD.size
+        )
+        return {
+            "uuid": str(UUID(bytes=key)),
+            "name": self._string(name_offset, name_length),
+            "icon": self._string(icon_offset, icon_length),
+        }
+
+    def get_skin(self, uuid: str) -> dict[str, Any] | None:
+        """
+        获取武器皮肤。
+
+        Args:
+            uuid: 武器皮肤的 UUID。
+
+        Returns:
+            dict | None: 与 WeaponSkins 表一致的 uuid, names, icon, tier，不存在时为 None。
+        """
+        index = self._find(self._skin_keys, uuid)
+        return None if index is None else self._skin_at(index)
+
+    def get_tier(self, uuid: str) -> dict[str, Any] | None:
+        """
+        获取皮肤等级。
+
+        Args:
+            uuid: 皮肤等级的 UUID。
+
+        Returns:
+            dict | None: 与 Tier 表一致的 uuid, name, icon，不存在时为 None。
+        """
+        index = self._find(self._tier_keys, uuid)
+        return None if index is None else self._tier_at(index)
+
+    def iter_skins(self) -> Iterator[dict[str, Any]]:
+        """按 uuid 顺序遍历全部武器皮肤。"""
+        return (self._skin_at(index) for index in range(self.skin_count))
+
+    def iter_tiers(self) -> Iterator[dict[str, Any]]:
+        """按 uuid 顺序遍历全部皮肤等级。"""
+        return (self._tier_at(index) for index in range(self.tier_count))
+
+    def close(self) -> None:
+        self._data.close()
+
+
+def open_snapshot(path: Path) -> CatalogSnapshot | None:
+    """
+    打开目录快照。
+
+    Args:
+        path: 快照路径。
+
+    Returns:
+        CatalogSnapshot | None: 快照，文件不存在或无效时为 None。
+    """
+    try:
+        return CatalogSnapshot(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"目录快照不可用: {e}")
+        return None
+
+
+class _Heap:
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def add(self, value: bytes | None) -> tuple[int, int]:
+        if value is None:
+            return 0, NULL_LENGTH
+        offset = len(self.buffer)
+        self.buffer += value
+        return offset, len(value)
+
+
+def write_snapshot(
+    path: Path,
+    version: dict[str, Any],
+    skins: Iterable[dict[str, Any]],
+    tiers: Iterable[dict[str, Any]],
+) -> int:
+    """
+    写入目录快照，先写临时文件再重命名。
+
+    Args:
+        path: 快照路径。
+        version: 版本信息，须包含 manifestId。
+        skins: 与 WeaponSkins 表一致的 uuid, names, icon, tier 记录。
+        tiers: 与 Tier 表一致的 uuid, name, icon 记录。
+
+    Returns:
+        int: 文件字节数。
+    """
+    heap = _Heap()
+    skin_table = bytearray()
+    for skin in sorted(skins, key=lambda item: UUID(item["uuid"]).bytes):
+        names = None if skin["names"] is None else msgspec.json.encode(skin["names"])
+        icon = None if skin["icon"] is None else skin["icon"].encode()
+        tier = NO_TIER if skin["tier"] in (None, "None") else UUID(skin["tier"]).bytes
+        skin_table += SKIN_RECORD.pack(UUID(skin["uuid"]).bytes, *heap.add(names), *heap.add(icon), tier)
+    tier_table = bytearray()
+    for tier in sorted(tiers, key=lambda item: UUID(item["uuid"]).bytes):
+        name = None if tier["name"] is None else tier["name"].encode()
+        icon = None if tier["icon"] is None else tier["icon"].encode()
+        tier_table += TIER_RECORD.pack(UUID(tier["uuid"]).bytes, *heap.add(name), *heap.add(icon))
+
+    meta = msgspec.json.encode({"version": version})
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(skin_table) // SKIN_RECORD.size,
+        len(tier_table) // TIER_RECORD.size,
+        len(meta),
+        len(heap.buffer),
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f"{path.name}.tmp")
+    with open(temp, "wb") as file:
+        for part in (header, meta, skin_table, tier_table, heap.buffer):
+            file.write(part)
+    os.replace(temp, path)
+    return len(header) + len(meta) + len(skin_table) + len(tier_table) + len(heap.buffer)
@@ -2,12 +2,12 @@
 from pathlib import Path
 
 from nonebot import require, on_command
-from nonebot_plugin_htmlrender import md_to_pic
-from nonebot_plugin_saa import Image, MessageFactory
+from nonebot_plugin_saa import Text, Image, MessageFactory
 from nonebot.adapters.onebot.v11 import PrivateMessageEvent as PrivateMessageEventV11
 from nonebot.adapters.onebot.v12 import PrivateMessageEvent as PrivateMessageEventV12
 
-require("nonebot_plugin_htmlrender")
+from nonebot_plugin_valorant.config import plugin_config
+
 agreement = on_command("协议", aliases={"agreement"}, priority=5, block=True)
 
 md = Path(__file__).parent / "agreement.md"
@@ -18,8 +18,13 @@ async def _md2pic(event: PrivateMessageEventV11 | PrivateMessageEventV12):
     with open(md, encoding="utf-8") as file:
         agreement_content = file.read()
 
-    pic = await md_to_pic(md=agreement_content)
+    # 首次使用时才加载 htmlrender；Pillow 渲染的节点不安装浏览器，协议以文本发送
+    if plugin_config.valorant_render_backend == "html":
+        require("nonebot_plugin_htmlrender")
+        from nonebot_plugin_htmlrender import md_to_pic
 
-    msg_builder = MessageFactory(Image(pic))
+        msg_builder = MessageFactory(Image(await md_to_pic(md=agreement_content)))
+    else:
+        msg_builder = MessageFactory(Text(agreement_content))
     await msg_builder.send()
     await agreement.finish()
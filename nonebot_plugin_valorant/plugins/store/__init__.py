@@ -5,13 +5,13 @@ from nonebot.adapters.onebot.v11 import PrivateMessageEvent as PrivateMessageEve
 from nonebot.adapters.onebot.v12 import PrivateMessageEvent as PrivateMessageEventV12
 
 from nonebot_plugin_valorant.database.db import DB
+from nonebot_plugin_valorant.utils.startup import startup
 from nonebot_plugin_valorant.utils import message_translator
 from nonebot_plugin_valorant.utils.requestlib.auth import Auth
-from nonebot_plugin_valorant.utils.errors import AuthenticationError
+from nonebot_plugin_valorant.utils.storefront import get_store
 from nonebot_plugin_valorant.plugins.store.cache import refresh_store
-from nonebot_plugin_valorant.utils.parsinglib.endpoint_parsing import SkinsPanel
-from nonebot_plugin_valorant.utils.requestlib.player_info import PlayerInformation
-from nonebot_plugin_valorant.utils.render.storefront_skinpanel import parse_user_info, render_skin_panel
+from nonebot_plugin_valorant.utils.render.storefront_skinpanel import render_skin_panel
+from nonebot_plugin_valorant.utils.errors import RenderError, AuthenticationError, ServiceDegradedError
 
 store = on_command("store", aliases={"商店"}, priority=5, block=True)
 test = on_command("test", aliases={"test"}, priority=5, block=True)
@@ -22,18 +22,6 @@ store.handle()
 store.__doc__ = """商店"""
 
 
-async def cache_skins_store_into_db(user_data: PlayerInformation, skin_data: SkinsPanel) -> None:
-    """缓存商店皮肤信息到数据库"""
-    await DB.cache_player_skins_store(
-        puuid=user_data.puuid,
-        offer_1=skin_data.skin1.uuid,
-        offer_2=skin_data.skin2.uuid,
-        offer_3=skin_data.skin3.uuid,
-        offer_4=skin_data.skin4.uuid,
-        duration=skin_data.duration,
-    )
-
-
 async def invalid_login_credentials(
     event: PrivateMessageEventV11 | PrivateMessageEventV12,
     state: T_State,
@@ -49,9 +37,14 @@ async def _(
 ):
     # tracer = VizTracer()
     # tracer.start()
+    if not startup.is_ready("catalog"):
+        if startup.has_failed("catalog"):
+            await store.finish(message_translator("errors.STARTUP.FAILED"))
+        await store.finish(message_translator("errors.STARTUP.WARMING_UP"))
     try:
-        skin_data, player_info = await parse_user_info(event.get_user_id())
-        await cache_skins_store_into_db(player_info, skin_data)
+        skin_data, _ = await get_store(event.get_user_id())
+        if skin_data is None:
+            await store.finish(message_translator("errors.DATABASE.NOT_LOGIN"))
         pic = await render_skin_panel(skin_data)
         msg_builder = MessageFactory(Image(pic))
         await msg_builder.send()
@@ -59,6 +52,8 @@ async def _(
     except AuthenticationError as e:
         await invalid_login_credentials(event, state)
         await store.finish(message_translator(f"{e}"))
+    except (RenderError, ServiceDegradedError) as e:
+        await store.finish(message_translator(f"{e}"))
     # tracer.stop()
     # tracer.save("test.html")
 
@@ -4,21 +4,68 @@ from nonebot import require
 
 from nonebot_plugin_valorant.database.db import DB
 from nonebot_plugin_valorant.utils import ResponseError
-from nonebot_plugin_valorant.utils.cache import cache_store
-from nonebot_plugin_valorant.utils.requestlib.client import get_manifest_id
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.storefront import prefetch_stores
+from nonebot_plugin_valorant.utils.cache import cache_store, cache_version
+from nonebot_plugin_valorant.utils.requestlib.singleflight import SingleFlight
+from nonebot_plugin_valorant.utils.requestlib.client import get_manifest_id, version_service
 
 require("nonebot_plugin_apscheduler")
 
+from nonebot_plugin_apscheduler import scheduler  # noqa: E402
+
+_flight = SingleFlight()
+
 
 async def refresh_store():
     """
-    比对资源清单值判断缓存时效性
+    比对资源清单值判断缓存时效性，并发调用只执行一次
 
     """
-    manifest_id = get_manifest_id()
+    await _flight.do("refresh_store", _refresh_store)
+
+
+async def _refresh_store():
+    manifest_id = await get_manifest_id()
     db_cache = await DB.get_version("manifestId")
-    if db_cache[0] != manifest_id:
-        await cache_store()
-        await DB.update_version()
+    if db_cache is None or db_cache[0] != manifest_id:
         with suppress(ResponseError):
             await cache_store()
+            await cache_version()
+
+
+async def on_manifest_change(manifest_id: str, previous: str | None):
+    """
+    资源清单值变化后刷新目录，皮肤索引随 `cache_version` 重建；首次获取版本信息时由启动流程检查
+
+    """
+    if previous is not None:
+        await refresh_store()
+
+
+version_service.on_manifest_change(on_manifest_change)
+
+
+async def prefetch_daily_stores():
+    """
+    每日商店刷新后预取所有用户的商店，先检查目录资源以便新皮肤进入索引
+
+    """
+    with suppress(ResponseError):
+        await refresh_store()
+    await prefetch_stores()
+
+
+if plugin_config.valorant_prefetch_enabled:
+    # 每日商店在 00:00 UTC 刷新
+    scheduler.add_job(
+        prefetch_daily_stores,
+        "cron",
+        hour=0,
+        minute=plugin_config.valorant_prefetch_delay,
+        timezone="UTC",
+        id="valorant_prefetch_daily_stores",
+        replace_existing=True,
+        misfire_grace_time=3600,
+        coalesce=True,
+    )
@@ -1,34 +1,146 @@
-import os
 import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
 
 import aiohttp
-import aiofiles
-from tqdm import tqdm
 from nonebot import logger
 
 from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.render.workers import render_workers
+from nonebot_plugin_valorant.utils.requestlib.resilience import backoff_delay
+from nonebot_plugin_valorant.utils.errors import ResponseError, ServiceDegradedError
 
+from .store import asset_store
 
-async def download_image(session, url, uuid, pbar):
-    response = await session.get(url)
-    if response.status == 200:
-        image_extension = url.split(".")[-1]
-        image_filename = f"{uuid}.{image_extension}"
-        image_path = os.path.join(plugin_config.resource_path, image_filename)
+if TYPE_CHECKING:
+    from tqdm import tqdm
 
-        async with aiofiles.open(image_path, "wb") as image_file:
-            await image_file.write(await response.read())
+# 每完成多少个下载保存一次索引，中断后可从最近一次保存处继续
+INDEX_FLUSH_INTERVAL = 50
 
-        pbar.update(1)
-    else:
-        logger.warning(f"Failed to download image for UUID: {uuid}")
+
+def _legacy_file(uuid: str, url: str) -> Path:
+    # 旧版本按 uuid 命名保存在 resource_path 下的图标
+    extension = Path(urlparse(url).path).suffix or ".png"
+    return plugin_config.resource_path / f"{uuid}{extension}"
+
+
+async def plan_sync(assets: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """
+    对比资源列表与资源索引，得出需要下载的资源。
+
+    旧版本下载的图标会被移入资源存储，不再重复下载。
+
+    Args:
+        assets: (uuid, 下载地址) 列表。
+
+    Returns:
+        list[tuple[str, str]]: 未登记或地址已变化的资源。
+    """
+    pending = []
+    for uuid, url in assets:
+        if not url or asset_store.is_current(uuid, url):
+            continue
+        if uuid not in asset_store.items and await asset_store.adopt(uuid, url, _legacy_file(uuid, url)):
+            continue
+        pending.append((uuid, url))
+    return pending
+
+
+async def _fetch(uuid: str, url: str, attempts: int) -> None:
+    # 连接错误、超时与 5xx 已由 HTTPClient 重试，此处只重试读取响应体时中断或内容不完整的下载
+    for attempt in range(1, attempts + 1):
+        try:
+            await asset_store.fetch(uuid, url)
+        except aiohttp.ClientPayloadError:
+            if attempt == attempts:
+                raise
+            await asyncio.sleep(backoff_delay(attempt - 1))
+        else:
+            return
+
+
+async def sync_assets(
+    assets: list[tuple[str, str]],
+    concurrency: int = plugin_config.valorant_asset_concurrency,
+    attempts: int = plugin_config.valorant_asset_attempts,
+) -> dict[str, int]:
+    """
+    增量同步资源文件。
+
+    只下载资源索引中未登记或地址变化的资源，同时进行的下载不超过 concurrency 个，响应体不完整的下载最多尝试 attempts 次。
+    下载地址熔断时停止同步，队列中剩余的资源计为失败。
+    已登记但因超出磁盘配额被淘汰的资源不在此处下载，使用时再按需下载。
+    本地资源齐全时不发出任何网络请求。索引定期保存，中断后再次调用会跳过已完成的下载。
+    下载完成后再为新资源生成缩略图，并发与渲染进程数相同。
+
+    Args:
+        assets: (uuid, 下载地址) 列表。
+        concurrency: 下载并发上限。
+        attempts: 单个资源在响应体不完整时的最大尝试次数。
+
+    Returns:
+        dict[str, int]: 下载成功、失败与无需下载的资源数。
+    """
+    await asset_store.open()
+    pending = await plan_sync(assets)
+    result = {"downloaded": 0, "failed": 0, "skipped": len(assets) - len(pending)}
+    if not pending:
+        await asset_store.flush()
+        logger.info(f"资源已是最新, 共 {len(assets)} 项")
+        return result
+
+    # 只有需要下载时才导入 tqdm
+    from tqdm import tqdm
+
+    queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+    downloaded: list[str] = []
+    for item in pending:
+        queue.put_nowait(item)
+
+    async def worker(pbar: "tqdm") -> None:
+        while True:
+            try:
+                uuid, url = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await _fetch(uuid, url, attempts)
+            except ServiceDegradedError as e:
+                # 熔断期间的请求都会立即失败，不再逐个尝试，下次同步时重新下载
+                skipped = queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                result["failed"] += 1 + skipped
+                pbar.update(1 + skipped)
+                logger.warning(f"资源服务不可用, 停止同步, 剩余 {skipped} 项: {e!r}")
+                return
+            except (aiohttp.ClientError, asyncio.TimeoutError, ResponseError, OSError) as e:
+                result["failed"] += 1
+                logger.warning(f"资源 {uuid} 下载失败: {e!r}")
+            else:
+                result["downloaded"] += 1
+                downloaded.append(uuid)
+            pbar.update(1)
+            if pbar.n % INDEX_FLUSH_INTERVAL == 0:
+                await asset_store.flush()
+
+    with tqdm(total=len(pending)) as pbar:
+        await asyncio.gather(*(worker(pbar) for _ in range(min(concurrency, len(pending)))))
+    await asset_store.flush()
+    thumbnails = await asset_store.prepare(downloaded, concurrency=render_workers.size)
+    await asset_store.flush()
+    logger.debug(f"缩略图生成完成: {thumbnails}/{len(downloaded)}")
+    logger.info(f"资源同步完成: 下载 {result['downloaded']}, 失败 {result['failed']}, 跳过 {result['skipped']}")
+    return result
 
 
 async def download_images_from_db(db_results) -> None:
-    async with aiohttp.ClientSession() as session:
-        with tqdm(total=len(db_results)) as pbar:
-            tasks = []
-            for uuid, icon in db_results:
-                task = download_image(session, icon, uuid, pbar)
-                tasks.append(task)
-            await asyncio.gather(*tasks)
+    """
+    同步数据库中所有皮肤的图标。
+
+    Args:
+        db_results: (uuid, 图标地址) 列表。
+    """
+    await sync_assets([(uuid, icon) for uuid, icon in db_results])
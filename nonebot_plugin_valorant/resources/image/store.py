@@ -0,0 +1,409 @@
+import os
+import json
+import time
+import shutil
+import asyncio
+import hashlib
+from typing import Any
+from pathlib import Path
+from urllib.parse import urlparse
+from contextlib import asynccontextmanager
+from collections.abc import Iterable, AsyncIterator
+
+import aiohttp
+import aiofiles
+from nonebot import logger, get_driver
+
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.render.workers import render_workers
+from nonebot_plugin_valorant.utils.requestlib.http_client import HTTPClient
+from nonebot_plugin_valorant.utils.requestlib.singleflight import SingleFlight
+from nonebot_plugin_valorant.utils.render.compose import ICON_WIDTH, resize_icon
+
+INDEX_NAME = "index.json"
+CHUNK_SIZE = 64 * 1024
+# 缩略图与面板中图标的显示宽度一致
+THUMBNAIL = f"w{ICON_WIDTH}.png"
+THUMBNAIL_WEBP = f"w{ICON_WIDTH}.webp"
+VARIANTS: dict[str, tuple[int, str]] = {THUMBNAIL: (ICON_WIDTH, "PNG"), THUMBNAIL_WEBP: (ICON_WIDTH, "WEBP")}
+# 当前渲染方式使用的缩略图，同步资源后预先生成；Pillow 无法利用 WebP
+if plugin_config.valorant_render_backend == "html" and plugin_config.valorant_asset_webp:
+    PANEL_VARIANT = THUMBNAIL_WEBP
+else:
+    PANEL_VARIANT = THUMBNAIL
+
+
+class AssetStore:
+    """
+    按内容寻址的资源存储。
+
+    文件以内容的 sha256 命名，保存在 `blobs/<前两位>/<sha256><扩展名>`，内容相同的资源只保存一份；
+    索引记录每个 uuid 的下载地址与对应文件，以及每个文件的大小和最近访问时间。
+    文件总大小超过 `disk_quota` 字节时删除最久未访问的文件，被删除文件的 uuid 保留下载地址，
+    下次访问时重新下载。
+
+    缩略图由渲染进程池生成，保存为 `<sha256>.<变体名>`，与原文件一同计入配额、一同淘汰。
+    下载本身不生成缩略图，同步资源后由 `prepare` 批量生成，其余在首次使用时生成。
+
+    索引写入时先写临时文件再重命名，访问时间只在内存中更新，随索引一起保存。
+
+    渲染任务在 `pinned` 块内读取文件，块内的文件不会被淘汰，超出的配额在块结束后补做淘汰。
+    """
+
+    def __init__(self, path: Path, disk_quota: int) -> None:
+        self.path = path
+        self.disk_quota = disk_quota
+        self.items: dict[str, dict[str, str]] = {}
+        self.blobs: dict[str, dict[str, Any]] = {}
+        self.total = 0
+        self.loaded = False
+        self.dirty = False
+        self._lock = asyncio.Lock()
+        self._flight = SingleFlight()
+        self._pins: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def blob_path(self, blob: str) -> Path:
+        return self.path / "blobs" / blob[:2] / blob
+
+    def variant_path(self, blob: str, variant: str) -> Path:
+        return self.blob_path(blob).with_name(f"{Path(blob).stem}.{variant}")
+
+    async def open(self) -> None:
+        """加载索引，已加载时直接返回。"""
+        async with self._lock:
+            if not self.loaded:
+                await asyncio.to_thread(self._load)
+                self.loaded = True
+
+    def _load(self) -> None:
+        try:
+            index = json.loads((self.path / INDEX_NAME).read_text(encoding="utf-8"))
+            self.items, self.blobs = index["items"], index["blobs"]
+        except FileNotFoundError:
+            self.items, self.blobs = {}, {}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"资源索引损坏, 将重新下载全部资源: {e}")
+            self.items, self.blobs = {}, {}
+        # 只比较文件大小，不读取内容；缺失或大小不符的文件视为已淘汰
+        for blob, meta in list(self.blobs.items()):
+            if not _size_matches(self.blob_path(blob), meta["size"]):
+                del self.blobs[blob]
+                self.dirty = True
+                continue
+            variants = meta.get("variants", {})
+            for variant, size in list(variants.items()):
+                if not _size_matches(self.variant_path(blob, variant), size):
+                    del variants[variant]
+                    self.dirty = True
+        self.total = sum(_footprint(meta) for meta in self.blobs.values())
+        shutil.rmtree(self.path / "tmp", ignore_errors=True)
+
+    async def flush(self) -> None:
+        """保存索引，没有变化时不写入。"""
+        if not self.dirty:
+            return
+        self.dirty = False
+        text = json.dumps({"items": self.items, "blobs": self.blobs}, ensure_ascii=False)
+        await asyncio.to_thread(self._write_index, text)
+
+    def _write_index(self, text: str) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp = self.path / f"{INDEX_NAME}.tmp"
+        temp.write_text(text, encoding="utf-8")
+        temp.replace(self.path / INDEX_NAME)
+
+    def is_current(self, uuid: str, url: str) -> bool:
+        """
+        uuid 已登记且下载地址未变。
+
+        文件被淘汰的 uuid 同样视为最新，访问时才重新下载。
+        """
+        item = self.items.get(uuid)
+        return item is not None and item["url"] == url
+
+    def lookup(self, uuid: str) -> Path | None:
+        """
+        获取本地已有的资源文件并更新访问时间，不发出网络请求。
+
+        Args:
+            uuid: 资源 uuid。
+
+        Returns:
+            Path | None: 文件路径，未登记或已被淘汰时为 None。
+        """
+        item = self.items.get(uuid)
+        if item is None or item["blob"] not in self.blobs:
+            return None
+        self.blobs[item["blob"]]["atime"] = time.time()
+        self.dirty = True
+        return self.blob_path(item["blob"])
+
+    async def get(self, uuid: str, url: str | None = None, variant: str | None = None) -> Path | None:
+        """
+        获取资源文件，本地没有时下载。
+
+        Args:
+            uuid: 资源 uuid。
+            url: 下载地址，为 None 时使用索引中登记的地址。
+            variant: `VARIANTS` 中的缩略图名称，为 None 时返回原文件；缩略图生成失败时同样返回原文件。
+
+        Returns:
+            Path | None: 文件路径，没有可用的下载地址或下载失败时为 None。
+        """
+        await self.open()
+        path = None
+        if url is None or self.is_current(uuid, url):
+            path = self.lookup(uuid)
+            if path is not None:
+                self.hits += 1
+            elif url is None and uuid in self.items:
+                url = self.items[uuid]["url"]
+        if path is None:
+            if not url:
+                return None
+            self.misses += 1
+            try:
+                path = await self.fetch(uuid, url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                logger.warning(f"资源 {uuid} 下载失败: {e!r}")
+                return None
+        if variant is None:
+            return path
+        return await self.variant(path.name, variant) or path
+
+    async def variant(self, blob: str, variant: str) -> Path | None:
+        """
+        获取文件的缩略图，尚未生成时在渲染进程池中生成。
+
+        Args:
+            blob: 原文件名。
+            variant: `VARIANTS` 中的缩略图名称。
+
+        Returns:
+            Path | None: 缩略图路径，原文件已被淘汰或生成失败时为 None。
+        """
+        meta = self.blobs.get(blob)
+        if meta is None:
+            return None
+        if variant in meta.get("variants", {}):
+            return self.variant_path(blob, variant)
+        try:
+            return await self._flight.do((blob, variant), lambda: self._make_variant(blob, variant))
+        except Exception as e:
+            logger.warning(f"缩略图 {blob} {variant} 生成失败: {e!r}")
+            return None
+
+    async def _make_variant(self, blob: str, variant: str) -> Path | None:
+        width, image_format = VARIANTS[variant]
+        data = await render_workers.submit(resize_icon, str(self.blob_path(blob)), width, image_format)
+        target = self.variant_path(blob, variant)
+        temp = target.with_name(f"{target.name}.tmp")
+        await asyncio.to_thread(_write, temp, data)
+        meta = self.blobs.get(blob)
+        if meta is None:
+            # 生成期间原文件已被淘汰
+            await asyncio.to_thread(temp.unlink, missing_ok=True)
+            return None
+        await asyncio.to_thread(_place, temp, target)
+        variants = meta.setdefault("variants", {})
+        self.total += len(data) - variants.get(variant, 0)
+        variants[variant] = len(data)
+        self.dirty = True
+        evicted = self._evict(keep=blob)
+        if evicted:
+            await asyncio.to_thread(_remove, evicted)
+        return target
+
+    @asynccontextmanager
+    async def pinned(self, uuids: Iterable[str]) -> AsyncIterator[None]:
+        """
+        在块内保留 uuid 对应的文件及缩略图，供渲染任务读取。
+
+        Args:
+            uuids: 资源 uuid，可以在块内才下载。
+        """
+        uuids = list(uuids)
+        for uuid in uuids:
+            self._pins[uuid] = self._pins.get(uuid, 0) + 1
+        try:
+            yield
+        finally:
+            for uuid in uuids:
+                self._pins[uuid] -= 1
+                if not self._pins[uuid]:
+                    del self._pins[uuid]
+            evicted = self._evict()
+            if evicted:
+                await asyncio.to_thread(_remove, evicted)
+
+    async def fetch(self, uuid: str, url: str) -> Path:
+        """
+        下载资源并存入存储，内容与已有文件相同时不重复保存。
+
+        下载内容先写入临时文件并校验大小，再重命名为内容哈希对应的文件。相同 uuid 的并发下载只执行一次。
+
+        Args:
+            uuid: 资源 uuid。
+            url: 下载地址。
+
+        Returns:
+            Path: 文件路径。
+
+        Raises:
+            ServiceDegradedError: 下载地址所在 host 处于熔断状态。
+            aiohttp.ClientError: 响应状态异常或内容不完整。
+        """
+        return await self._flight.do(uuid, lambda: self._download(uuid, url))
+
+    async def _download(self, uuid: str, url: str) -> Path:
+        temp_dir = self.path / "tmp"
+        await asyncio.to_thread(temp_dir.mkdir, parents=True, exist_ok=True)
+        temp = temp_dir / f"{uuid}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with HTTPClient.request("GET", url) as response:
+                response.raise_for_status()
+                async with aiofiles.open(temp, "wb") as output:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        digest.update(chunk)
+                        size += len(chunk)
+                        await output.write(chunk)
+                if response.content_length is not None and response.content_length != size:
+                    raise aiohttp.ClientPayloadError(f"expected {response.content_length} bytes, got {size}")
+            return await self._commit(uuid, url, temp, digest.hexdigest(), size)
+        finally:
+            temp.unlink(missing_ok=True)
+
+    async def prepare(self, uuids: Iterable[str], variant: str = PANEL_VARIANT, concurrency: int = 1) -> int:
+        """
+        为已下载的资源生成缩略图，渲染时直接使用。
+
+        与下载分开进行，同时生成的缩略图不超过 concurrency 个，不会因下载并发占满渲染进程池。
+
+        Args:
+            uuids: 资源 uuid。
+            variant: `VARIANTS` 中的缩略图名称。
+            concurrency: 生成并发上限。
+
+        Returns:
+            int: 已有或生成成功的缩略图数。
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def prepare_one(uuid: str) -> bool:
+            async with semaphore, self.pinned([uuid]):
+                item = self.items.get(uuid)
+                return item is not None and await self.variant(item["blob"], variant) is not None
+
+        return sum(await asyncio.gather(*(prepare_one(uuid) for uuid in uuids)))
+
+    async def adopt(self, uuid: str, url: str, file: Path) -> bool:
+        """
+        将已有的本地文件移入存储，用于迁移旧版本按 uuid 命名的图标。
+
+        Args:
+            uuid: 资源 uuid。
+            url: 下载地址。
+            file: 本地文件。
+
+        Returns:
+            bool: 文件存在且非空并已移入存储。
+        """
+        try:
+            data = await asyncio.to_thread(file.read_bytes)
+        except OSError:
+            return False
+        if not data:
+            return False
+        await self._commit(uuid, url, file, hashlib.sha256(data).hexdigest(), len(data))
+        await asyncio.to_thread(file.unlink, missing_ok=True)
+        return True
+
+    async def _commit(self, uuid: str, url: str, source: Path, sha256: str, size: int) -> Path:
+        # 文件操作在线程中执行，索引只在事件循环中修改
+        extension = Path(urlparse(url).path).suffix or ".png"
+        blob = f"{sha256}{extension}"
+        target = self.blob_path(blob)
+        if blob not in self.blobs:
+            await asyncio.to_thread(_place, source, target)
+        if blob not in self.blobs:
+            self.blobs[blob] = {"size": size}
+            self.total += size
+        self.blobs[blob]["atime"] = time.time()
+        self.items[uuid] = {"url": url, "blob": blob}
+        self.dirty = True
+        evicted = self._evict(keep=blob)
+        if evicted:
+            await asyncio.to_thread(_remove, evicted)
+        return target
+
+    def _evict(self, keep: str | None = None) -> list[Path]:
+        evicted = []
+        if self.total <= self.disk_quota:
+            return evicted
+        pinned = {self.items[uuid]["blob"] for uuid in self._pins if uuid in self.items}
+        for blob in sorted(self.blobs, key=lambda name: self.blobs[name].get("atime", 0)):
+            if self.total <= self.disk_quota:
+                break
+            if blob == keep or blob in pinned:
+                continue
+            meta = self.blobs.pop(blob)
+            evicted.append(self.blob_path(blob))
+            evicted.extend(self.variant_path(blob, variant) for variant in meta.get("variants", {}))
+            self.total -= _footprint(meta)
+            self.evictions += 1
+        return evicted
+
+    def stats(self) -> dict[str, int]:
+        """
+        获取存储统计。
+
+        Returns:
+            dict[str, int]: 登记的 uuid 数、文件数、文件与缩略图总字节数，以及命中、未命中与淘汰次数。
+        """
+        return {
+            "items": len(self.items),
+            "blobs": len(self.blobs),
+            "bytes": self.total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _footprint(meta: dict[str, Any]) -> int:
+    return meta["size"] + sum(meta.get("variants", {}).values())
+
+
+def _size_matches(file: Path, size: int) -> bool:
+    try:
+        return file.stat().st_size == size
+    except OSError:
+        return False
+
+
+def _write(file: Path, data: bytes) -> None:
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_bytes(data)
+
+
+def _place(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, target)
+
+
+def _remove(files: list[Path]) -> None:
+    for file in files:
+        file.unlink(missing_ok=True)
+
+
+asset_store = AssetStore(
+    path=plugin_config.valorant_asset_path,
+    disk_quota=plugin_config.valorant_asset_disk_quota,
+)
+
+get_driver().on_shutdown(asset_store.flush)
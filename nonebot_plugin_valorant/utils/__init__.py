@@ -1,4 +1,5 @@
 import os
+import asyncio
 from uuid import UUID
 from pathlib import Path
 from urllib.parse import urlparse
@@ -6,19 +7,24 @@ from urllib.parse import urlparse
 import aiohttp
 from nonebot import require
 from nonebot.log import logger
-from cryptography.fernet import Fernet
 from aiohttp.client_exceptions import ClientConnectorError
-from sqlalchemy.exc import SQLAlchemyError, ProgrammingError
+from sqlalchemy.exc import SQLAlchemyError, OperationalError, ProgrammingError
 
 from nonebot_plugin_valorant.database.db import DB
 from nonebot_plugin_valorant.config import plugin_config
 
-from .cache import init_cache
-from ..database.db import engine
+from .startup import startup
 from .translator import Translator
+from ..database.models import Version
+from ..database.db import async_engine
+from ..database.index import catalog_index
+from .render.workers import render_workers
 from .requestlib.client import get_version
+from ..database.snapshot import open_snapshot
+from .requestlib.http_client import HTTPClient
 from ..resources.image.skin import download_images_from_db
 from .errors import DatabaseError, ResponseError, ConfigurationError
+from .cache import SNAPSHOT_CATALOGS, init_cache, cache_store, seed_catalog
 
 # def on_command(cmd, *args, **kwargs):
 #     return _on_command(plugin_config.valorant_command + cmd, *args, **kwargs)
@@ -31,16 +37,16 @@ async def check_proxy():
     """检查代理是否有效"""
     if plugin_config.valorant_proxies is not None:
         await _verify_url_legality(plugin_config.valorant_proxies)
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(
-                    "https://icanhazip.com/",
-                    proxy=plugin_config.valorant_proxies,
-                    timeout=5,
-                ):
-                    logger.info("代理连接测试成功")
-            except ClientConnectorError as e:
-                logger.warning(f"代理连接错误: {e}")
+        try:
+            async with HTTPClient.request(
+                "GET",
+                "https://icanhazip.com/",
+                proxy=plugin_config.valorant_proxies,
+                timeout=aiohttp.ClientTimeout(total=5),
+            ):
+                logger.info("代理连接测试成功")
+        except ClientConnectorError as e:
+            logger.warning(f"代理连接错误: {e}")
 
 
 async def _verify_db_resource(_cache) -> None:
@@ -59,11 +65,11 @@ async def _verify_db_resource(_cache) -> None:
         await initialize_or_verify_db_resource(_cache)
         ```
     """
-    if not hasattr(_cache, "initial") or _cache.initial is False:
+    if _cache is None or not getattr(_cache, "initial", False):
         await DB.init()
         await init_cache()
-        await cache_resources()
         logger.info("数据库初始化完成")
+        return
 
     if _cache.initial is True:
         if await _verify_resource_timeliness(_cache):
@@ -72,22 +78,55 @@ async def _verify_db_resource(_cache) -> None:
             logger.info("资源过期，已更新")
 
 
-async def check_db():
+async def check_db() -> Version | None:
+    """
+    检查数据库连接，数据库或表不存在时创建，已有的表缺少列时补充。
+
+    只访问数据库，目录数据的初始化与更新见 `init_catalog`。
+
+    返回:
+        Version | None: 资源版本记录，数据库新建时为 None。
+    """
     try:
         if not isinstance(plugin_config.valorant_database, str):
             raise DatabaseError("数据库无效，请检查数据库")
 
-        with engine.connect():
-            _cache = await DB.get_version()
-            await _verify_db_resource(_cache)
+        async with async_engine.connect():
+            pass
+        # 已有数据库可能缺少新版本增加的列
+        await DB.upgrade()
+        return await DB.get_version()
+
+    except (ConnectionError, OperationalError, ProgrammingError):
+        logger.warning("数据库检查失败，尝试初始化数据库")
+        await DB.init()
+        logger.info("数据库初始化完成")
+        return None
+
+
+async def init_catalog(version: Version | None) -> None:
+    """
+    初始化目录数据或检查其时效性，完成后皮肤索引随资源清单值更新。
+
+    数据库尚未初始化且挂载了目录快照时，皮肤与皮肤等级由快照写入，资源清单值未变化时只下载快照中没有的目录资源。
 
-    except (ConnectionError, ProgrammingError):
+    Args:
+        version: `check_db` 返回的资源版本记录，数据库新建时为 None。
+    """
+    snapshot = catalog_index.mapped
+    if snapshot is not None and (version is None or not getattr(version, "initial", False)):
+        await seed_catalog(snapshot)
+        if await _verify_resource_timeliness(await DB.get_version()):
+            logger.info(f"目录快照 {snapshot.manifest_id} 已是最新")
+            await cache_store(exclude=SNAPSHOT_CATALOGS)
+        return
+    try:
+        await _verify_db_resource(version)
+    except (ConnectionError, OperationalError, ProgrammingError):
         logger.warning("数据库检查失败，尝试初始化数据库")
         await DB.init()
         await init_cache()
         logger.info("数据库初始化完成")
-    finally:
-        engine.dispose()
 
 
 async def generate_database_key():
@@ -101,6 +140,8 @@ async def generate_database_key():
     如果提供了密钥文件路径，则尝试从文件中读取密钥。
 
     """
+    from cryptography.fernet import Fernet
+
     key_path = Path(__file__).parent.parent / "data" / "key.json"
 
     # 检查密钥文件是否已存在
@@ -163,14 +204,16 @@ async def _verify_resource_timeliness(_cache) -> bool:
             return True
         await init_cache()
         return False
-    except (ResponseError, SQLAlchemyError) as e:
-        if e is ResponseError:
-            logger.error(f"获取版本信息失败：{str(e)}")
-        elif e is SQLAlchemyError:
-            raise DatabaseError(f"数据库错误：{str(e)}") from e
+    except ResponseError as e:
+        # 刷新失败须让 catalog 阶段失败，否则阶段会被标记为完成
+        logger.error(f"获取版本信息失败：{str(e)}")
+        raise
+    except SQLAlchemyError as e:
+        raise DatabaseError(f"数据库错误：{str(e)}") from e
 
 
 async def cache_resources():
+    """增量同步皮肤图标，本地资源齐全时不发出网络请求"""
     # skin
     skin_db_data = await DB.get_all_skins_icon()
     await download_images_from_db(skin_db_data)
@@ -182,11 +225,54 @@ async def user_login_status(
     return bool(await DB.get_user(qq_uid))
 
 
+async def load_catalog_index():
+    """加载皮肤索引，存在目录快照时先挂载快照，资源清单值与数据库一致时不再扫描数据库"""
+    snapshot = await asyncio.to_thread(open_snapshot, plugin_config.valorant_catalog_snapshot_path)
+    if snapshot is not None:
+        catalog_index.attach(snapshot)
+    await catalog_index.load()
+
+
+async def warm_renderer():
+    """预热渲染后端: Pillow 创建工作进程，浏览器打开页面并加载模板"""
+    if plugin_config.valorant_render_backend == "pillow":
+        await render_workers.startup()
+    else:
+        from .render.pool import storefront_pool
+
+        await storefront_pool.warm()
+
+
 async def on_startup():
-    """启动前检查"""
-    await check_proxy()
-    await check_db()
-    await generate_database_key()
+    """
+    启动前检查。
+
+    只等待关键阶段，目录刷新、图标同步、代理检测与渲染预热在后台各自执行并在失败时重试，见 `startup`。
+    """
+    version = await startup.run("database", check_db)
+    await startup.run("key", generate_database_key)
+    if not catalog_index.loaded:
+        await startup.run("index", load_catalog_index)
+    else:
+        startup.mark_ready("index")
+    # 数据库中已有目录时先使用已有数据，刷新在后台进行
+    if catalog_index.manifest_id is not None:
+        startup.mark_ready("catalog")
+    logger.info(f"关键启动阶段完成, 耗时 {startup.elapsed:.2f}s, 其余阶段在后台执行")
+
+    # 图标同步只使用数据库中已有的目录，不等待目录刷新；数据库中没有目录时在首次刷新完成后同步
+    initial = not startup.is_ready("catalog")
+
+    async def catalog():
+        await init_catalog(version)
+        if initial:
+            startup.background("assets", cache_resources)
+
+    startup.background("catalog", catalog)
+    if not initial:
+        startup.background("assets", cache_resources)
+    startup.background("proxy", check_proxy)
+    startup.background("render", warm_renderer)
 
 
 require("nonebot_plugin_apscheduler")
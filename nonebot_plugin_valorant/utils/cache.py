@@ -1,22 +1,249 @@
+import time
+import asyncio
+from typing import Any
+from functools import partial
+from collections.abc import Callable, Awaitable
+
+from nonebot.log import logger
+
 from nonebot_plugin_valorant.database.db import DB
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.errors import ResponseError
+from nonebot_plugin_valorant.database.index import catalog_index
+from nonebot_plugin_valorant.database.snapshot import CatalogSnapshot
 from nonebot_plugin_valorant.utils.requestlib.client import get_version
-from nonebot_plugin_valorant.utils.requestlib.request_res import get_skin, get_tier
+from nonebot_plugin_valorant.utils.render.tiles import schedule_tile_warming
+from nonebot_plugin_valorant.utils.requestlib.request_res import (
+    get_skin,
+    get_tier,
+    get_spray,
+    get_bundle,
+    get_buddies,
+    get_mission,
+    get_contract,
+    get_currencies,
+    get_rank_tiers,
+    stream_catalog,
+    get_playercards,
+    get_skin_chromas,
+    get_player_titles,
+)
+
+# 目录资源名称 -> 非流式获取函数
+catalog_fetchers: dict[str, Callable[[], Awaitable[dict | None]]] = {
+    "skin": get_skin,
+    "tier": get_tier,
+    "mission": get_mission,
+    "playercard": get_playercards,
+    "title": get_player_titles,
+    "spray": get_spray,
+    "bundle": get_bundle,
+    "contract": get_contract,
+    "rank_tier": get_rank_tiers,
+    "currency": get_currencies,
+    "buddy": get_buddies,
+    "skin_chroma": get_skin_chromas,
+}
+
+# 整体下载后由 msgspec 结构体解码的资源，CPU 开销约为逐条流式解析的一半，
+# 见 scripts/bench_decode.py；rank_tier 的数据嵌套在各赛季之下，同样不适用流式解析
+DECODED_CATALOGS = ("skin", "tier", "skin_chroma", "bundle", "rank_tier")
+# 目录快照中包含的资源
+SNAPSHOT_CATALOGS = ("skin", "tier")
+# 刷新失败时不记录新资源清单值的资源，商店依赖它们
+REQUIRED_CATALOGS = ("skin", "tier")
 
 
-async def cache_store():
+def catalog_writer(name: str) -> Callable[[dict[str, Any]], Awaitable[None]]:
     """
-    缓存商店数据
+    获取目录资源的写入函数，皮肤与皮肤等级写入独立的数据表，其余写入通用目录表。
+
+    Args:
+        name: 目录资源名称。
+
+    Returns:
+        写入函数，接收 uuid 到资源数据的字典。
+    """
+    if name == "skin":
+        return DB.cache_skin
+    if name == "tier":
+        return DB.cache_tier
+    return partial(DB.cache_catalog, name)
+
+
+async def ingest_catalog(
+    name: str,
+    writer: Callable[[dict[str, Any]], Awaitable[None]],
+    batch_size: int = plugin_config.valorant_catalog_batch_size,
+) -> int:
+    """
+    流式获取目录资源并分批写入，内存中最多保留一批数据。
+
+    Args:
+        name: 目录资源名称，见 `catalog_sources`。
+        writer: 写入函数，接收 uuid 到资源数据的字典。
+        batch_size: 每批写入的条数。
+
+    Returns:
+        int: 写入的总条数。
+    """
+    batch: dict[str, Any] = {}
+    count = 0
+    async for record in stream_catalog(name):
+        batch[record["uuid"]] = record
+        if len(batch) >= batch_size:
+            await writer(batch)
+            count += len(batch)
+            batch = {}
+    if batch:
+        await writer(batch)
+        count += len(batch)
+    return count
+
+
+def skip_unchanged(
+    name: str,
+    writer: Callable[[dict[str, Any]], Awaitable[None]],
+    baseline: CatalogSnapshot,
+) -> Callable[[dict[str, Any]], Awaitable[None]]:
+    """
+    包装写入函数，只写入与快照不同的皮肤或皮肤等级。
+
+    Args:
+        name: 目录资源名称，不在 `SNAPSHOT_CATALOGS` 中时原样返回 writer。
+        writer: 写入函数。
+        baseline: 与数据库中数据一致的目录快照。
+
+    Returns:
+        写入函数。
+    """
+    if name not in SNAPSHOT_CATALOGS:
+        return writer
+    lookup = baseline.get_skin if name == "skin" else baseline.get_tier
+
+    async def write(data: dict[str, Any]) -> None:
+        changed = {uuid: record for uuid, record in data.items() if lookup(uuid) != record}
+        if changed:
+            await writer(changed)
+
+    return write
+
+
+async def _refresh_one(
+    name: str,
+    semaphore: asyncio.Semaphore,
+    baseline: CatalogSnapshot | None = None,
+) -> tuple[str, dict[str, Any]]:
+    writer = catalog_writer(name)
+    if baseline is not None:
+        writer = skip_unchanged(name, writer, baseline)
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            if plugin_config.valorant_catalog_streaming and name not in DECODED_CATALOGS:
+                count = await ingest_catalog(name, writer)
+            else:
+                data = await catalog_fetchers[name]()
+                # 多数获取函数出错时只记录日志并返回 None，不能视为刷新成功
+                if data is None:
+                    raise ResponseError("errors.API.REQUEST_FAILED")
+                count = len(data)
+                if data:
+                    await writer(data)
+        except Exception as e:
+            return name, {"count": 0, "seconds": time.perf_counter() - start, "error": repr(e)}
+        return name, {"count": count, "seconds": time.perf_counter() - start}
+
+
+async def refresh_catalog(
+    names: list[str] | None = None,
+    concurrency: int = plugin_config.valorant_catalog_concurrency,
+    baseline: CatalogSnapshot | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    并发刷新目录资源，同时进行的资源数不超过 concurrency。
+
+    每个资源获取完成后立即解析并写入，单个资源失败不影响其他资源。
+
+    Args:
+        names: 需要刷新的资源名称，默认为全部。
+        concurrency: 并发上限。
+        baseline: 与数据库中数据一致的目录快照，提供时与快照相同的皮肤和等级不再写入。
+
+    Returns:
+        dict: 资源名称到 {"count": 条数, "seconds": 耗时} 的映射，失败的资源额外包含 "error"。
+    """
+    names = list(catalog_fetchers) if names is None else names
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    report: dict[str, dict[str, Any]] = {}
+    for future in asyncio.as_completed([_refresh_one(name, semaphore, baseline) for name in names]):
+        name, result = await future
+        report[name] = result
+        if "error" in result:
+            logger.warning(f"目录资源 {name} 刷新失败: {result['error']}")
+        else:
+            logger.debug(f"目录资源 {name} 刷新完成: {result['count']} 条, {result['seconds']:.2f}s")
+
+    logger.info(f"目录资源刷新完成, 共 {len(names)} 项, 耗时 {time.perf_counter() - start:.2f}s")
+    return report
+
+
+async def _delta_baseline() -> CatalogSnapshot | None:
+    # 数据库中的目录与挂载的快照属于同一资源清单值时，快照即数据库的现状
+    snapshot = catalog_index.mapped
+    if snapshot is None:
+        return None
+    version = await DB.get_version("manifestId")
+    return snapshot if version and version[0] == snapshot.manifest_id else None
+
+
+async def cache_store(exclude: tuple[str, ...] = ()):
+    """
+    缓存商店数据，只写入与目录快照不同的皮肤和等级
+    Args:
+        exclude: 不需要刷新的资源名称。
+
+    Returns:
+        None
+
+    Raises:
+        ResponseError: `REQUIRED_CATALOGS` 中的资源刷新失败，此时不应记录新的资源清单值。
+
+    """
+    names = [name for name in catalog_fetchers if name not in exclude]
+    report = await refresh_catalog(names, baseline=await _delta_baseline())
+    failed = [name for name in REQUIRED_CATALOGS if "error" in report.get(name, {})]
+    if failed:
+        logger.error(f"必需的目录资源 {', '.join(failed)} 刷新失败, 保留原有资源清单值")
+        raise ResponseError("errors.API.REQUEST_FAILED")
+
+
+async def seed_catalog(snapshot: CatalogSnapshot):
+    """
+    由目录快照写入皮肤、皮肤等级与版本信息，新数据库无需下载目录即可使用
+    Args:
+        snapshot: 目录快照。
+
     Returns:
         None
 
     """
-    await DB.cache_skin(await get_skin())
-    await DB.cache_tier(await get_tier())
+    start = time.perf_counter()
+    await DB.upsert_skins({skin["uuid"]: skin for skin in snapshot.iter_skins()})
+    await DB.upsert_tiers({tier["uuid"]: tier for tier in snapshot.iter_tiers()})
+    await DB.update_version(**snapshot.version)
+    await DB.init_version(filter_by={"manifestId": snapshot.manifest_id}, update_value={"initial": True})
+    logger.info(
+        f"已由目录快照写入 {snapshot.skin_count} 个皮肤, {snapshot.tier_count} 个等级, "
+        f"资源清单值 {snapshot.manifest_id}, 耗时 {time.perf_counter() - start:.2f}s"
+    )
 
 
 async def cache_version():
     """
-    缓存版本信息
+    缓存版本信息，并按新的资源清单值重建皮肤索引、预热图块
     Returns:
         None
 
@@ -24,8 +251,19 @@ async def cache_version():
     data = await get_version()
     await DB.update_version(**data)
     await DB.init_version(filter_by={"manifestId": data.get("manifestId")}, update_value={"initial": True})
+    await catalog_index.refresh(data["manifestId"])
+    schedule_tile_warming()
 
 
 async def init_cache():
+    """
+    刷新全部目录资源，必需的资源刷新成功后才记录新的资源清单值
+    Returns:
+        None
+
+    Raises:
+        ResponseError: 必需的目录资源刷新失败。
+
+    """
     await cache_store()
     await cache_version()
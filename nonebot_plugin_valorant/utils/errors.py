@@ -54,6 +54,14 @@ class ResponseError(TranslatableError):
     pass
 
 
+class ServiceDegradedError(ResponseError):
+    """
+    当上游服务处于熔断状态时引发的异常。
+    """
+
+    pass
+
+
 class HandshakeError(TranslatableError):
     """
     尝试与本地 Riot 服务器通信时出现问题时引发的异常。
@@ -86,6 +94,14 @@ class RequestError(TranslatableError):
     pass
 
 
+class RenderError(TranslatableError):
+    """
+    渲染图片超时或失败时引发的异常。
+    """
+
+    pass
+
+
 class ConfigurationError(TranslatableError):
     """
     当配置文件中的值无效时引发的异常。
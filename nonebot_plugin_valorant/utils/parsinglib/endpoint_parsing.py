@@ -1,47 +1,53 @@
-from pydantic import BaseModel
+import msgspec
 
-from nonebot_plugin_valorant.database.db import DB
-from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.database.index import catalog_index
+from nonebot_plugin_valorant.utils.parsinglib.structs import Storefront
 
 
-class Skin(BaseModel):
-    uuid: str | None
-    name: str | None
-    icon: str | None
-    cost: int | None
-    currency: str | None
-    startdate: str | None
+class Skin(msgspec.Struct, kw_only=True):
+    uuid: str | None = None
+    name: str | None = None
+    icon: str | None = None
+    tier: str | None = None
+    cost: int | None = None
+    currency: str | None = None
+    startdate: str | None = None
 
 
-class SkinsPanel(BaseModel):
-    skin1: Skin | None
-    skin2: Skin | None
-    skin3: Skin | None
-    skin4: Skin | None
+class SkinsPanel(msgspec.Struct, kw_only=True):
+    skin1: Skin | None = None
+    skin2: Skin | None = None
+    skin3: Skin | None = None
+    skin4: Skin | None = None
     duration: int
 
 
-async def skin_panel_parser(data):
+async def skin_panel_parser(data: Storefront) -> SkinsPanel:
     """
-    Parse raw data from endpoint.
+    Parse storefront decoded from endpoint.
+
+    Skin names, icons and tiers come from the in-memory catalog index, so no database query is made.
     """
     try:
-        uuids = data["SkinsPanelLayout"]["SingleItemOffers"]
-        duration = data["SkinsPanelLayout"]["SingleItemOffersRemainingDurationInSeconds"]
-        skins_panel = SkinsPanel(duration=duration)
-        for index, uuid in enumerate(uuids):
-            currency, cost = list(data["SkinsPanelLayout"]["SingleItemStoreOffers"][index]["Cost"].items())[0]
-            startdate = data["SkinsPanelLayout"]["SingleItemStoreOffers"][index]["StartDate"]
-            skin_data = await DB.get_skin(uuid)
+        layout = data.skins_panel_layout
+        skins_panel = SkinsPanel(duration=layout.single_item_offers_remaining_duration_in_seconds)
+        skins = await catalog_index.get_skins(layout.single_item_offers)
+        for index, uuid in enumerate(layout.single_item_offers):
+            offer = layout.single_item_store_offers[index]
+            currency, cost = next(iter(offer.cost.items()))
+            skin_data = skins.get(uuid)
+            if skin_data is None:
+                raise ValueError(f"Unknown skin: {uuid}")
             skin = Skin(
                 uuid=uuid,
-                name=skin_data.names[plugin_config.language_type],
+                name=skin_data.name,
                 icon=skin_data.icon,
+                tier=skin_data.tier,
                 cost=cost,
                 currency=currency,
-                startdate=startdate,
+                startdate=offer.start_date,
             )
             setattr(skins_panel, f"skin{index+1}", skin)
         return skins_panel
-    except IndexError as e:
+    except (IndexError, StopIteration) as e:
         raise ValueError(f"Invalid data: {e}") from e
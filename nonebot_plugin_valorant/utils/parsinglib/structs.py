@@ -0,0 +1,189 @@
+from typing import Any, Generic, TypeVar
+
+import msgspec
+
+from nonebot_plugin_valorant.utils.errors import DataParseError
+
+T = TypeVar("T")
+
+# valorant-api.com 在 language=all 时返回 {语言: 名称}，否则返回单一字符串
+LocalizedName = dict[str, str] | str | None
+
+
+class CatalogResponse(msgspec.Struct, Generic[T]):
+    """valorant-api.com 目录接口的响应。"""
+
+    data: list[T] = msgspec.field(default_factory=list)
+
+
+class SkinLevel(msgspec.Struct, rename="camel"):
+    uuid: str
+    display_name: LocalizedName = None
+    display_icon: str | None = None
+
+
+class WeaponSkin(msgspec.Struct, rename="camel"):
+    uuid: str
+    content_tier_uuid: str | None = None
+    levels: list[SkinLevel] = msgspec.field(default_factory=list)
+
+    def to_record(self) -> dict[str, Any]:
+        """转换为与 `parse_skin` 相同的记录格式，以首个等级的 uuid 作为皮肤 uuid。"""
+        level = self.levels[0]
+        return {
+            "uuid": level.uuid,
+            "names": level.display_name,
+            "icon": level.display_icon,
+            "tier": self.content_tier_uuid if self.content_tier_uuid is not None else "None",
+        }
+
+
+class ContentTier(msgspec.Struct, rename="camel"):
+    uuid: str
+    dev_name: str | None = None
+    display_icon: str | None = None
+
+    def to_record(self) -> dict[str, Any]:
+        """转换为与 `parse_tier` 相同的记录格式。"""
+        return {"uuid": self.uuid, "name": self.dev_name, "icon": self.display_icon}
+
+
+class SkinChroma(msgspec.Struct, rename="camel"):
+    uuid: str
+    display_name: LocalizedName = None
+    display_icon: str | None = None
+    full_render: str | None = None
+    swatch: str | None = None
+    streamed_video: str | None = None
+
+    def to_record(self) -> dict[str, Any]:
+        """转换为与 `parse_skin_chroma` 相同的记录格式。"""
+        return {
+            "uuid": self.uuid,
+            "names": self.display_name,
+            "icon": self.display_icon,
+            "full_render": self.full_render,
+            "swatch": self.swatch,
+            "video": self.streamed_video,
+        }
+
+
+class Bundle(msgspec.Struct, rename="camel"):
+    uuid: str
+    display_name: LocalizedName = None
+    display_name_sub_text: LocalizedName = None
+    extra_description: LocalizedName = None
+    display_icon2: str | None = None
+    price: int | None = None
+    weapons: list[dict[str, Any]] = msgspec.field(default_factory=list)
+    buddies: list[dict[str, Any]] = msgspec.field(default_factory=list)
+    cards: list[dict[str, Any]] = msgspec.field(default_factory=list)
+    sprays: list[dict[str, Any]] = msgspec.field(default_factory=list)
+
+    def to_record(self) -> dict[str, Any]:
+        """转换为与 `parse_bundle` 相同的记录格式。"""
+        items = []
+        for entries, item_type, leveled in (
+            (self.weapons, "e7c63390-eda7-46e0-bb7a-a6abdacd2433", True),
+            (self.buddies, "dd3bf334-87f3-40bd-b043-682a57a8dc3a", True),
+            (self.cards, "3f296c07-64c3-494c-923b-fe692a4fa1bd", False),
+            (self.sprays, "d5f120f8-ff8c-4aac-92ea-f2b5acbe9475", False),
+        ):
+            for entry in entries:
+                items.append(
+                    {
+                        "uuid": entry["levels"][0]["uuid"] if leveled else entry["uuid"],
+                        "type": item_type,
+                        "price": entry.get("price"),
+                        "amount": 1,
+                        "discount": 0,
+                    }
+                )
+        return {
+            "uuid": self.uuid,
+            "names": self.display_name,
+            "subnames": self.display_name_sub_text,
+            "descriptions": self.extra_description,
+            "icon": self.display_icon2,
+            "items": items,
+            "price": self.price,
+            "basePrice": None,
+            "expires": None,
+        }
+
+
+class StoreOffer(msgspec.Struct, rename="pascal"):
+    offer_id: str = msgspec.field(name="OfferID", default="")
+    cost: dict[str, int] = msgspec.field(default_factory=dict)
+    start_date: str | None = None
+
+
+class SkinsPanelLayout(msgspec.Struct, rename="pascal"):
+    single_item_offers: list[str] = msgspec.field(default_factory=list)
+    single_item_store_offers: list[StoreOffer] = msgspec.field(default_factory=list)
+    single_item_offers_remaining_duration_in_seconds: int = 0
+
+
+class Storefront(msgspec.Struct, rename="pascal"):
+    skins_panel_layout: SkinsPanelLayout
+
+
+_skin_decoder = msgspec.json.Decoder(CatalogResponse[WeaponSkin])
+_tier_decoder = msgspec.json.Decoder(CatalogResponse[ContentTier])
+_chroma_decoder = msgspec.json.Decoder(CatalogResponse[SkinChroma])
+_bundle_decoder = msgspec.json.Decoder(CatalogResponse[Bundle])
+_storefront_decoder = msgspec.json.Decoder(Storefront)
+
+
+def _decode(decoder: msgspec.json.Decoder, raw: bytes):
+    try:
+        return decoder.decode(raw)
+    except (msgspec.DecodeError, msgspec.ValidationError) as error:
+        raise DataParseError("errors.DATA.PARSING_ERROR") from error
+
+
+def decode_skins(raw: bytes) -> list[WeaponSkin]:
+    """
+    将武器皮肤目录响应解码为结构体列表。
+
+    Args:
+        raw: 响应体。
+
+    Returns:
+        list[WeaponSkin]: 武器皮肤列表。
+
+    Raises:
+        DataParseError: 响应体不符合预期结构时抛出。
+    """
+    return _decode(_skin_decoder, raw).data
+
+
+def decode_tiers(raw: bytes) -> list[ContentTier]:
+    """将皮肤等级目录响应解码为结构体列表。"""
+    return _decode(_tier_decoder, raw).data
+
+
+def decode_skin_chromas(raw: bytes) -> list[SkinChroma]:
+    """将皮肤染色目录响应解码为结构体列表。"""
+    return _decode(_chroma_decoder, raw).data
+
+
+def decode_bundles(raw: bytes) -> list[Bundle]:
+    """将套装目录响应解码为结构体列表。"""
+    return _decode(_bundle_decoder, raw).data
+
+
+def decode_storefront(raw: bytes) -> Storefront:
+    """
+    将玩家商店响应解码为结构体，只解析每日皮肤部分。
+
+    Args:
+        raw: 响应体。
+
+    Returns:
+        Storefront: 玩家商店。
+
+    Raises:
+        DataParseError: 响应体不符合预期结构时抛出。
+    """
+    return _decode(_storefront_decoder, raw)
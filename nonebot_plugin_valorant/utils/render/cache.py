@@ -0,0 +1,212 @@
+import os
+import json
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from contextlib import suppress
+from collections import OrderedDict
+from collections.abc import Callable, Awaitable
+
+from nonebot.log import logger
+
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.requestlib.singleflight import SingleFlight
+
+_template_hashes: dict[Path, tuple[int, str]] = {}
+
+
+def template_hash(path: Path) -> str:
+    """
+    计算模板文件内容的哈希，文件修改时间不变时复用上次的结果。
+
+    Args:
+        path: 模板文件路径。
+
+    Returns:
+        str: 模板内容的 sha256。
+    """
+    mtime = path.stat().st_mtime_ns
+    cached = _template_hashes.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _template_hashes[path] = (mtime, hashlib.sha256(path.read_bytes()).hexdigest())
+    return cached[1]
+
+
+def render_key(*parts) -> str:
+    """
+    由渲染输入计算缓存键。
+
+    Args:
+        parts: 决定渲染结果的全部输入，须可被 JSON 序列化。
+
+    Returns:
+        str: 缓存键。
+    """
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+class DiskQuota:
+    """
+    目录中 PNG 文件的磁盘配额，按最近使用时间淘汰。
+
+    目录总大小在首次写入时扫描得出，之后随写入累计，不在每次写入时遍历目录；
+    超出 `quota` 字节时才扫描目录，按修改时间删除最久未使用的文件，直到低于配额的 90%，
+    并以扫描结果校正累计值。命中文件时应调用 `touch` 更新修改时间。
+
+    方法会访问文件系统，应在线程中调用；可被多个线程同时调用。
+    """
+
+    def __init__(self, path: Path, quota: int) -> None:
+        self.path = path
+        self.quota = quota
+        self._total: int | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def touch(file: Path) -> bool:
+        """
+        更新文件的修改时间。
+
+        Returns:
+            bool: 文件存在。
+        """
+        try:
+            os.utime(file)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def write(self, file: Path, data: bytes) -> None:
+        """
+        写入文件，先写临时文件再重命名，超出配额时淘汰其他文件。
+
+        Args:
+            file: 目录中的文件。
+            data: 文件内容。
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp = file.with_name(f"{file.name}.tmp")
+        temp.write_bytes(data)
+        replaced = 0
+        with suppress(FileNotFoundError):
+            replaced = file.stat().st_size
+        temp.replace(file)
+        with self._lock:
+            if self._total is None:
+                self._total = sum(stat.st_size for stat, _ in self._scan())
+            else:
+                self._total += len(data) - replaced
+            if self._total > self.quota:
+                self._evict()
+
+    def _scan(self) -> list[tuple[os.stat_result, Path]]:
+        files = []
+        for file in self.path.glob("*.png"):
+            # 文件可能同时被其他进程删除
+            with suppress(FileNotFoundError):
+                files.append((file.stat(), file))
+        return files
+
+    def _evict(self) -> None:
+        files = self._scan()
+        total = sum(stat.st_size for stat, _ in files)
+        target = self.quota * 9 // 10
+        for stat, file in sorted(files, key=lambda item: item[0].st_mtime):
+            if total <= target:
+                break
+            file.unlink(missing_ok=True)
+            total -= stat.st_size
+        self._total = total
+
+
+class RenderCache:
+    """
+    渲染结果的两级缓存。
+
+    内存中按 LRU 保留最近的 `max_entries` 张图片；磁盘上每张图片保存为 `<key>.png`，
+    总大小超过 `disk_quota` 字节时删除最久未访问的文件(见 `DiskQuota`)。相同键的并发渲染只执行一次。
+    """
+
+    def __init__(self, path: Path, max_entries: int, disk_quota: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.disk_quota = disk_quota
+        self._disk = DiskQuota(path, disk_quota)
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get_or_render(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        获取缓存的渲染结果，未命中时调用 render 渲染并写入缓存。
+
+        Args:
+            key: 缓存键，见 `render_key`。
+            render: 渲染函数，返回 PNG 字节。
+
+        Returns:
+            bytes: PNG 字节。
+        """
+        image = self._memory.get(key)
+        if image is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return image
+        return await self._flight.do(key, lambda: self._load_or_render(key, render))
+
+    async def _load_or_render(self, key: str, render: Callable[[], Awaitable[bytes]]) -> bytes:
+        image = await asyncio.to_thread(self._read, key)
+        if image is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            image = await render()
+            await asyncio.to_thread(self._write, key, image)
+        self._remember(key, image)
+        return image
+
+    def _remember(self, key: str, image: bytes) -> None:
+        self._memory[key] = image
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> bytes | None:
+        file = self.path / f"{key}.png"
+        try:
+            image = file.read_bytes()
+        except FileNotFoundError:
+            return None
+        # 更新访问时间供淘汰使用，不依赖文件系统的 atime
+        self._disk.touch(file)
+        return image
+
+    def _write(self, key: str, image: bytes) -> None:
+        try:
+            self._disk.write(self.path / f"{key}.png", image)
+        except OSError as e:
+            logger.warning(f"写入渲染缓存失败: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """
+        获取缓存统计。
+
+        Returns:
+            dict[str, int]: 内存条数及内存命中、磁盘命中、未命中次数。
+        """
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+
+render_cache = RenderCache(
+    path=plugin_config.valorant_render_cache_path,
+    max_entries=plugin_config.valorant_render_cache_size,
+    disk_quota=plugin_config.valorant_render_cache_disk_quota,
+)
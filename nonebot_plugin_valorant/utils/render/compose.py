@@ -0,0 +1,217 @@
+"""
+不依赖浏览器的商店面板合成。
+
+本模块只依赖 Pillow，函数只接收基本类型参数并返回 PNG 字节，可以在线程或子进程中调用。
+Pillow 在函数首次调用时才导入，只引用常量的模块不会加载 Pillow。
+渲染工作进程只导入本模块，因此本模块不能导入 NoneBot 或插件的其他模块。
+版式与 storefront_skinpanel.html 一致: 600px 宽的白色画布上纵向排列皮肤图标(宽 500px，居中)，
+图标下方为 "名称 - 价格"，另在图标与文字之间绘制皮肤等级颜色条。
+"""
+
+import time
+from io import BytesIO
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageFont
+
+# 图块版式变化时递增，使已缓存的图块失效
+TILE_VERSION = 1
+PANEL_WIDTH = 600
+PANEL_MIN_HEIGHT = 700
+ICON_WIDTH = 500
+MARGIN = 8
+CAPTION_SPACING = 16
+BAND_HEIGHT = 4
+TEXT_COLOR = (0, 0, 0)
+BACKGROUND = (255, 255, 255)
+WEBP_QUALITY = 90
+
+
+def run_job(func: Callable[..., Any], args: tuple) -> tuple[Any, float]:
+    """
+    在渲染工作进程中执行任务，返回结果与执行耗时(秒)。
+
+    Args:
+        func: 本模块中的函数。
+        args: 函数参数。
+    """
+    start = time.perf_counter()
+    return func(*args), time.perf_counter() - start
+
+
+def load_font(font_path: str | None, size: int) -> "ImageFont.FreeTypeFont | ImageFont.ImageFont":
+    """
+    加载字体，未指定路径时使用 Pillow 内置字体。
+
+    内置字体不包含中文字形，显示中文皮肤名称需要指定字体文件。
+
+    Args:
+        font_path: TrueType/OpenType 字体文件路径。
+        size: 字号(像素)。
+
+    Returns:
+        字体对象。
+    """
+    from PIL import ImageFont
+
+    if font_path:
+        return ImageFont.truetype(font_path, size)
+    return ImageFont.load_default(size=size)
+
+
+def compose_tile(
+    icon_path: str,
+    caption: str,
+    color: int | None,
+    font: "ImageFont.FreeTypeFont | ImageFont.ImageFont",
+) -> "Image.Image":
+    """
+    合成单个皮肤的图块。
+
+    Args:
+        icon_path: 皮肤图标路径，文件不存在时只绘制文字。
+        caption: 图标下方的文字。
+        color: 皮肤等级颜色(0xRRGGBB)，为 None 时不绘制颜色条。
+        font: 字体。
+
+    Returns:
+        Image.Image: RGBA 图块，宽度为 PANEL_WIDTH - 2 * MARGIN。
+    """
+    from PIL import Image, ImageDraw
+
+    width = PANEL_WIDTH - 2 * MARGIN
+    try:
+        with Image.open(icon_path) as source:
+            icon = source.convert("RGBA")
+        icon = icon.resize((ICON_WIDTH, max(1, round(icon.height * ICON_WIDTH / icon.width))), Image.LANCZOS)
+    except OSError:
+        icon = None
+
+    measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    left, top, right, bottom = measure.textbbox((0, 0), caption, font=font)
+    icon_height = icon.height if icon is not None else 0
+    band_height = BAND_HEIGHT if color is not None else 0
+    height = icon_height + band_height + CAPTION_SPACING * 2 + (bottom - top)
+
+    tile = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    icon_left = (width - ICON_WIDTH) // 2
+    if icon is not None:
+        tile.paste(icon, (icon_left, 0), icon)
+    draw = ImageDraw.Draw(tile)
+    if color is not None:
+        rgb = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+        draw.rectangle((icon_left, icon_height, icon_left + ICON_WIDTH - 1, icon_height + band_height - 1), fill=rgb)
+    text_top = icon_height + band_height + CAPTION_SPACING - top
+    draw.text(((width - (right - left)) // 2 - left, text_top), caption, font=font, fill=TEXT_COLOR)
+    return tile
+
+
+def compose_skin_panel(
+    skins: list[tuple[str, str, str, int | None]],
+    font_path: str | None = None,
+    font_size: int = 16,
+) -> bytes:
+    """
+    合成每日商店面板。
+
+    Args:
+        skins: 每个皮肤的 (图标路径, 名称, 价格文字, 等级颜色)。
+        font_path: 字体文件路径，见 `load_font`。
+        font_size: 字号(像素)。
+
+    Returns:
+        bytes: PNG 图片。
+    """
+    font = load_font(font_path, font_size)
+    tiles = [compose_tile(icon_path, f"{name} - {cost}", color, font) for icon_path, name, cost, color in skins]
+    return _encode(_stack(tiles))
+
+
+def render_tile(
+    icon_path: str,
+    name: str,
+    cost: str,
+    color: int | None,
+    font_path: str | None = None,
+    font_size: int = 16,
+) -> bytes:
+    """
+    渲染单个皮肤的图块，供 `compose_tiles` 拼接。
+
+    Args:
+        icon_path: 皮肤图标路径。
+        name: 皮肤名称。
+        cost: 价格文字。
+        color: 皮肤等级颜色。
+        font_path: 字体文件路径，见 `load_font`。
+        font_size: 字号(像素)。
+
+    Returns:
+        bytes: RGBA PNG 图块。
+    """
+    return _encode(compose_tile(icon_path, f"{name} - {cost}", color, load_font(font_path, font_size)))
+
+
+def resize_icon(icon_path: str, width: int, image_format: str) -> bytes:
+    """
+    将图标等比缩放到指定宽度并重新编码，用于生成资源的缩略图。
+
+    Args:
+        icon_path: 原始图标路径。
+        width: 目标宽度(像素)，原图更窄时不放大。
+        image_format: "PNG" 或 "WEBP"。
+
+    Returns:
+        bytes: 编码后的图片。
+    """
+    from PIL import Image
+
+    with Image.open(icon_path) as source:
+        icon = source.convert("RGBA")
+    if icon.width > width:
+        icon = icon.resize((width, max(1, round(icon.height * width / icon.width))), Image.LANCZOS)
+    buffer = BytesIO()
+    if image_format == "WEBP":
+        icon.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=6)
+    else:
+        icon.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def compose_tiles(tile_paths: list[str]) -> bytes:
+    """
+    将已渲染的图块纵向拼接为每日商店面板，结果与 `compose_skin_panel` 一致。
+
+    Args:
+        tile_paths: `render_tile` 生成的图块文件路径。
+
+    Returns:
+        bytes: PNG 图片。
+    """
+    from PIL import Image
+
+    tiles = []
+    for path in tile_paths:
+        with Image.open(path) as tile:
+            tiles.append(tile.convert("RGBA"))
+    return _encode(_stack(tiles))
+
+
+def _stack(tiles: list["Image.Image"]) -> "Image.Image":
+    from PIL import Image
+
+    height = max(PANEL_MIN_HEIGHT, MARGIN * 2 + sum(tile.height for tile in tiles))
+    panel = Image.new("RGB", (PANEL_WIDTH, height), BACKGROUND)
+    top = MARGIN
+    for tile in tiles:
+        panel.paste(tile, (MARGIN, top), tile)
+        top += tile.height
+    return panel
+
+
+def _encode(image: "Image.Image") -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,138 @@
+import asyncio
+from pathlib import Path
+from collections.abc import AsyncIterator
+from contextlib import suppress, asynccontextmanager
+
+from nonebot.log import logger
+from playwright.async_api import Page
+from nonebot import require, get_driver
+
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.errors import RenderError
+
+require("nonebot_plugin_htmlrender")
+
+from nonebot_plugin_htmlrender import get_browser  # noqa: E402
+
+
+class PagePool:
+    """
+    常驻的浏览器页面池。
+
+    每个页面只加载一次模板，渲染时调用模板中的 `window.render` 替换数据并等待图片加载完成，
+    不再为每次渲染打开和关闭页面。同时借出的页面不超过 `size` 个，调用者先取得名额再取空闲页面，
+    没有空闲页面时新建，因此被关闭的页面释放的名额可以立即被排队的调用者用于重建。
+    等待名额超过 `timeout` 秒抛出 asyncio.TimeoutError。渲染出错的页面会被关闭，下次按需重建。
+    """
+
+    def __init__(self, template: Path, size: int, timeout: float, viewport: dict[str, int]) -> None:
+        self.template = template
+        self.size = size
+        self.timeout = timeout
+        self.viewport = viewport
+        self._idle: list[Page] = []
+        self._slots = asyncio.Semaphore(size)
+        self._created = 0
+        self.waiting = 0
+
+    async def _new_page(self) -> Page:
+        browser = await get_browser()
+        page = await browser.new_page(viewport=self.viewport)
+        await page.goto(self.template.as_uri(), wait_until="load")
+        logger.debug(f"渲染页面已创建: {self.template.name}")
+        return page
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """
+        借用一个已加载模板的页面，用完后归还。
+
+        Yields:
+            Page: 页面。
+        """
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            # 持有名额时空闲页面与借出页面之和不超过 size，没有空闲页面时一定可以新建
+            if self._idle:
+                page = self._idle.pop()
+            else:
+                self._created += 1
+                try:
+                    page = await self._new_page()
+                except BaseException:
+                    self._created -= 1
+                    raise
+
+            healthy = False
+            try:
+                yield page
+                healthy = True
+            finally:
+                if healthy and not page.is_closed():
+                    self._idle.append(page)
+                else:
+                    self._created -= 1
+                    with suppress(Exception):
+                        await page.close()
+        finally:
+            self._slots.release()
+
+    async def warm(self) -> None:
+        """创建一个页面并放回池中，使浏览器启动与模板加载在启动阶段完成。"""
+        async with self.page():
+            pass
+
+    async def close(self) -> None:
+        """关闭所有空闲页面。"""
+        while self._idle:
+            page = self._idle.pop()
+            self._created -= 1
+            with suppress(Exception):
+                await page.close()
+
+    def stats(self) -> dict[str, int]:
+        """
+        获取页面池状态。
+
+        Returns:
+            dict[str, int]: 页面上限、已创建、空闲页面数与排队数。
+        """
+        return {"size": self.size, "created": self._created, "idle": len(self._idle), "waiting": self.waiting}
+
+
+async def render_page(pool: PagePool, data) -> bytes:
+    """
+    使用页面池中的页面渲染数据并截图。
+
+    Args:
+        pool: 页面池。
+        data: 传给模板 `window.render` 的数据，须可被 JSON 序列化。
+
+    Returns:
+        bytes: PNG 图片。
+
+    Raises:
+        RenderError: 等待页面或图片加载超时。
+    """
+    try:
+        async with pool.page() as page:
+            await asyncio.wait_for(page.evaluate("data => window.render(data)", data), pool.timeout)
+            return await page.screenshot(full_page=True, type="png")
+    except asyncio.TimeoutError as e:
+        logger.warning(f"渲染超时: {pool.stats()}")
+        raise RenderError("errors.RENDER.TIMEOUT") from e
+
+
+storefront_pool = PagePool(
+    template=Path(__file__).parent / "templates" / "storefront_skinpanel.html",
+    size=plugin_config.valorant_render_pages,
+    timeout=plugin_config.valorant_render_timeout,
+    viewport={"width": 600, "height": 700},
+)
+
+get_driver().on_shutdown(storefront_pool.close)
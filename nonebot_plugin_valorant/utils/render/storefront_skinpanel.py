@@ -1,109 +1,142 @@
-import copy
 import time
+import asyncio
 from pathlib import Path
 
 from nonebot import logger
-from nonebot_plugin_htmlrender import template_to_pic
 
 from nonebot_plugin_valorant.database.db import DB
 from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.database.models import User
 from nonebot_plugin_valorant.utils.requestlib.player_info import PlayerInformation
+from nonebot_plugin_valorant.resources.image.store import PANEL_VARIANT, asset_store
 
-from ..errors import RequestError
+from .tiles import tile_cache
+from ...database.index import catalog_index
 from ..requestlib.endpoint import EndpointAPI
+from ..errors import RenderError, RequestError
 from ..requestlib.auth import Auth, AuthCredentials
+from .cache import render_key, render_cache, template_hash
 from ..parsinglib.endpoint_parsing import SkinsPanel, skin_panel_parser
 
+TEMPLATE_PATH = Path(__file__).parent / "templates"
+TEMPLATE_NAME = "storefront_skinpanel.html"
+
 
 async def login_status(qq_uid: str) -> bool:
     return await DB.get_user(qq_uid) is not None
 
 
-async def parse_user_info(qq_uid: str):
-    user = await DB.get_user(qq_uid)
-    if user is None:
-        return None, None
-    player_info = PlayerInformation(
+def player_information(user: User) -> PlayerInformation:
+    """由数据库中的用户信息构建玩家信息。"""
+    return PlayerInformation(
         puuid=user.puuid,
         player_name=user.username,
         region=user.region,
     )
+
+
+async def _save_credentials(qq_uid: str, data: AuthCredentials) -> None:
+    await DB.update_user(
+        filter_by={"qq_uid": qq_uid},
+        update_values={
+            "access_token": data.access_token,
+            "token_id": data.token_id,
+            "expiry_token": data.expiry_token,
+            "emt": data.entitlements_token,
+            "cookie": data.cookie,
+        },
+    )
+
+
+async def fetch_skin_panel(user: User) -> SkinsPanel:
+    """
+    从 Riot 获取用户的每日商店，令牌过期时先刷新并保存新的令牌。
+
+    Args:
+        user: 用户信息。
+
+    Returns:
+        SkinsPanel: 每日商店。
+    """
+    player_info = player_information(user)
     auth_info = AuthCredentials(
         cookie=user.cookie,
         access_token=user.access_token,
+        token_id=user.token_id,
         entitlements_token=user.emt,
         expiry_token=user.expiry_token,
     )
     data = await Auth.token_validity(auth_info.cookie, auth_info.expiry_token)
-    if data is None:
-        try:
-            resp = await EndpointAPI(player_info, auth_info).get_player_storefront()
-            return await skin_panel_parser(resp), player_info
-        except RequestError:
-            data = await Auth().redeem_cookies(auth_info.cookie)
-            resp = await EndpointAPI(player_info, auth_info).get_player_storefront()
-            await DB.update_user(
-                filter_by={"qq_uid": qq_uid},
-                update_values={
-                    "access_token": data.access_token,
-                    "token_id": data.token_id,
-                    "expiry_token": data.expiry_token,
-                    "emt": data.entitlements_token,
-                    "cookie": data.cookie,
-                },
-            )
-            return await skin_panel_parser(resp), player_info
-    else:
-        await DB.update_user(
-            filter_by={"qq_uid": qq_uid},
-            update_values={
-                "access_token": data.access_token,
-                "token_id": data.token_id,
-                "expiry_token": data.expiry_token,
-                "emt": data.entitlements_token,
-                "cookie": data.cookie,
-            },
-        )
-        auth_info = copy.copy(data)
-        resp = await EndpointAPI(player_info, auth_info).get_player_storefront()
-        return await skin_panel_parser(resp), player_info
+    if data is not None:
+        await _save_credentials(user.qq_uid, data)
+        auth_info = data
+    try:
+        resp = await EndpointAPI(player_info, auth_info).fetch_storefront()
+    except RequestError:
+        auth_info = await Auth().redeem_cookies(auth_info.cookie)
+        await _save_credentials(user.qq_uid, auth_info)
+        resp = await EndpointAPI(player_info, auth_info).fetch_storefront()
+    return await skin_panel_parser(resp)
+
+
+async def parse_user_info(qq_uid: str):
+    user = await DB.get_user(qq_uid)
+    if user is None:
+        return None, None
+    return await fetch_skin_panel(user), player_information(user)
 
 
 async def render_skin_panel(data: SkinsPanel) -> bytes:
-    start_time = time.time()
-    template_path = str(Path(__file__).parent / "templates")
-    template_name = "storefront_skinpanel.html"
-    images = [
-        {
-            "src": f"{plugin_config.resource_path}\\{data.skin1.uuid}.png",
-            "name": f"{data.skin1.name}",
-            "cost": f"V{data.skin1.cost}",
-        },
-        {
-            "src": f"{plugin_config.resource_path}\\{data.skin2.uuid}.png",
-            "name": f"{data.skin2.name}",
-            "cost": f"V{data.skin2.cost}",
-        },
-        {
-            "src": f"{plugin_config.resource_path}\\{data.skin3.uuid}.png",
-            "name": f"{data.skin3.name}",
-            "cost": f"V{data.skin3.cost}",
-        },
-        {
-            "src": f"{plugin_config.resource_path}\\{data.skin4.uuid}.png",
-            "name": f"{data.skin4.name}",
-            "cost": f"V{data.skin4.cost}",
-        },
-    ]
-    pic = await template_to_pic(
-        template_path=template_path,
-        template_name=template_name,
-        templates={"images": images},
-        pages={
-            "viewport": {"width": 600, "height": 700},
-            "base_url": f"file://{template_path}",
-        },
-        wait=2,
+    """
+    渲染每日商店，相同的报价、语言、皮肤数据与模板复用缓存的图片。
+
+    Args:
+        data: 每日商店。
+
+    Returns:
+        bytes: PNG 图片。
+
+    Raises:
+        RenderError: 渲染超时。
+    """
+    # 商店不足四个报价时空缺的位置为 None
+    skins = [skin for skin in (data.skin1, data.skin2, data.skin3, data.skin4) if skin is not None]
+    key = render_key(
+        "storefront_skinpanel",
+        plugin_config.valorant_render_backend,
+        [(skin.uuid, skin.cost, skin.currency) for skin in skins],
+        plugin_config.language_type,
+        catalog_index.manifest_id,
+        template_hash(TEMPLATE_PATH / TEMPLATE_NAME),
     )
-    logger.debug(f"渲染耗时: {time.time() - start_time}")
+    return await render_cache.get_or_render(key, lambda: _render_skin_panel(data))
+
+
+async def _render_skin_panel(data: SkinsPanel) -> bytes:
+    start_time = time.perf_counter()
+    skins = [skin for skin in (data.skin1, data.skin2, data.skin3, data.skin4) if skin is not None]
+    if plugin_config.valorant_render_backend == "pillow":
+        try:
+            pic = await tile_cache.compose_panel(skins)
+        except asyncio.TimeoutError as e:
+            raise RenderError("errors.RENDER.TIMEOUT") from e
+    else:
+        # 只有使用浏览器渲染时才导入 htmlrender，Pillow 节点无需安装浏览器
+        from .pool import render_page, storefront_pool
+
+        # 浏览器加载图标期间不淘汰图标
+        async with asset_store.pinned(skin.uuid for skin in skins):
+            icons = await asyncio.gather(
+                *(asset_store.get(skin.uuid, skin.icon or None, PANEL_VARIANT) for skin in skins)
+            )
+            images = [
+                {
+                    "src": icon.as_uri() if icon is not None else "",
+                    "name": f"{skin.name}",
+                    "cost": f"V{skin.cost}",
+                }
+                for skin, icon in zip(skins, icons)
+            ]
+            pic = await render_page(storefront_pool, images)
+    logger.debug(f"渲染耗时: {time.perf_counter() - start_time:.3f}s")
     return pic
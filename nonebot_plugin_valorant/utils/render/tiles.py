@@ -0,0 +1,158 @@
+import time
+import asyncio
+from pathlib import Path
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from nonebot.log import logger
+
+from nonebot_plugin_valorant.database.db import DB
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.database.index import catalog_index
+from nonebot_plugin_valorant.utils.requestlib.request_res import tiers
+from nonebot_plugin_valorant.utils.parsinglib.endpoint_parsing import Skin
+from nonebot_plugin_valorant.utils.requestlib.singleflight import SingleFlight
+from nonebot_plugin_valorant.resources.image.store import THUMBNAIL, asset_store
+
+from .workers import render_workers
+from .cache import DiskQuota, render_key
+from .compose import TILE_VERSION, render_tile, compose_tiles
+
+
+class TileCache:
+    """
+    单个皮肤卡片(图标、名称、价格)的图块缓存。
+
+    图块按 (皮肤 UUID, 图标文件, 名称, 价格, 等级颜色, 语言, 字体, 版式版本) 缓存为磁盘上的 PNG，
+    每种组合只渲染一次；每日商店面板由四个图块拼接而成，不再逐项排版。
+    资源清单值不参与缓存键，版本更新只使内容变化的皮肤生成新图块。
+    图块总大小超过 `disk_quota` 字节时删除最久未使用的图块(见 `DiskQuota`)。
+    """
+
+    def __init__(self, path: Path, disk_quota: int) -> None:
+        self.path = path
+        self.disk_quota = disk_quota
+        self._disk = DiskQuota(path, disk_quota)
+        self._flight = SingleFlight()
+
+    def _key(self, skin: Skin, icon: Path | None) -> str:
+        # 图标文件名即内容哈希，图标下载失败时生成的无图标图块在图标可用后自动失效
+        return render_key(
+            "tile",
+            TILE_VERSION,
+            skin.uuid,
+            icon.name if icon is not None else None,
+            skin.name,
+            skin.cost,
+            self._color(skin),
+            plugin_config.language_type,
+            plugin_config.valorant_render_font_path,
+            plugin_config.valorant_render_font_size,
+        )
+
+    @staticmethod
+    def _color(skin: Skin) -> int | None:
+        return tiers.get(skin.tier, {}).get("color")
+
+    async def get_tile(self, skin: Skin) -> Path:
+        """
+        获取皮肤的图块文件，不存在时在渲染进程池中渲染。
+
+        Args:
+            skin: 皮肤。
+
+        Returns:
+            Path: 图块文件路径。
+        """
+        # 渲染进程读取图标期间不淘汰图标
+        async with asset_store.pinned([skin.uuid]):
+            icon = await asset_store.get(skin.uuid, skin.icon or None, THUMBNAIL)
+            file = self.path / f"{self._key(skin, icon)}.png"
+            # 命中时更新修改时间供淘汰使用
+            if await asyncio.to_thread(self._disk.touch, file):
+                return file
+            return await self._flight.do(file, lambda: self._render(skin, icon, file))
+
+    async def _render(self, skin: Skin, icon: Path | None, file: Path) -> Path:
+        tile = await render_workers.submit(
+            render_tile,
+            str(icon) if icon is not None else "",
+            f"{skin.name}",
+            f"V{skin.cost}",
+            self._color(skin),
+            plugin_config.valorant_render_font_path or None,
+            plugin_config.valorant_render_font_size,
+        )
+        await asyncio.to_thread(self._disk.write, file, tile)
+        return file
+
+    async def compose_panel(self, skins: list[Skin]) -> bytes:
+        """
+        由图块拼接每日商店面板。
+
+        Args:
+            skins: 面板中的皮肤，按显示顺序排列。
+
+        Returns:
+            bytes: PNG 图片。
+        """
+        files = await asyncio.gather(*(self.get_tile(skin) for skin in skins))
+        return await render_workers.submit(compose_tiles, [str(file) for file in files])
+
+    async def warm(self, offers: Iterable[tuple[str, int]]) -> int:
+        """
+        预先渲染给定报价的图块。
+
+        Args:
+            offers: (皮肤 UUID, 价格) 列表。
+
+        Returns:
+            int: 成功渲染或已存在的图块数。
+        """
+        offers = list(offers)
+        entries = await catalog_index.get_skins([uuid for uuid, _ in offers])
+        skins = [
+            Skin(uuid=uuid, name=entry.name, icon=entry.icon, tier=entry.tier, cost=cost)
+            for uuid, cost in offers
+            if (entry := entries.get(uuid)) is not None
+        ]
+        # 与工作进程数相同的并发，预热任务不会挤占用户请求的渲染
+        semaphore = asyncio.Semaphore(render_workers.size)
+
+        async def warm_one(skin: Skin) -> Path:
+            async with semaphore:
+                return await self.get_tile(skin)
+
+        results = await asyncio.gather(*(warm_one(skin) for skin in skins), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"图块渲染失败: {result!r}")
+        return sum(not isinstance(result, BaseException) for result in results)
+
+
+tile_cache = TileCache(plugin_config.valorant_tile_cache_path, plugin_config.valorant_tile_cache_disk_quota)
+
+_warming: asyncio.Task | None = None
+
+
+async def warm_active_tiles() -> None:
+    """预先渲染所有未过期商店中皮肤的图块。"""
+    start = time.perf_counter()
+    try:
+        offers = await DB.get_active_offers(datetime.now(timezone.utc).replace(tzinfo=None))
+        count = await tile_cache.warm(offers)
+    except Exception as e:
+        logger.warning(f"图块预热失败: {e!r}")
+        return
+    logger.info(f"图块预热完成: {count}/{len(offers)}, 耗时 {time.perf_counter() - start:.2f}s")
+
+
+def schedule_tile_warming() -> None:
+    """
+    在后台预热图块，仅在使用 Pillow 渲染时生效；上一次预热未结束时不重复启动。
+    """
+    global _warming
+    if plugin_config.valorant_render_backend != "pillow":
+        return
+    if _warming is None or _warming.done():
+        _warming = asyncio.create_task(warm_active_tiles())
@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import types
+import asyncio
+import multiprocessing
+from pathlib import Path
+from typing import Any, TypeVar
+from contextlib import contextmanager
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from nonebot import get_driver
+from nonebot.log import logger
+
+from nonebot_plugin_valorant.config import plugin_config
+
+from .compose import run_job
+
+T = TypeVar("T")
+
+# 在工作进程中把插件的上级包登记为空包，导入 compose 时不执行插件与 NoneBot 的初始化代码
+_BOOTSTRAP = """
+import sys, types
+for name, path in packages:
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [path]
+        sys.modules[name] = module
+"""
+
+
+def _parent_packages() -> list[tuple[str, str]]:
+    names = __name__.split(".")[:-1]
+    path = Path(__file__).parent
+    packages = []
+    for depth in range(len(names), 0, -1):
+        packages.append((".".join(names[:depth]), str(path)))
+        path = path.parent
+    return packages[::-1]
+
+
+@contextmanager
+def _without_main_script() -> Iterator[None]:
+    # spawn 与 forkserver 创建的子进程会以 __mp_main__ 的名义重新执行父进程的 __main__(即 bot.py)，
+    # 从而初始化 NoneBot 并加载全部插件；启动子进程期间以空模块替换 __main__，子进程不执行任何启动脚本
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class RenderWorkerPool:
+    """
+    图片合成的工作进程池。
+
+    图标解码、缩放、文字排版与 PNG 编码都是 CPU 密集操作，放在子进程中执行以免阻塞事件循环。
+    提交的函数必须是 `compose` 中的模块级函数，参数只应包含 id、价格、路径等基本类型，返回值为 PNG 字节。
+
+    工作进程由 forkserver 创建(不支持的平台使用 spawn)，不会继承事件循环进程中的线程与锁。
+    子进程不重新执行启动脚本，插件的上级包登记为空包，因此只导入 `compose` 与 Pillow，不初始化 NoneBot。
+    进程池在提交任务时按需启动子进程，提交任务期间 `__main__` 被暂时替换为空模块。
+
+    同时交给进程池的任务不超过进程数，其余任务在事件循环中排队，`timeout` 只计算任务开始执行后的时间。
+    超时的任务无法中断，在执行完毕前继续占用一个工作进程，计入 `stats()` 的 running 与 abandoned。
+    """
+
+    def __init__(self, size: int, timeout: float) -> None:
+        self.size = size
+        self.timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(size)
+        self._abandoned: set[asyncio.Future] = set()
+        self.running = 0
+        self.queued = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.busy_seconds = 0.0
+        self._started_at = time.monotonic()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        if context.get_start_method() == "forkserver":
+            # forkserver 默认预加载 __main__(即 bot.py)，改为只预加载 Pillow
+            context.set_forkserver_preload(["PIL.Image", "PIL.ImageDraw", "PIL.ImageFont"])
+        return ProcessPoolExecutor(
+            max_workers=self.size,
+            mp_context=context,
+            initializer=exec,
+            initargs=(_BOOTSTRAP, {"packages": _parent_packages()}),
+        )
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    async def startup(self) -> None:
+        """
+        创建工作进程。
+
+        进程池在首次提交任务时才会启动工作进程，此处提交一个空任务，使子进程在启动阶段创建，
+        而不是在处理消息时。由启动流程的 render 阶段在后台调用。
+        """
+        await self.submit(os.getpid)
+        logger.debug(f"渲染进程池已创建, 共 {self.size} 个工作进程")
+
+    def _job_done(self, future: asyncio.Future) -> None:
+        # 任务真正结束(包括超时后被放弃的任务)时才归还名额
+        self.running -= 1
+        self._slots.release()
+        if future in self._abandoned:
+            self._abandoned.discard(future)
+            if not future.cancelled() and future.exception() is None:
+                self.busy_seconds += future.result()[1]
+
+    async def submit(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        提交任务并等待结果。
+
+        Args:
+            func: `compose` 中的模块级函数。
+            *args: 函数参数，须可被 pickle 序列化。
+
+        Returns:
+            函数返回值。
+
+        Raises:
+            asyncio.TimeoutError: 任务开始执行后 timeout 秒内未完成。
+        """
+        loop = asyncio.get_running_loop()
+        self.submitted += 1
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        try:
+            with _without_main_script():
+                future = loop.run_in_executor(self.executor, run_job, func, args)
+        except BaseException:
+            self.running -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(self._job_done)
+        try:
+            # shield 使超时或取消只放弃等待，任务结束前名额不归还
+            result, seconds = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._abandoned.add(future)
+            logger.warning(f"渲染任务 {func.__name__} 超时({self.timeout}s)")
+            raise
+        except asyncio.CancelledError:
+            self._abandoned.add(future)
+            raise
+        except BrokenProcessPool:
+            # 工作进程异常退出时整个进程池不可用，下次提交时重建
+            self.failed += 1
+            self._executor = None
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        self.completed += 1
+        self.busy_seconds += seconds
+        return result
+
+    async def close(self) -> None:
+        """关闭进程池，未开始的任务被取消。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict[str, float]:
+        """
+        获取进程池统计。
+
+        Returns:
+            dict[str, float]: 进程数、执行中(含已超时仍在执行)、已放弃与排队的任务数、
+            累计提交/完成/失败/超时次数，以及启动以来的平均利用率(工作进程忙碌时间占总时间的比例)。
+        """
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            "workers": self.size,
+            "running": self.running,
+            "abandoned": len(self._abandoned),
+            "queued": self.queued,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "utilisation": self.busy_seconds / (self.size * elapsed),
+        }
+
+
+render_workers = RenderWorkerPool(
+    size=plugin_config.valorant_render_workers,
+    timeout=plugin_config.valorant_render_job_timeout,
+)
+
+get_driver().on_shutdown(render_workers.close)
@@ -9,6 +9,8 @@ import urllib3.exceptions
 from pydantic import BaseModel
 
 from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.requestlib.singleflight import SingleFlight
+from nonebot_plugin_valorant.utils.requestlib.resilience import call_with_retry
 from nonebot_plugin_valorant.utils.errors import ResponseError, DataParseError, AuthenticationError
 
 # disable urllib3 warnings that might arise from making requests to 127.0.0.1
@@ -16,6 +18,13 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 PROXY = plugin_config.valorant_proxies
 
+AUTH_HOST = "auth.riotgames.com"
+ENTITLEMENTS_HOST = "entitlements.auth.riotgames.com"
+GEO_HOST = "riot-geo.pas.si.riotgames.com"
+
+# 同一组 cookies 的并发刷新只向 Riot 发送一次请求
+_refresh_flight = SingleFlight()
+
 
 class AuthCredentials(BaseModel):
     """
@@ -130,11 +139,15 @@ class Auth:
         }
 
         # 发送初始授权请求。
-        response = await session.post(
-            self.AUTH_URL,
-            json=data,
-            headers=self.headers,
-            proxy=PROXY,
+        response = await call_with_retry(
+            AUTH_HOST,
+            lambda: session.post(
+                self.AUTH_URL,
+                json=data,
+                headers=self.headers,
+                proxy=PROXY,
+            ),
+            idempotent=False,
         )
 
         # 准备授权请求的 cookies。
@@ -152,17 +165,20 @@ class Auth:
             "remember": True,
         }
 
-        # 发送身份验证请求。
-        async with session.put(
-            self.AUTH_URL,
-            json=data,
-            headers=self.headers,
-            cookies=cookies["cookie"],
-            proxy=PROXY,
-        ) as response:
-            data = await response.json()
-            for cookie in response.cookies.items():
-                cookies["cookie"][cookie[0]] = str(cookie).split("=")[1].split(";")[0]
+        # 发送身份验证请求，包含密码的请求不重试。
+        async def send_credentials():
+            async with session.put(
+                self.AUTH_URL,
+                json=data,
+                headers=self.headers,
+                cookies=cookies["cookie"],
+                proxy=PROXY,
+            ) as resp:
+                return resp, await resp.json()
+
+        response, data = await call_with_retry(AUTH_HOST, send_credentials, idempotent=False)
+        for cookie in response.cookies.items():
+            cookies["cookie"][cookie[0]] = str(cookie).split("=")[1].split(";")[0]
 
         # 关闭会话。
         await session.close()
@@ -230,14 +246,17 @@ class Auth:
         # noinspection SpellCheckingInspection
         data = {"type": "multifactor", "code": code, "rememberDevice": True}
 
-        # 发送输入 2FA 验证码请求。
-        async with session.put(
-            self.AUTH_URL,
-            headers=self.headers,
-            json=data,
-            cookies=cookies["cookie"],
-        ) as r:
-            data = await r.json()
+        # 发送输入 2FA 验证码请求，验证码只能使用一次，不重试。
+        async def send_code():
+            async with session.put(
+                self.AUTH_URL,
+                headers=self.headers,
+                json=data,
+                cookies=cookies["cookie"],
+            ) as resp:
+                return resp, await resp.json()
+
+        r, data = await call_with_retry(AUTH_HOST, send_code, idempotent=False)
 
         await session.close()
 
@@ -280,22 +299,29 @@ class Auth:
         if isinstance(cookies, str):
             cookies = json.loads(cookies)
 
-        # 创建一个新的 HTTP 会话
-        session = ClientSession()
-
         # 取出 cookies
         if "cookie" in cookies:
             cookies = cookies["cookie"]
 
+        key = cookies.get("ssid") or json.dumps(cookies, sort_keys=True)
+        return await _refresh_flight.do(key, lambda: self._redeem_cookies(cookies))
+
+    async def _redeem_cookies(self, cookies: dict) -> AuthCredentials:
+        # 创建一个新的 HTTP 会话
+        session = ClientSession()
+
         # 向 Riot 的验证网站发送请求
-        async with session.get(
-            "https://auth.riotgames.com/authorize?redirect_uri=https%3A%2F%2Fplayvalorant.com%2Fopt_in&client_id"
-            "=play"
-            "-valorant-web-prod&response_type=token%20id_token&scope=account%20openid&nonce=1",
-            cookies=cookies,
-            allow_redirects=False,
-        ) as r:
-            data = await r.text()
+        async def send():
+            async with session.get(
+                "https://auth.riotgames.com/authorize?redirect_uri=https%3A%2F%2Fplayvalorant.com%2Fopt_in&client_id"
+                "=play"
+                "-valorant-web-prod&response_type=token%20id_token&scope=account%20openid&nonce=1",
+                cookies=cookies,
+                allow_redirects=False,
+            ) as resp:
+                return resp, await resp.text()
+
+        r, data = await call_with_retry(AUTH_HOST, send)
 
         await session.close()
 
@@ -392,15 +418,18 @@ class Auth:
         session = ClientSession()
 
         # 发送登录请求
-        r = await session.get(
-            "https://auth.riotgames.com/authorize"
-            "?redirect_uri=https%3A%2F%2Fplayvalorant.com%2Fopt_in"
-            "&client_id=play-valorant-web-prod"
-            "&response_type=token%20id_token"
-            "&scope=account%20openid"
-            "&nonce=1",
-            allow_redirects=False,
-            headers=self.headers,
+        r = await call_with_retry(
+            AUTH_HOST,
+            lambda: session.get(
+                "https://auth.riotgames.com/authorize"
+                "?redirect_uri=https%3A%2F%2Fplayvalorant.com%2Fopt_in"
+                "&client_id=play-valorant-web-prod"
+                "&response_type=token%20id_token"
+                "&scope=account%20openid"
+                "&nonce=1",
+                allow_redirects=False,
+                headers=self.headers,
+            ),
         )
 
         # 删除请求头中的 Cookie
@@ -516,13 +545,16 @@ class Auth:
             "Authorization": f"Bearer {access_token}",
         }
 
-        try:
+        async def send():
             async with session.post(
                 "https://entitlements.auth.riotgames.com/api/token/v1",
                 headers=headers,
                 json={},
             ) as r:
-                data = await r.json()
+                return await r.json()
+
+        try:
+            data = await call_with_retry(ENTITLEMENTS_HOST, send, idempotent=False)
         except aiohttp.ClientResponseError as error:
             raise ResponseError("errors.API.REQUEST_FAILED") from error
 
@@ -553,8 +585,11 @@ class Auth:
             "Authorization": f"Bearer {access_token}",
         }
 
-        async with session.post("https://auth.riotgames.com/userinfo", headers=headers, json={}) as r:
-            data = await r.json()
+        async def send():
+            async with session.post("https://auth.riotgames.com/userinfo", headers=headers, json={}) as r:
+                return await r.json()
+
+        data = await call_with_retry(AUTH_HOST, send, idempotent=False)
 
         await session.close()
 
@@ -591,12 +626,15 @@ class Auth:
 
         body = {"id_token": token_id}
 
-        async with session.put(
-            "https://riot-geo.pas.si.riotgames.com/pas/v1/product/valorant",
-            headers=headers,
-            json=body,
-        ) as r:
-            data = await r.json()
+        async def send():
+            async with session.put(
+                "https://riot-geo.pas.si.riotgames.com/pas/v1/product/valorant",
+                headers=headers,
+                json=body,
+            ) as r:
+                return await r.json()
+
+        data = await call_with_retry(GEO_HOST, send)
 
         await session.close()
 
@@ -1,53 +1,131 @@
+import time
+import asyncio
 from importlib.metadata import version
+from collections.abc import Callable, Awaitable
 
-from nonebot_plugin_valorant.utils.requestlib.request_res import (
-    base_url,
-    get_request_json,
-    get_request_json_sync,
-)
+from nonebot.log import logger
 
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.errors import ResponseError
+from nonebot_plugin_valorant.utils.requestlib.request_res import base_url, get_request_json
 
-def get_client_version() -> str:
+
+class VersionService:
+    """
+    valorant-api.com 版本信息的异步缓存服务。
+
+    版本信息只在缓存过期后重新获取，并发调用者共享同一个刷新任务；
+    资源清单值(manifestId)变化时在后台任务中调用已注册的回调，获取版本信息的调用者不等待回调完成。
+    """
+
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+        self._data: dict | None = None
+        self._expires_at: float = 0
+        self._refreshing: asyncio.Task | None = None
+        self._listeners: list[Callable[[str, str | None], Awaitable[None]]] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def manifest_id(self) -> str | None:
+        """当前缓存的资源清单值，尚未获取时为 None。"""
+        return self._data["manifestId"] if self._data else None
+
+    def on_manifest_change(self, callback: Callable[[str, str | None], Awaitable[None]]) -> None:
+        """
+        注册资源清单值变化时的回调。
+
+        Args:
+            callback: 异步回调，参数为新的资源清单值和旧的资源清单值。
+        """
+        self._listeners.append(callback)
+
+    async def get(self, force: bool = False) -> dict:
+        """
+        获取版本信息，缓存有效时直接返回。
+
+        Args:
+            force: 是否忽略缓存强制刷新。
+
+        Returns:
+            dict: 版本信息。
+        """
+        if not force and self._data is not None and time.monotonic() < self._expires_at:
+            return self._data
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._refresh())
+        return await asyncio.shield(self._refreshing)
+
+    def invalidate(self) -> None:
+        """使缓存立即过期。"""
+        self._expires_at = 0
+
+    async def _refresh(self) -> dict:
+        resp = await get_request_json(url=base_url, sub_url="version")
+        data = resp.get("data")
+        if not data:
+            raise ResponseError("errors.API.REQUEST_FAILED")
+        data = dict(data)
+        data.pop("status", None)
+
+        previous = self.manifest_id
+        self._data = data
+        self._expires_at = time.monotonic() + self.ttl
+
+        if previous != data["manifestId"]:
+            logger.info(f"资源清单值变化: {previous} -> {data['manifestId']}")
+            for callback in self._listeners:
+                task = asyncio.create_task(self._notify(callback, data["manifestId"], previous))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        return data
+
+    @staticmethod
+    async def _notify(
+        callback: Callable[[str, str | None], Awaitable[None]], current: str, previous: str | None
+    ) -> None:
+        try:
+            await callback(current, previous)
+        except Exception as e:
+            logger.warning(f"资源清单值变化回调执行失败: {e!r}")
+
+
+version_service = VersionService(ttl=plugin_config.valorant_version_ttl)
+
+
+async def get_client_version() -> str:
     """
     获取 Valorant 客户端版本信息。
 
     Returns:
         str: 客户端版本信息，格式为 "<分支>-shipping-<构建版本>-<第四位版本号>"。
     """
-    data = get_request_json_sync(url=base_url, sub_url="version")
-    return (
-        f"{data['data']['branch']}-shipping-{data['data']['buildVersion']}-"
-        f"{data['data']['version'].split('.')[3]}"
-    )
+    data = await version_service.get()
+    return f"{data['branch']}-shipping-{data['buildVersion']}-{data['version'].split('.')[3]}"
 
 
-def get_version_data() -> dict:
-    data = get_request_json_sync(url=base_url, sub_url="version")
-    version_data = data.get("data", {})
-    version_data.pop("status", None)
-    return version_data
+async def get_version_data() -> dict:
+    return dict(await version_service.get())
 
 
-def get_valorant_version() -> str:
+async def get_valorant_version() -> str:
     """
     获取 VALORANT 版本号。
 
     Returns:
         str: VALORANT 版本号。
     """
-    data = get_request_json_sync(url=base_url, sub_url="version")
-    return data["data"]["version"]
+    return (await version_service.get())["version"]
 
 
-def get_manifest_id() -> str:
+async def get_manifest_id() -> str:
     """
     获取最新的资源清单值。
 
     Returns:
         str: 资源清单值。
     """
-    data = get_request_json_sync(url=base_url, sub_url="version")
-    return data["data"]["manifestId"]
+    return (await version_service.get())["manifestId"]
 
 
 def get_bot_version() -> str:
@@ -55,11 +133,4 @@ def get_bot_version() -> str:
 
 
 async def get_version() -> dict:
-    data = await get_request_json(
-        url=base_url,
-        sub_url="version",
-    )
-    return {
-        _version: method() if callable(method) else method
-        for _version, method in data["data"].items()
-    }
+    return dict(await version_service.get())
@@ -1,21 +1,51 @@
+import json
 from typing import Any
+from urllib.parse import urlparse
 from collections.abc import Mapping
 
 import urllib3
 
 from nonebot_plugin_valorant.utils.requestlib.auth import AuthCredentials
+from nonebot_plugin_valorant.utils.requestlib.ratelimit import rate_limiter
 from nonebot_plugin_valorant.utils.requestlib.client import get_client_version
+from nonebot_plugin_valorant.utils.requestlib.singleflight import SingleFlight
 from nonebot_plugin_valorant.utils.requestlib.player_info import PlayerInformation
+from nonebot_plugin_valorant.utils.parsinglib.structs import Storefront, decode_storefront
 from nonebot_plugin_valorant.utils.requestlib.request_res import (
     base_endpoint,
     get_request_json,
     put_request_json,
     base_endpoint_glz,
+    get_request_bytes,
     base_endpoint_shared,
 )
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 以 (puuid, 请求方法, 分区, 路径) 合并并发的相同请求
+_request_flight = SingleFlight()
+
+# 与其他地区共用分区的地区
+region_shard_override = {
+    "latam": "na",
+    "br": "na",
+}
+# glz 地址使用其他地区的分区
+shard_region_override = {"pbe": "na"}
+
+
+def resolve_shard(region: str) -> str:
+    """
+    获取地区所属的 Riot 分区。
+
+    Args:
+        region: 用户的地区。
+
+    Returns:
+        str: 分区，例如 latam 与 br 均属于 na。
+    """
+    return region_shard_override.get(region, region)
+
 
 class EndpointAPI:
     def __init__(self, player_info: PlayerInformation, auth_info: AuthCredentials) -> None:
@@ -45,27 +75,21 @@ class EndpointAPI:
         """build headers"""
 
         headers["X-Riot-ClientPlatform"] = self.client_platform
-        headers["X-Riot-ClientVersion"] = get_client_version()
         headers["X-Riot-Entitlements-JWT"] = auth.entitlements_token
         headers["Authorization"] = f"Bearer {auth.access_token}"
         return headers
 
+    async def __fill_client_version(self):
+        """补充客户端版本请求头，版本信息由缓存服务提供"""
+        if "X-Riot-ClientVersion" not in self.headers:
+            self.headers["X-Riot-ClientVersion"] = await get_client_version()
+
     def __format_region(self):
         """
         将地区格式化为符合要求的格式
         """
 
-        region_shard_override = {
-            "latam": "na",
-            "br": "na",
-        }
-
-        shard_region_override = {"pbe": "na"}
-
-        self.shard = self.region
-
-        if self.region in region_shard_override.keys():
-            self.shard = region_shard_override[self.region]
+        self.shard = resolve_shard(self.region)
 
         if self.shard in shard_region_override.keys():
             self.region = shard_region_override[self.shard]
@@ -90,6 +114,10 @@ class EndpointAPI:
         # 基于地区和分区构建URL
         self.glz = base_endpoint_glz.format(region=self.region, shard=self.shard)
 
+        # 每个分区 host 独立限流
+        for url in (self.pd, self.shared, self.glz):
+            rate_limiter.register(urlparse(url).hostname)
+
     async def get(self, api_path: str = "/", api_url: str = "pd") -> dict:
         """
         从 API 获取数据。
@@ -105,8 +133,31 @@ class EndpointAPI:
             ResponseError: 如果 API 返回的响应结果为空，则抛出异常。
         """
         api_endpoint = getattr(self, api_url)
+        await self.__fill_client_version()
+
+        return await _request_flight.do(
+            (self.puuid, "GET", api_url, api_path),
+            lambda: get_request_json(f"{api_endpoint}{api_path}", headers=self.headers),
+        )
+
+    async def get_bytes(self, api_path: str = "/", api_url: str = "pd") -> bytes:
+        """
+        从 API 获取未解码的响应体，供结构化解码使用。
+
+        Args:
+            api_path (str): API 的路径，默认为根路径。
+            api_url (str): API 的 URL 名称，默认为 pd。
+
+        Returns:
+            bytes: 响应体。
+        """
+        api_endpoint = getattr(self, api_url)
+        await self.__fill_client_version()
 
-        return await get_request_json(f"{api_endpoint}{api_path}", headers=self.headers)
+        return await _request_flight.do(
+            (self.puuid, "GET_BYTES", api_url, api_path),
+            lambda: get_request_bytes(f"{api_endpoint}{api_path}", headers=self.headers),
+        )
 
     async def put(self, endpoint: str = "/", url: str = "pd", data: [dict, list] = None) -> dict:
         """
@@ -124,8 +175,13 @@ class EndpointAPI:
             ResponseError: 如果 API 返回的响应结果为空，则抛出异常。
         """
         endpoint_url = getattr(self, url)
-        data = await put_request_json(url=f"{endpoint_url}{endpoint}", data=data, headers=self.headers)
-        return data
+        await self.__fill_client_version()
+        # PUT 请求体不同则结果不同，请求体也作为合并键的一部分
+        body = json.dumps(data, sort_keys=True)
+        return await _request_flight.do(
+            (self.puuid, "PUT", url, endpoint, body),
+            lambda: put_request_json(url=f"{endpoint_url}{endpoint}", data=data, headers=self.headers),
+        )
 
     async def fetch_contracts(self) -> Mapping[str, Any]:
         """
@@ -228,6 +284,15 @@ class EndpointAPI:
         """
         return await self.get(f"/store/v2/storefront/{self.puuid}", "pd")
 
+    async def fetch_storefront(self) -> Storefront:
+        """
+        获取玩家商店并直接解码为结构体，只解析每日皮肤部分。
+
+        Returns:
+            Storefront: 玩家商店。
+        """
+        return decode_storefront(await self.get_bytes(f"/store/v2/storefront/{self.puuid}", "pd"))
+
     async def get_player_wallet(self) -> Mapping[str, Any]:
         """
         获取玩家钱包中的 Valorant 点数和 Radiant 点数余额。
@@ -0,0 +1,187 @@
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import aiohttp
+from nonebot import get_driver
+from nonebot.log import logger
+
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.requestlib.ratelimit import rate_limiter, parse_retry_after
+from nonebot_plugin_valorant.utils.requestlib.resilience import IDEMPOTENT_METHODS, call_with_retry
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class HTTPClient:
+    """
+    进程级共享的 HTTP 客户端。
+
+    所有对 Riot 各分区(pd/glz/shared)、valorant-api.com 与媒体 CDN 的请求都经由此处发出，
+    连接器按 host 维护 keep-alive 连接池，避免每次请求重新建立 TCP/TLS 连接与 DNS 解析。
+
+    会话在驱动启动时创建、关闭时释放；在此之前的调用会惰性创建会话。
+    """
+
+    _session: aiohttp.ClientSession | None = None
+    _sync_clients: dict[str | None, "httpx.Client"] = {}
+
+    @classmethod
+    async def startup(cls) -> None:
+        """
+        创建共享会话。
+        """
+        cls.get_session()
+        logger.debug("HTTP 连接池已创建")
+
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """
+        获取共享的 aiohttp 会话，不存在或已关闭时重新创建。
+
+        Returns:
+            aiohttp.ClientSession: 共享会话。
+        """
+        if cls._session is None or cls._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=plugin_config.valorant_http_pool_limit,
+                limit_per_host=plugin_config.valorant_http_pool_limit_per_host,
+                keepalive_timeout=plugin_config.valorant_http_keepalive_timeout,
+                ttl_dns_cache=plugin_config.valorant_http_dns_cache_ttl,
+            )
+            cls._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=plugin_config.valorant_timeout),
+                # 共享会话不保存任何用户的 Cookie，认证流程自行管理 Cookie
+                cookie_jar=aiohttp.DummyCookieJar(),
+            )
+        return cls._session
+
+    @classmethod
+    def get_sync_client(cls, proxy: str | None = None) -> "httpx.Client":
+        """
+        获取共享的 httpx 同步客户端，按代理地址分别复用。httpx 在首次调用时才导入。
+
+        Args:
+            proxy: 代理地址。
+
+        Returns:
+            httpx.Client: 同步客户端。
+        """
+        import httpx
+
+        proxy = proxy or None
+        client = cls._sync_clients.get(proxy)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                proxies=proxy,
+                timeout=plugin_config.valorant_timeout,
+                limits=httpx.Limits(
+                    max_connections=plugin_config.valorant_http_pool_limit,
+                    max_keepalive_connections=plugin_config.valorant_http_pool_limit_per_host,
+                    keepalive_expiry=plugin_config.valorant_http_keepalive_timeout,
+                ),
+            )
+            cls._sync_clients[proxy] = client
+        return client
+
+    @classmethod
+    @asynccontextmanager
+    async def request(
+        cls,
+        method: str,
+        url: str,
+        proxy: str | None = plugin_config.valorant_proxies,
+        **kwargs,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        通过共享会话发送请求。
+
+        请求在发出前按 host 排队取得令牌；收到 429 时按 Retry-After 暂停该 host 并重新排队，
+        超过 valorant_rate_limit_max_retries 次后将 429 响应交给调用者处理。
+        连接错误、超时与 5xx 响应计入该 host 的熔断器，幂等请求会按退避时间重试。
+
+        Args:
+            method: 请求方法。
+            url: 请求地址。
+            proxy: 可选参数，代理配置项。
+            **kwargs: 传递给 aiohttp 的其他参数。
+
+        Yields:
+            aiohttp.ClientResponse: 响应对象，退出上下文后连接归还连接池。
+
+        Raises:
+            ServiceDegradedError: host 处于熔断状态。
+            aiohttp.ClientResponseError: 重试后仍返回 5xx。
+        """
+        session = cls.get_session()
+        host = urlparse(url).hostname or ""
+
+        async def send() -> aiohttp.ClientResponse:
+            await rate_limiter.acquire(host)
+            resp = await session.request(method, url, proxy=proxy or None, **kwargs)
+            if resp.status >= 500:
+                resp.release()
+                raise aiohttp.ClientResponseError(
+                    resp.request_info,
+                    resp.history,
+                    status=resp.status,
+                    message=resp.reason or "",
+                    headers=resp.headers,
+                )
+            return resp
+
+        attempt = 0
+        while True:
+            response = await call_with_retry(host, send, idempotent=method.upper() in IDEMPOTENT_METHODS)
+            if response.status != 429 or attempt >= plugin_config.valorant_rate_limit_max_retries:
+                break
+            rate_limiter.throttle(host, parse_retry_after(response.headers.get("Retry-After")))
+            response.release()
+            attempt += 1
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    @classmethod
+    def request_sync(
+        cls,
+        method: str,
+        url: str,
+        proxy: str | None = plugin_config.valorant_proxies,
+        **kwargs,
+    ) -> "httpx.Response":
+        """
+        通过共享的同步客户端发送请求。
+
+        Args:
+            method: 请求方法。
+            url: 请求地址。
+            proxy: 可选参数，代理配置项。
+            **kwargs: 传递给 httpx 的其他参数。
+
+        Returns:
+            httpx.Response: 响应对象。
+        """
+        return cls.get_sync_client(proxy).request(method, url, **kwargs)
+
+    @classmethod
+    async def close(cls) -> None:
+        """
+        关闭共享会话与同步客户端。
+        """
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+        for client in cls._sync_clients.values():
+            client.close()
+        cls._sync_clients.clear()
+
+
+driver = get_driver()
+driver.on_startup(HTTPClient.startup)
+driver.on_shutdown(HTTPClient.close)
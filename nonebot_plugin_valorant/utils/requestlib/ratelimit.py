@@ -0,0 +1,188 @@
+import time
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from nonebot.log import logger
+from pydantic import BaseModel
+
+from nonebot_plugin_valorant.config import plugin_config
+
+
+class BucketStats(BaseModel):
+    """
+    单个 host 的限流统计。
+
+    Attributes:
+        queue_depth (int): 当前排队等待令牌的请求数。
+        requests (int): 已放行的请求总数。
+        throttled (int): 收到 429 的次数。
+        total_wait (float): 累计等待秒数。
+        max_wait (float): 单次最长等待秒数。
+        avg_wait (float): 平均等待秒数。
+    """
+
+    queue_depth: int = 0
+    requests: int = 0
+    throttled: int = 0
+    total_wait: float = 0
+    max_wait: float = 0
+    avg_wait: float = 0
+
+
+class TokenBucket:
+    """
+    令牌桶限流器。
+
+    令牌以 `rate` 个/秒的速度补充，最多积累 `capacity` 个；取不到令牌的请求按先后顺序排队等待，
+    收到 429 后在 Retry-After 指定的时间内暂停发放令牌。
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens: float = capacity
+        self.updated = time.monotonic()
+        self.blocked_until: float = 0
+        self.stats = BucketStats()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """
+        取得一个令牌，必要时排队等待。
+
+        Returns:
+            float: 本次等待的秒数。
+        """
+        start = time.monotonic()
+        self.stats.queue_depth += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self.blocked_until:
+                        await asyncio.sleep(self.blocked_until - now)
+                        continue
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+        finally:
+            self.stats.queue_depth -= 1
+
+        waited = time.monotonic() - start
+        self.stats.requests += 1
+        self.stats.total_wait += waited
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+        self.stats.avg_wait = self.stats.total_wait / self.stats.requests
+        return waited
+
+    def block(self, seconds: float) -> None:
+        """
+        在指定时间内暂停发放令牌。
+
+        Args:
+            seconds: 暂停秒数。
+        """
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+        self.stats.throttled += 1
+
+
+class RateLimiter:
+    """
+    按 host 划分的限流调度器。
+
+    Riot 各分区的 host 由 EndpointAPI 注册；未注册的 host 不限流，但收到 429 后会自动注册并退避。
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def register(self, host: str) -> TokenBucket:
+        """
+        为 host 注册令牌桶，已注册时返回原有令牌桶。
+
+        Args:
+            host: 主机名。
+
+        Returns:
+            TokenBucket: 该 host 的令牌桶。
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+        return bucket
+
+    def get(self, host: str) -> TokenBucket | None:
+        return self._buckets.get(host)
+
+    async def acquire(self, host: str) -> None:
+        """
+        为发往 host 的请求取得令牌。
+
+        Args:
+            host: 主机名。
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            return
+        waited = await bucket.acquire()
+        if waited >= 1:
+            logger.debug(f"{host} 请求排队 {waited:.2f}s, 当前队列 {bucket.stats.queue_depth}")
+
+    def throttle(self, host: str, retry_after: float) -> None:
+        """
+        记录 host 返回的 429，在 retry_after 秒内暂停该 host 的请求。
+
+        Args:
+            host: 主机名。
+            retry_after: 暂停秒数。
+        """
+        self.register(host).block(retry_after)
+        logger.warning(f"{host} 触发限流, {retry_after:.1f}s 后重试")
+
+    def stats(self) -> dict[str, BucketStats]:
+        """
+        获取各 host 的限流统计。
+
+        Returns:
+            dict[str, BucketStats]: host 到统计信息的映射。
+        """
+        return {host: bucket.stats.copy() for host, bucket in self._buckets.items()}
+
+
+def parse_retry_after(value: str | None, default: float = 1) -> float:
+    """
+    解析 Retry-After 响应头。
+
+    Args:
+        value: 响应头的值，可以是秒数或 HTTP 日期。
+        default: 无法解析时的默认秒数。
+
+    Returns:
+        float: 需要等待的秒数，不超过 valorant_rate_limit_max_retry_after。
+    """
+    seconds = default
+    if value:
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                seconds = default
+    return min(max(seconds, 0), plugin_config.valorant_rate_limit_max_retry_after)
+
+
+rate_limiter = RateLimiter(
+    rate=plugin_config.valorant_rate_limit_per_second,
+    capacity=plugin_config.valorant_rate_limit_burst,
+)
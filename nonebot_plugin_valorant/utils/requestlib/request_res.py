@@ -1,11 +1,20 @@
+import asyncio
 from typing import Any
+from collections.abc import Callable, AsyncIterator
 
-import httpx
 import aiohttp
 from nonebot import logger
 
 from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.requestlib.http_client import HTTPClient
+from nonebot_plugin_valorant.utils.requestlib.streaming import iter_json_array
 from nonebot_plugin_valorant.utils.errors import RequestError, ResponseError, DataParseError
+from nonebot_plugin_valorant.utils.parsinglib.structs import (
+    decode_skins,
+    decode_tiers,
+    decode_bundles,
+    decode_skin_chromas,
+)
 
 # ------------------- #
 # credit https://github.com/colinhartigan/
@@ -82,20 +91,20 @@ def get_request_json_sync(
     Returns:
         dict: 如果成功获取到 JSON 数据，则返回字典类型的数据，否则返回 None。
     """
+    import httpx
+
     if headers is None:
         headers = {}
     url = f"{url}{sub_url}"
-    client = httpx.Client(proxies=proxy)
 
-    with client:
-        try:
-            response = client.get(url, headers=headers)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise ResponseError("errors.API.REQUEST_FAILED")
-        except httpx.RequestError as error:
-            raise ResponseError("API.REQUEST_FAILED") from error
+    try:
+        response = HTTPClient.request_sync("GET", url, proxy=proxy, headers=headers)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            raise ResponseError("errors.API.REQUEST_FAILED")
+    except httpx.RequestError as error:
+        raise ResponseError("API.REQUEST_FAILED") from error
 
 
 def put_request_json_sync(
@@ -118,23 +127,23 @@ def put_request_json_sync(
     Raises:
         ResponseError: 如果 API 返回的响应结果为空，则抛出异常。
     """
+    import httpx
+
     if data is None:
         data = {}
     if headers is None:
         headers = {}
     data = data if data is not None else {}
-    client = httpx.Client(proxies=proxy)
 
-    with client:
-        try:
-            response = client.put(url, headers=headers, json=data)
-            response = response.json()
-            if response is not None:
-                return response
-            else:
-                raise ResponseError("errors.API.REQUEST_FAILED")
-        except httpx.RequestError as error:
-            raise ResponseError("errors.API.REQUEST_FAILED") from error
+    try:
+        response = HTTPClient.request_sync("PUT", url, proxy=proxy, headers=headers, json=data)
+        response = response.json()
+        if response is not None:
+            return response
+        else:
+            raise ResponseError("errors.API.REQUEST_FAILED")
+    except httpx.RequestError as error:
+        raise ResponseError("errors.API.REQUEST_FAILED") from error
 
 
 def get_item_type(uuid: str) -> str | None:
@@ -175,10 +184,13 @@ async def url_to_image(url) -> bytes | None:
     Returns:
         获取到的图片的字节，如果发生错误则返回 None。
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
+    try:
+        async with HTTPClient.request("GET", url) as response:
             if response.status in range(200, 299):
                 return await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        logger.warning(f"获取图片失败 {url}: {error!r}")
+    return None
 
 
 async def get_request_json(
@@ -202,15 +214,16 @@ async def get_request_json(
         headers = {}
     url = f"{url}{sub_url}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, proxy=proxy, headers=headers) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                elif resp.status == 400:
-                    raise RequestError("errors.AUTH.COOKIES_EXPIRED")
-                else:
-                    return {}
-    except aiohttp.ClientError as error:
+        async with HTTPClient.request("GET", url, proxy=proxy, headers=headers) as resp:
+            if resp.status == 200:
+                return await resp.json()
+            elif resp.status == 400:
+                raise RequestError("errors.AUTH.COOKIES_EXPIRED")
+            elif resp.status == 429:
+                raise ResponseError("errors.AUTH.RATELIMIT")
+            else:
+                return {}
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
         raise ResponseError("errors.API.REQUEST_FAILED") from error
 
 
@@ -237,14 +250,84 @@ async def put_request_json(
     data = data if data is not None else {}
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, headers=headers, json=data, proxy=proxy) as response:
-                response = await response.json()
-                if response is not None:
-                    return response
-                else:
-                    raise ResponseError("errors.API.REQUEST_FAILED")
-    except aiohttp.ClientError as error:
+        async with HTTPClient.request("PUT", url, proxy=proxy, headers=headers, json=data) as response:
+            if response.status == 429:
+                raise ResponseError("errors.AUTH.RATELIMIT")
+            response = await response.json()
+            if response is not None:
+                return response
+            else:
+                raise ResponseError("errors.API.REQUEST_FAILED")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        raise ResponseError("errors.API.REQUEST_FAILED") from error
+
+
+async def get_request_bytes(
+    url: str,
+    headers: dict | None = None,
+    proxy: str = plugin_config.valorant_proxies,
+    sub_url: str = "",
+) -> bytes:
+    """使用 aiohttp 发送 GET 请求并返回未解码的响应体，供结构化解码使用。
+
+    Args:
+        url: 要获取数据的 URL。
+        headers: 请求的头部信息。
+        proxy: 可选参数，代理配置项。
+        sub_url: 要获取数据的子 URL。
+
+    Returns:
+        响应体字节。
+
+    Raises:
+        RequestError: 响应状态码为 400 时抛出。
+        ResponseError: 请求失败或响应状态码异常时抛出。
+    """
+    url = f"{url}{sub_url}"
+    try:
+        async with HTTPClient.request("GET", url, proxy=proxy, headers=headers or {}) as resp:
+            if resp.status == 200:
+                return await resp.read()
+            elif resp.status == 400:
+                raise RequestError("errors.AUTH.COOKIES_EXPIRED")
+            elif resp.status == 429:
+                raise ResponseError("errors.AUTH.RATELIMIT")
+            raise ResponseError("errors.API.REQUEST_FAILED")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+        raise ResponseError("errors.API.REQUEST_FAILED") from error
+
+
+async def stream_request_json_array(
+    url: str,
+    key: str = "data",
+    proxy: str = plugin_config.valorant_proxies,
+    sub_url: str = "",
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[Any]:
+    """使用 aiohttp 发送 GET 请求，并从响应体中逐个解析 JSON 数组的元素。
+
+    Args:
+        url: 要获取数据的 URL。
+        key: 数组所在的键名。
+        proxy: 可选参数，代理配置项。
+        sub_url: 要获取数据的子 URL。
+        chunk_size: 每次从响应体读取的字节数。
+
+    Yields:
+        数组中的每个元素。
+
+    Raises:
+        ResponseError: 请求失败时抛出。
+        DataParseError: 响应体无法解析时抛出。
+    """
+    url = f"{url}{sub_url}"
+    try:
+        async with HTTPClient.request("GET", url, proxy=proxy) as resp:
+            if resp.status != 200:
+                raise ResponseError("errors.API.REQUEST_FAILED")
+            async for item in iter_json_array(resp.content.iter_chunked(chunk_size), key=key):
+                yield item
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
         raise ResponseError("errors.API.REQUEST_FAILED") from error
 
 
@@ -279,10 +362,9 @@ async def get_skin() -> dict[str, Any]:
     Returns:
         武器皮肤数据
     """
-    resp = await get_request_json(url=base_url, sub_url="weapons/skins?language=all")
-    if resp:
-        skin = resp.get("data", [])
-        return {parse_skin(skin)["uuid"]: parse_skin(skin) for skin in skin}
+    raw = await get_request_bytes(url=base_url, sub_url="weapons/skins?language=all")
+    records = (skin.to_record() for skin in decode_skins(raw))
+    return {record["uuid"]: record for record in records}
 
 
 def parse_tier(tier: dict[str, Any]) -> dict[str, Any]:
@@ -312,16 +394,14 @@ async def get_tier() -> dict[str, Any] | None:
         皮肤等级数据
     """
     try:
-        resp = await get_request_json(url=base_url, sub_url="contenttiers/")
-        if resp:
-            tier = resp.get("data", [])
-            return {parse_tier(tier)["uuid"]: parse_tier(tier) for tier in tier}
+        raw = await get_request_bytes(url=base_url, sub_url="contenttiers/")
+        return {tier.uuid: tier.to_record() for tier in decode_tiers(raw)}
     except Exception as e:
         logger.warning(f"获取皮肤等级信息时发生错误：{e}")
     return None
 
 
-async def parse_mission(mission: dict[str, Any]) -> dict[str, Any]:
+def parse_mission(mission: dict[str, Any]) -> dict[str, Any]:
     """解析任务数据
 
     Args:
@@ -356,7 +436,7 @@ async def get_mission() -> dict | None:
         if resp:
             missions = {}
             for mission in resp["data"]:
-                mission_info = await parse_mission(mission)
+                mission_info = parse_mission(mission)
                 missions[mission_info["uuid"]] = mission_info
             return missions
     except Exception as e:
@@ -395,7 +475,7 @@ async def get_playercards() -> dict | None:
         玩家旗帜数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("playercards?language=all")
+        resp = await get_request_json(url=base_url, sub_url="playercards?language=all")
         if resp:
             return {card["uuid"]: parse_playercard(card) for card in resp["data"]}
     except Exception as e:
@@ -430,7 +510,7 @@ async def get_player_titles() -> dict | None:
         玩家称号数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("playertitles?language=all")
+        resp = await get_request_json(url=base_url, sub_url="playertitles?language=all")
         if resp:
             return {title["uuid"]: parse_title(title) for title in resp["data"]}
     except Exception as e:
@@ -465,7 +545,7 @@ async def get_spray() -> dict | None:
         喷漆数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("sprays?language=all")
+        resp = await get_request_json(url=base_url, sub_url="sprays?language=all")
         if resp:
             return {spray["uuid"]: parse_spray(spray) for spray in resp["data"]}
     except Exception as e:
@@ -541,13 +621,8 @@ async def get_bundle() -> dict | None:
         套装数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("bundles?language=all")
-        if resp:
-            bundles = {}
-            for bundle in resp["data"]:
-                bundle_info = parse_bundle(bundle)
-                bundles[bundle_info["uuid"]] = bundle_info
-            return bundles
+        raw = await get_request_bytes(url=base_url, sub_url="bundles?language=all")
+        return {bundle.uuid: bundle.to_record() for bundle in decode_bundles(raw)}
     except Exception as e:
         logger.warning(f"获取套装信息时发生错误：{e}")
     return None
@@ -595,7 +670,7 @@ async def get_contract() -> dict | None:
         合同数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("contracts?language=all")
+        resp = await get_request_json(url=base_url, sub_url="contracts?language=all")
         if resp:
             contracts = {}
             for contract in resp["data"]:
@@ -635,10 +710,10 @@ async def get_rank_tiers() -> dict[str, Any] | None:
         段位数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("competitivetiers?language=all")
+        resp = await get_request_json(url=base_url, sub_url="competitivetiers?language=all")
         if resp:
             data = {}
-            for rank in data["data"]:
+            for rank in resp["data"]:
                 for i in rank["tiers"]:
                     data[i["tier"]] = parse_rank_tier(i)
             return data
@@ -670,7 +745,7 @@ async def get_currencies() -> dict | None:
         货币数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("currencies?language=all")
+        resp = await get_request_json(url=base_url, sub_url="currencies?language=all")
         if resp:
             return {currency["uuid"]: parse_currency(currency) for currency in resp["data"]}
     except Exception as e:
@@ -705,7 +780,7 @@ async def get_buddies() -> dict | None:
         buddy数据，如果发生错误则返回None。
     """
     try:
-        response = await get_request_json("buddies?language=all")
+        response = await get_request_json(url=base_url, sub_url="buddies?language=all")
         if response:
             return {parse_buddy(buddy)["uuid"]: parse_buddy(buddy) for buddy in response["data"]}
     except ResponseError as error:
@@ -743,13 +818,40 @@ async def get_skin_chromas() -> dict[str, dict[str, Any]] | None:
         所有皮肤染色数据，如果发生错误则返回 None。
     """
     try:
-        resp = await get_request_json("weapons/skinchromas?language=all")
-        if resp:
-            chromas = {}
-            for chroma in resp["data"]:
-                chroma_info = parse_skin_chroma(chroma)
-                chromas[chroma_info["uuid"]] = chroma_info
-            return chromas
+        raw = await get_request_bytes(url=base_url, sub_url="weapons/skinchromas?language=all")
+        return {chroma.uuid: chroma.to_record() for chroma in decode_skin_chromas(raw)}
     except Exception as e:
         logger.warning(f"获取皮肤染色信息时发生错误：{e}")
     return None
+
+
+# 以 `data` 数组形式返回的目录资源: 名称 -> (子 URL, 解析函数)
+catalog_sources: dict[str, tuple[str, Callable[[dict[str, Any]], dict[str, Any] | None]]] = {
+    "skin": ("weapons/skins?language=all", parse_skin),
+    "tier": ("contenttiers/", parse_tier),
+    "mission": ("missions?language=all", parse_mission),
+    "playercard": ("playercards?language=all", parse_playercard),
+    "title": ("playertitles?language=all", parse_title),
+    "spray": ("sprays?language=all", parse_spray),
+    "bundle": ("bundles?language=all", parse_bundle),
+    "contract": ("contracts?language=all", parse_contract),
+    "currency": ("currencies?language=all", parse_currency),
+    "buddy": ("buddies?language=all", parse_buddy),
+    "skin_chroma": ("weapons/skinchromas?language=all", parse_skin_chroma),
+}
+
+
+async def stream_catalog(name: str) -> AsyncIterator[dict[str, Any]]:
+    """逐条获取并解析目录资源，不把完整的目录读入内存。
+
+    Args:
+        name: `catalog_sources` 中的资源名称。
+
+    Yields:
+        解析后的单条资源数据，被解析函数忽略的条目不会产出。
+    """
+    sub_url, parser = catalog_sources[name]
+    async for item in stream_request_json_array(url=base_url, sub_url=sub_url):
+        record = parser(item)
+        if record is not None:
+            yield record
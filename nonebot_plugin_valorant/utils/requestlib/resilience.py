@@ -0,0 +1,188 @@
+import time
+import random
+import asyncio
+from typing import TypeVar
+from collections.abc import Callable, Awaitable
+
+import aiohttp
+from nonebot.log import logger
+
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.errors import ServiceDegradedError
+
+T = TypeVar("T")
+
+# 只有幂等请求会在失败后重试
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# 视为上游故障的异常
+TRANSIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    单个 host 的熔断器。
+
+    连续失败达到 `failure_threshold` 次后熔断(open)，熔断期间请求立即失败；
+    经过 `recovery_timeout` 秒后进入半开(half_open)状态，只放行一个探测请求，
+    探测成功则恢复(closed)，失败则重新熔断。
+    """
+
+    def __init__(self, host: str, failure_threshold: int, recovery_timeout: float) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at: float = 0
+        self._state = CLOSED
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """当前状态，熔断超时后视为半开。"""
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def before_request(self) -> None:
+        """
+        请求前检查熔断状态。
+
+        Raises:
+            ServiceDegradedError: 熔断中或已有探测请求在进行时抛出。
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self._probing:
+            self._state = HALF_OPEN
+            self._probing = True
+            logger.info(f"{self.host} 熔断半开, 发送探测请求")
+            return
+        raise ServiceDegradedError("errors.API.SERVICE_DEGRADED")
+
+    def record_success(self) -> None:
+        if self._state != CLOSED:
+            logger.info(f"{self.host} 已恢复")
+        self._state = CLOSED
+        self._probing = False
+        self.failures = 0
+
+    def abort(self) -> None:
+        """请求因非上游原因中断(如被取消)时释放探测名额。"""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self._state != OPEN:
+                logger.warning(f"{self.host} 连续失败 {self.failures} 次, 熔断 {self.recovery_timeout}s")
+            self._state = OPEN
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """
+    获取 host 的熔断器，不存在时创建。
+
+    Args:
+        host: 主机名。
+
+    Returns:
+        CircuitBreaker: 熔断器。
+    """
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(
+            host,
+            failure_threshold=plugin_config.valorant_breaker_failure_threshold,
+            recovery_timeout=plugin_config.valorant_breaker_recovery_timeout,
+        )
+    return breaker
+
+
+def breaker_states() -> dict[str, str]:
+    """
+    获取所有 host 的熔断状态。
+
+    Returns:
+        dict[str, str]: host 到状态(closed/open/half_open)的映射。
+    """
+    return {host: breaker.state for host, breaker in _breakers.items()}
+
+
+def is_degraded(host: str) -> bool:
+    """
+    判断 host 当前是否处于熔断状态。
+
+    Args:
+        host: 主机名。
+
+    Returns:
+        bool: 熔断中返回 True。
+    """
+    breaker = _breakers.get(host)
+    return breaker is not None and breaker.state == OPEN
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    计算带随机抖动的指数退避时间。
+
+    Args:
+        attempt: 已重试次数，从 0 开始。
+
+    Returns:
+        float: 等待秒数。
+    """
+    ceiling = min(
+        plugin_config.valorant_retry_backoff_max,
+        plugin_config.valorant_retry_backoff_base * 2**attempt,
+    )
+    return random.uniform(0, ceiling)  # nosec B311
+
+
+async def call_with_retry(host: str, func: Callable[[], Awaitable[T]], idempotent: bool = True) -> T:
+    """
+    在熔断器保护下调用 func，幂等调用失败时按退避时间重试。
+
+    Args:
+        host: 请求的主机名，用于选择熔断器。
+        func: 发起请求的函数，上游故障时应抛出 aiohttp.ClientError 或 asyncio.TimeoutError。
+        idempotent: 调用是否幂等，非幂等调用失败后不重试。
+
+    Returns:
+        func 的返回值。
+
+    Raises:
+        ServiceDegradedError: host 处于熔断状态。
+    """
+    breaker = get_breaker(host)
+    retries = plugin_config.valorant_retry_attempts if idempotent else 0
+    attempt = 0
+    while True:
+        breaker.before_request()
+        try:
+            result = await func()
+        except TRANSIENT_ERRORS as error:
+            breaker.record_failure()
+            if attempt >= retries:
+                raise
+            delay = backoff_delay(attempt)
+            logger.debug(f"{host} 请求失败({error!r}), {delay:.2f}s 后第 {attempt + 1} 次重试")
+            await asyncio.sleep(delay)
+            attempt += 1
+        except BaseException:
+            breaker.abort()
+            raise
+        else:
+            breaker.record_success()
+            return result
@@ -0,0 +1,50 @@
+import asyncio
+from typing import TypeVar
+from collections.abc import Callable, Hashable, Awaitable
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    合并相同键的并发调用。
+
+    同一时刻相同键只会执行一次 `func`，其余调用者等待该次执行并得到相同的结果或异常。
+    执行结束后键即被释放，之后的调用会重新执行。
+
+    注意:
+        所有调用者拿到的是同一个结果对象，调用者不应修改它。
+
+    Example:
+        flight = SingleFlight()
+        data = await flight.do(("puuid", "/store"), lambda: fetch())
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        执行或等待相同键的调用。
+
+        Args:
+            key: 合并调用的键。
+            func: 没有进行中的调用时用于发起调用的函数。
+
+        Returns:
+            调用结果。
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # shield 保证单个调用者被取消时不会取消其他调用者共享的请求
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
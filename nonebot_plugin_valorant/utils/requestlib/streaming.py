@@ -0,0 +1,81 @@
+import re
+import json
+import codecs
+from typing import Any
+from collections.abc import AsyncIterator
+
+from nonebot_plugin_valorant.utils.errors import DataParseError
+
+_WHITESPACE_OR_COMMA = re.compile(r"[\s,]*")
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes],
+    key: str = "data",
+) -> AsyncIterator[Any]:
+    """
+    从响应体分块中逐个解析 JSON 数组的元素。
+
+    解析器只保留当前未解析完的文本，内存占用约为一个分块加一个元素，
+    不会把整个文档读入内存。适用于 valorant-api.com 形如 {"status": 200, "data": [...]} 的响应，
+    要求 `key` 在文档中首次出现的位置即为目标数组。
+
+    Args:
+        chunks: 响应体的字节分块。
+        key: 数组所在的键名。
+
+    Yields:
+        数组中的每个元素。
+
+    Raises:
+        DataParseError: 找不到目标数组或文档不完整时抛出。
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+    buffer = ""
+    # buffer 中已解析到的位置，读取下一个分块时才丢弃之前的文本
+    pos = 0
+    # 元素尚不完整时，未解析的文本增长到该长度前不再尝试解析
+    retry_length = 0
+    in_array = False
+    eof = False
+    iterator = chunks.__aiter__()
+
+    while True:
+        if not in_array:
+            match = start.search(buffer)
+            if match is not None:
+                pos = match.end()
+                in_array = True
+                continue
+            # 保留末尾一段，防止键名被分块截断
+            pos = max(len(buffer) - len(key) - 64, 0)
+        else:
+            pos = _WHITESPACE_OR_COMMA.match(buffer, pos).end()
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            if pos < len(buffer) and (len(buffer) - pos >= retry_length or eof):
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    item, end = None, -1
+                # 元素之后必然还有 "," 或 "]"，解析到缓冲区末尾说明元素可能尚未完整
+                if end != -1 and (end < len(buffer) or eof):
+                    yield item
+                    pos = end
+                    retry_length = 0
+                    continue
+                # 元素跨越多个分块时，等未解析的文本增长一倍再重试，每个元素的解析量与其长度成线性
+                retry_length = 2 * (len(buffer) - pos)
+
+        if eof:
+            raise DataParseError("errors.DATA.PARSING_ERROR")
+        try:
+            chunk = await iterator.__anext__()
+        except StopAsyncIteration:
+            eof = True
+            buffer = buffer[pos:] + text.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
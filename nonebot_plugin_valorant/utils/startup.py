@@ -0,0 +1,135 @@
+"""
+分阶段启动。
+
+关键阶段(数据库连接、密钥、皮肤索引)在 driver 的启动钩子中依次执行，完成后机器人即可处理消息；
+延后阶段(目录刷新、图标同步、代理检测、渲染预热)在后台执行，失败时按指数退避重试。
+依赖未完成阶段的命令应回复 `errors.STARTUP.WARMING_UP`，阶段重试次数用尽后回复 `errors.STARTUP.FAILED`。
+每个阶段的耗时都会记录在日志中。
+"""
+
+import time
+import asyncio
+from typing import TypeVar
+from collections.abc import Callable, Awaitable
+
+from nonebot import get_driver
+from nonebot.log import logger
+
+T = TypeVar("T")
+
+# 延后阶段的最大尝试次数与重试间隔(秒)，间隔每次翻倍
+RETRY_ATTEMPTS = 5
+RETRY_DELAY = 30
+RETRY_DELAY_MAX = 600
+
+
+class Startup:
+    """
+    启动阶段的状态。
+
+    阶段名称:
+        database: 数据库连接与建表。
+        key: 数据库密钥。
+        index: 从数据库加载皮肤索引。
+        catalog: 皮肤目录可用。数据库中已有目录时随 index 一同就绪，否则在首次刷新完成后就绪。
+        assets: 皮肤图标同步。
+        proxy: 代理检测。
+        render: 渲染进程池或浏览器页面预热。
+    """
+
+    def __init__(self) -> None:
+        self.ready: set[str] = set()
+        self.failed: set[str] = set()
+        self.retrying: set[str] = set()
+        self.timings: dict[str, float] = {}
+        self._started_at = time.perf_counter()
+        self._tasks: set[asyncio.Task] = set()
+
+    def is_ready(self, *phases: str) -> bool:
+        """给定的阶段是否均已完成。"""
+        return all(phase in self.ready for phase in phases)
+
+    def has_failed(self, phase: str) -> bool:
+        """阶段最近一次执行失败且不再重试。"""
+        return phase in self.failed and phase not in self.retrying
+
+    def mark_ready(self, phase: str) -> None:
+        """将阶段标记为完成，用于无需等待即可使用的阶段。"""
+        self.ready.add(phase)
+
+    @property
+    def elapsed(self) -> float:
+        """自进程启动以来的秒数。"""
+        return time.perf_counter() - self._started_at
+
+    async def run(self, phase: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        执行一个阶段并记录耗时，成功后将阶段标记为完成。
+
+        Args:
+            phase: 阶段名称。
+            func: 阶段函数。
+
+        Returns:
+            阶段函数的返回值。
+
+        Raises:
+            阶段函数抛出的异常，失败的阶段记入 `failed`，再次执行成功后移除。
+        """
+        start = time.perf_counter()
+        try:
+            result = await func()
+        except Exception as e:
+            self.failed.add(phase)
+            logger.error(f"启动阶段 {phase} 失败, 耗时 {time.perf_counter() - start:.2f}s: {e!r}")
+            raise
+        self.timings[phase] = time.perf_counter() - start
+        self.failed.discard(phase)
+        self.ready.add(phase)
+        logger.info(f"启动阶段 {phase} 完成, 耗时 {self.timings[phase]:.2f}s")
+        return result
+
+    def background(self, phase: str, func: Callable[[], Awaitable[None]], attempts: int = RETRY_ATTEMPTS) -> None:
+        """
+        在后台执行延后阶段，不阻塞启动钩子。
+
+        阶段失败时等待 RETRY_DELAY 秒(每次翻倍，不超过 RETRY_DELAY_MAX)后重试，最多执行 attempts 次；
+        重试期间阶段仍视为未完成，次数用尽后 `has_failed` 为真。
+
+        Args:
+            phase: 阶段名称。
+            func: 阶段函数。
+            attempts: 最大执行次数。
+        """
+
+        async def retrying() -> None:
+            self.retrying.add(phase)
+            try:
+                for attempt in range(attempts):
+                    try:
+                        await self.run(phase, func)
+                        return
+                    except Exception:
+                        if attempt + 1 == attempts:
+                            logger.error(f"启动阶段 {phase} 已失败 {attempts} 次, 不再重试")
+                            return
+                    delay = min(RETRY_DELAY * 2**attempt, RETRY_DELAY_MAX)
+                    logger.info(f"启动阶段 {phase} 将在 {delay}s 后重试")
+                    await asyncio.sleep(delay)
+            finally:
+                self.retrying.discard(phase)
+
+        task = asyncio.create_task(retrying())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """取消未完成的延后阶段。"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+startup = Startup()
+
+get_driver().on_shutdown(startup.close)
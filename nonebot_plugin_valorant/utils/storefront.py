@@ -0,0 +1,246 @@
+import time
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+
+import msgspec
+from nonebot.log import logger
+
+from nonebot_plugin_valorant.database.db import DB
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.database.models import User
+from nonebot_plugin_valorant.database.index import catalog_index
+from nonebot_plugin_valorant.utils.requestlib.endpoint import resolve_shard
+from nonebot_plugin_valorant.utils.requestlib.player_info import PlayerInformation
+from nonebot_plugin_valorant.utils.parsinglib.endpoint_parsing import Skin, SkinsPanel
+from nonebot_plugin_valorant.utils.render.storefront_skinpanel import (
+    fetch_skin_panel,
+    render_skin_panel,
+    player_information,
+)
+
+
+class SnapshotOffer(msgspec.Struct, frozen=True):
+    uuid: str | None
+    cost: int | None = None
+    currency: str | None = None
+
+
+class StoreSnapshot(msgspec.Struct, frozen=True):
+    """
+    玩家每日商店的快照。
+
+    Attributes:
+        puuid: 玩家的 Riot PUUID。
+        offers: 四个皮肤报价，商店不足四个报价时空缺的 uuid 为 None。
+        expiry: 商店刷新的 UTC 时间(不含时区信息，与数据库一致)。
+    """
+
+    puuid: str
+    offers: tuple[SnapshotOffer, ...]
+    expiry: datetime
+
+    @property
+    def remaining(self) -> int:
+        """距离商店刷新的秒数。"""
+        return max(0, int((self.expiry - _utcnow()).total_seconds()))
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining == 0
+
+
+# puuid -> 快照，过期的快照在下次访问时丢弃
+_snapshots: dict[str, StoreSnapshot] = {}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def get_snapshot(puuid: str) -> StoreSnapshot | None:
+    """
+    获取未过期的商店快照，内存中没有时从数据库读取。
+
+    Args:
+        puuid: 玩家的 Riot PUUID。
+
+    Returns:
+        StoreSnapshot | None: 快照，不存在或已过期时为 None。
+    """
+    snapshot = _snapshots.get(puuid)
+    if snapshot is None:
+        row = await DB.get_player_skins_store(puuid)
+        # 用户注册时触发器会插入只有 puuid 的空记录
+        if row is None or row.expiry is None or row.offer_1 is None:
+            return None
+        snapshot = StoreSnapshot(
+            puuid=puuid,
+            offers=tuple(
+                SnapshotOffer(uuid=getattr(row, f"offer_{i}"), cost=getattr(row, f"cost_{i}"), currency=row.currency)
+                for i in range(1, 5)
+            ),
+            expiry=row.expiry,
+        )
+        _snapshots[puuid] = snapshot
+    if snapshot.expired:
+        _snapshots.pop(puuid, None)
+        return None
+    return snapshot
+
+
+async def save_snapshot(puuid: str, panel: SkinsPanel) -> StoreSnapshot:
+    """
+    保存商店快照到内存和数据库，过期时间为当前时间加商店剩余时间。
+
+    Args:
+        puuid: 玩家的 Riot PUUID。
+        panel: 从 Riot 获取的每日商店。
+
+    Returns:
+        StoreSnapshot: 保存的快照。
+    """
+    now = _utcnow()
+    skins = [panel.skin1, panel.skin2, panel.skin3, panel.skin4]
+    snapshot = StoreSnapshot(
+        puuid=puuid,
+        offers=tuple(
+            SnapshotOffer(uuid=None) if skin is None else SnapshotOffer(skin.uuid, skin.cost, skin.currency)
+            for skin in skins
+        ),
+        expiry=now + timedelta(seconds=panel.duration),
+    )
+    row = {"puuid": puuid, "duration": panel.duration, "expiry": snapshot.expiry, "timestamp": now}
+    for i, offer in enumerate(snapshot.offers, start=1):
+        row[f"offer_{i}"] = offer.uuid
+        row[f"cost_{i}"] = offer.cost
+    row["currency"] = next((offer.currency for offer in snapshot.offers if offer.currency is not None), None)
+    await DB.cache_player_skins_store(**row)
+    _snapshots[puuid] = snapshot
+    return snapshot
+
+
+async def snapshot_panel(snapshot: StoreSnapshot) -> SkinsPanel:
+    """
+    由快照构建每日商店，皮肤信息取自内存索引。
+
+    Args:
+        snapshot: 商店快照。
+
+    Returns:
+        SkinsPanel: 每日商店，duration 为剩余秒数。
+    """
+    skins = await catalog_index.get_skins([offer.uuid for offer in snapshot.offers if offer.uuid is not None])
+    panel = SkinsPanel(duration=snapshot.remaining)
+    for index, offer in enumerate(snapshot.offers, start=1):
+        if offer.uuid is None:
+            continue
+        entry = skins.get(offer.uuid)
+        skin = Skin(
+            uuid=offer.uuid,
+            name=entry.name if entry else None,
+            icon=entry.icon if entry else None,
+            tier=entry.tier if entry else None,
+            cost=offer.cost,
+            currency=offer.currency,
+        )
+        setattr(panel, f"skin{index}", skin)
+    return panel
+
+
+async def refresh_snapshot(user: User) -> SkinsPanel:
+    """
+    从 Riot 获取每日商店并保存快照。
+
+    Args:
+        user: 用户信息。
+
+    Returns:
+        SkinsPanel: 每日商店。
+    """
+    panel = await fetch_skin_panel(user)
+    await save_snapshot(user.puuid, panel)
+    return panel
+
+
+async def get_store(qq_uid: str) -> tuple[SkinsPanel, PlayerInformation] | tuple[None, None]:
+    """
+    获取用户的每日商店。
+
+    快照未过期时直接由快照返回，不刷新令牌也不请求 Riot；否则从 Riot 获取并更新快照。
+
+    Args:
+        qq_uid: 用户的 QQ UID。
+
+    Returns:
+        每日商店与玩家信息，用户未登录时为 (None, None)。
+    """
+    user = await DB.get_user(qq_uid)
+    if user is None:
+        return None, None
+    snapshot = await get_snapshot(user.puuid)
+    if snapshot is not None:
+        logger.debug(f"{user.puuid} 的商店快照命中, 剩余 {snapshot.remaining}s")
+        return await snapshot_panel(snapshot), player_information(user)
+    return await refresh_snapshot(user), player_information(user)
+
+
+async def prefetch_stores(
+    concurrency: int = plugin_config.valorant_prefetch_concurrency,
+    shard_concurrency: int = plugin_config.valorant_prefetch_shard_concurrency,
+) -> dict[str, int]:
+    """
+    为所有已登录用户预取每日商店并保存快照。
+
+    用户按页从数据库读取，同时进行的请求不超过 concurrency 个，同一 Riot 分区不超过 shard_concurrency 个；
+    每个分区的请求频率另由 rate_limiter 按 host 限制。已有未过期快照的用户会被跳过，单个用户失败不影响其他用户。
+    开启 valorant_prefetch_render 时同时渲染商店图片写入渲染缓存，渲染失败单独计入 render_failed，不影响获取结果。
+
+    Args:
+        concurrency: 总并发上限。
+        shard_concurrency: 单个分区的并发上限，共用分区的地区(如 latam 与 br)合并计算。
+
+    Returns:
+        dict[str, int]: fetched、skipped、failed、render_failed 各自的用户数，前三项之和为用户总数。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    shards: dict[str, asyncio.Semaphore] = {}
+    stats: Counter[str] = Counter()
+    start = time.perf_counter()
+
+    async def prefetch_one(user: User) -> None:
+        try:
+            await fetch_one(user)
+        finally:
+            semaphore.release()
+
+    async def fetch_one(user: User) -> None:
+        try:
+            if await get_snapshot(user.puuid) is not None:
+                stats["skipped"] += 1
+                return
+            shard = shards.setdefault(resolve_shard(user.region), asyncio.Semaphore(shard_concurrency))
+            async with shard:
+                panel = await refresh_snapshot(user)
+        except Exception as e:
+            stats["failed"] += 1
+            logger.warning(f"{user.puuid} 的商店预取失败: {e!r}")
+            return
+        stats["fetched"] += 1
+        if plugin_config.valorant_prefetch_render:
+            try:
+                await render_skin_panel(panel)
+            except Exception as e:
+                stats["render_failed"] += 1
+                logger.warning(f"{user.puuid} 的商店图片预渲染失败: {e!r}")
+
+    async with asyncio.TaskGroup() as group:
+        async for user in DB.iter_users():
+            await semaphore.acquire()
+            group.create_task(prefetch_one(user))
+
+    logger.info(
+        f"商店预取完成: 获取 {stats['fetched']}, 跳过 {stats['skipped']}, 失败 {stats['failed']}, "
+        f"渲染失败 {stats['render_failed']}, 耗时 {time.perf_counter() - start:.2f}s"
+    )
+    return {name: stats[name] for name in ("fetched", "skipped", "failed", "render_failed")}
@@ -0,0 +1,88 @@
+"""
+生成皮肤目录的离线快照(见 nonebot_plugin_valorant/database/snapshot.py)。
+
+- db: 从当前数据库读取皮肤、皮肤等级与版本信息，数据库连接取自 .env 或 --database
+- api: 从 valorant-api.com 下载最新的目录
+
+输出文件已是同一资源清单值时不重新生成，除非指定 --force。
+将生成的文件放到 valorant_catalog_snapshot_path，新节点启动时无需下载目录。
+
+用法:
+    python scripts/build_catalog_snapshot.py [--source db|api] [--output PATH] [--database URL] [--force]
+"""
+
+import os
+import asyncio
+import argparse
+from pathlib import Path
+
+import nonebot
+
+
+async def from_db() -> tuple[dict, list[dict], list[dict]]:
+    from nonebot_plugin_valorant.database.db import DB
+    from nonebot_plugin_valorant.database.models import Version
+
+    try:
+        version = await DB.get_version()
+        skin_rows = await DB.get_skin_index_rows()
+        tier_rows = await DB.get_all_tiers()
+    finally:
+        await DB.close()
+    if version is None:
+        raise SystemExit("数据库中没有目录数据")
+    skins = [{"uuid": uuid, "names": names, "icon": icon, "tier": tier} for uuid, names, icon, tier in skin_rows]
+    tiers = [{"uuid": uuid, "name": name, "icon": icon} for uuid, name, icon in tier_rows]
+    columns = [column.name for column in Version.__table__.columns if column.name != "initial"]
+    return {name: getattr(version, name) for name in columns}, skins, tiers
+
+
+async def from_api() -> tuple[dict, list[dict], list[dict]]:
+    from nonebot_plugin_valorant.utils.requestlib.client import get_version
+    from nonebot_plugin_valorant.utils.requestlib.http_client import HTTPClient
+    from nonebot_plugin_valorant.utils.requestlib.request_res import get_skin, get_tier
+
+    try:
+        version, skins, tiers = await asyncio.gather(get_version(), get_skin(), get_tier())
+    finally:
+        await HTTPClient.close()
+    if not tiers:
+        raise SystemExit("获取皮肤等级失败")
+    return version, list(skins.values()), list(tiers.values())
+
+
+async def build(args: argparse.Namespace) -> None:
+    from nonebot_plugin_valorant.config import plugin_config
+    from nonebot_plugin_valorant.database.snapshot import open_snapshot, write_snapshot
+
+    output = args.output or plugin_config.valorant_catalog_snapshot_path
+    version, skins, tiers = await (from_db() if args.source == "db" else from_api())
+
+    current = open_snapshot(output)
+    if current is not None:
+        unchanged = current.manifest_id == version["manifestId"]
+        current.close()
+        if unchanged and not args.force:
+            print(f"{output} 已是资源清单值 {version['manifestId']} 的快照")
+            return
+
+    size = write_snapshot(output, version, skins, tiers)
+    print(f"{output}: {len(skins)} 个皮肤, {len(tiers)} 个等级, 资源清单值 {version['manifestId']}, {size} 字节")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=("db", "api"), default="db")
+    parser.add_argument("--output", type=Path, help="默认为 valorant_catalog_snapshot_path")
+    parser.add_argument("--database", help="数据库连接，默认读取 .env 中的 valorant_database")
+    parser.add_argument("--force", action="store_true", help="资源清单值未变化时也重新生成")
+    args = parser.parse_args()
+
+    # 插件配置在导入时读取，须先初始化 NoneBot
+    os.environ.setdefault("VALORANT_TIMEOUT", "30")
+    nonebot.init(**({"valorant_database": args.database} if args.database else {}))
+    asyncio.run(build(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from nonebot_plugin_valorant.utils import cache
+from nonebot_plugin_valorant.utils.errors import ResponseError
+
+
+@pytest.fixture
+def written(monkeypatch):
+    written: dict[str, dict] = {}
+
+    def writer(name):
+        async def write(data):
+            written.setdefault(name, {}).update(data)
+
+        return write
+
+    monkeypatch.setattr(cache, "catalog_writer", writer)
+    return written
+
+
+def _fetcher(result):
+    async def fetch():
+        return result
+
+    return fetch
+
+
+def test_failed_fetch_is_reported(monkeypatch, written):
+    # 获取函数出错时返回 None
+    monkeypatch.setitem(cache.catalog_fetchers, "tier", _fetcher(None))
+    name, result = asyncio.run(cache._refresh_one("tier", asyncio.Semaphore(1)))
+    assert name == "tier"
+    assert "error" in result
+    assert written == {}
+
+
+def test_fetched_records_are_written(monkeypatch, written):
+    tiers = {"a": {"uuid": "a", "name": "Select", "icon": None}}
+    monkeypatch.setitem(cache.catalog_fetchers, "tier", _fetcher(tiers))
+    _, result = asyncio.run(cache._refresh_one("tier", asyncio.Semaphore(1)))
+    assert result["count"] == 1
+    assert "error" not in result
+    assert written == {"tier": tiers}
+
+
+def test_required_catalog_failure_keeps_manifest(monkeypatch, written):
+    for name in cache.catalog_fetchers:
+        monkeypatch.setitem(cache.catalog_fetchers, name, _fetcher({}))
+    monkeypatch.setitem(cache.catalog_fetchers, "tier", _fetcher(None))
+    monkeypatch.setattr(cache.plugin_config, "valorant_catalog_streaming", False)
+
+    async def no_baseline():
+        return None
+
+    monkeypatch.setattr(cache, "_delta_baseline", no_baseline)
+    with pytest.raises(ResponseError):
+        asyncio.run(cache.cache_store())
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.requestlib import ratelimit
+from nonebot_plugin_valorant.utils.requestlib.http_client import HTTPClient
+from nonebot_plugin_valorant.utils.requestlib.ratelimit import TokenBucket, rate_limiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_allows_burst_then_paces(clock):
+    async def main():
+        bucket = TokenBucket(rate=4, capacity=2)
+        return [await bucket.acquire() for _ in range(5)]
+
+    waits = asyncio.run(main())
+    assert waits[:2] == [0, 0]
+    assert waits[2:] == pytest.approx([0.25, 0.25, 0.25])
+    assert clock.now == pytest.approx(1000.75)
+
+
+def test_bucket_refills_up_to_capacity(clock):
+    async def main():
+        bucket = TokenBucket(rate=4, capacity=2)
+        await bucket.acquire()
+        await bucket.acquire()
+        clock.now += 10
+        return [await bucket.acquire() for _ in range(3)]
+
+    assert asyncio.run(main()) == pytest.approx([0, 0, 0.25])
+
+
+def test_block_pauses_until_retry_after(clock):
+    async def main():
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.block(3)
+        waited = await bucket.acquire()
+        return bucket, waited
+
+    bucket, waited = asyncio.run(main())
+    assert waited >= 3
+    assert bucket.stats.throttled == 1
+    assert bucket.stats.requests == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None, default=1) == 1
+    assert parse_retry_after("garbage", default=3) == 3
+    assert parse_retry_after("-5") == 0
+    assert parse_retry_after("86400") == plugin_config.valorant_rate_limit_max_retry_after
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+class StubServer:
+    """返回若干次 429 后返回 200 的测试服务。"""
+
+    def __init__(self, limited: int, retry_after: str = "0.05") -> None:
+        self.limited = limited
+        self.retry_after = retry_after
+        self.hits = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        if self.hits <= self.limited:
+            return web.Response(status=429, headers={"Retry-After": self.retry_after})
+        return web.json_response({"ok": True})
+
+
+async def _request(server: StubServer) -> tuple[int, float]:
+    app = web.Application()
+    app.router.add_get("/", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    loop = asyncio.get_running_loop()
+    try:
+        start = loop.time()
+        async with HTTPClient.request("GET", f"http://127.0.0.1:{port}/", proxy=None) as response:
+            await response.read()
+            return response.status, loop.time() - start
+    finally:
+        await HTTPClient.close()
+        await runner.cleanup()
+
+
+@pytest.fixture
+def limiter():
+    rate_limiter._buckets.clear()
+    yield rate_limiter
+    rate_limiter._buckets.clear()
+
+
+def test_request_waits_out_retry_after(limiter):
+    server = StubServer(limited=2)
+    status, elapsed = asyncio.run(_request(server))
+    assert status == 200
+    assert server.hits == 3
+    assert elapsed >= 0.1
+    assert limiter.stats()["127.0.0.1"].throttled == 2
+
+
+def test_request_returns_429_after_max_retries(limiter):
+    server = StubServer(limited=100, retry_after="0")
+    status, _ = asyncio.run(_request(server))
+    assert status == 429
+    assert server.hits == plugin_config.valorant_rate_limit_max_retries + 1
+    assert limiter.stats()["127.0.0.1"].throttled == plugin_config.valorant_rate_limit_max_retries
@@ -0,0 +1,51 @@
+import os
+
+from nonebot_plugin_valorant.utils.render.cache import DiskQuota
+
+
+def _age(file, seconds):
+    stat = file.stat()
+    os.utime(file, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+def test_write_tracks_total_without_evicting(tmp_path):
+    disk = DiskQuota(tmp_path, quota=1000)
+    for index in range(3):
+        disk.write(tmp_path / f"{index}.png", b"x" * 100)
+    assert disk._total == 300
+    # 覆盖同名文件只计入差值
+    disk.write(tmp_path / "0.png", b"x" * 50)
+    assert disk._total == 250
+    assert sorted(file.name for file in tmp_path.iterdir()) == ["0.png", "1.png", "2.png"]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    disk = DiskQuota(tmp_path, quota=300)
+    files = [tmp_path / f"{index}.png" for index in range(3)]
+    for age, file in zip((30, 20, 10), files):
+        disk.write(file, b"x" * 100)
+        _age(file, age)
+    # 最早写入的文件刚被访问过，应保留
+    assert disk.touch(files[0])
+    disk.write(tmp_path / "3.png", b"x" * 100)
+    # 淘汰到配额的 90% 以下
+    assert sorted(file.name for file in tmp_path.glob("*.png")) == ["0.png", "3.png"]
+    assert disk._total == 200
+
+
+def test_tolerates_files_removed_elsewhere(tmp_path):
+    disk = DiskQuota(tmp_path, quota=250)
+    for index in range(2):
+        disk.write(tmp_path / f"{index}.png", b"x" * 100)
+    (tmp_path / "0.png").unlink()
+    assert not disk.touch(tmp_path / "0.png")
+    disk.write(tmp_path / "2.png", b"x" * 100)
+    # 扫描时校正累计值
+    assert disk._total == sum(file.stat().st_size for file in tmp_path.glob("*.png"))
+
+
+def test_first_write_counts_existing_files(tmp_path):
+    (tmp_path / "old.png").write_bytes(b"x" * 500)
+    disk = DiskQuota(tmp_path, quota=10_000)
+    disk.write(tmp_path / "new.png", b"x" * 100)
+    assert disk._total == 600
@@ -0,0 +1,27 @@
+import sys
+import types
+import asyncio
+
+from nonebot_plugin_valorant.utils.render.workers import RenderWorkerPool
+
+
+def test_worker_does_not_run_launch_script(tmp_path, monkeypatch):
+    # 模拟 bot.py: 子进程若重新执行启动脚本就会导入 NoneBot
+    script = tmp_path / "bot.py"
+    script.write_text("import nonebot\n")
+    main = types.ModuleType("__main__")
+    main.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, "__main__", main)
+
+    async def modules():
+        pool = RenderWorkerPool(size=1, timeout=60)
+        try:
+            return await pool.submit(eval, "sorted(__import__('sys').modules)")
+        finally:
+            await pool.close()
+
+    loaded = asyncio.run(modules())
+    assert "nonebot" not in loaded
+    # 只导入 compose，不执行插件的 __init__
+    assert "nonebot_plugin_valorant.utils.render.compose" in loaded
+    assert "nonebot_plugin_valorant.config" not in loaded
@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+import aiohttp
+
+from nonebot_plugin_valorant.config import plugin_config
+from nonebot_plugin_valorant.utils.requestlib import resilience
+from nonebot_plugin_valorant.utils.errors import ServiceDegradedError
+from nonebot_plugin_valorant.utils.requestlib.resilience import (
+    OPEN,
+    CLOSED,
+    HALF_OPEN,
+    CircuitBreaker,
+    get_breaker,
+    call_with_retry,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(resilience.asyncio, "sleep", clock.sleep)
+    resilience._breakers.clear()
+    yield clock
+    resilience._breakers.clear()
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker("host", failure_threshold=3, recovery_timeout=30)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(ServiceDegradedError):
+        breaker.before_request()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker("host", failure_threshold=3, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_one_probe(clock):
+    breaker = CircuitBreaker("host", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.now += 29
+    assert breaker.state == OPEN
+    clock.now += 1
+    assert breaker.state == HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(ServiceDegradedError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_request()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("host", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 29
+    with pytest.raises(ServiceDegradedError):
+        breaker.before_request()
+    clock.now += 1
+    breaker.before_request()
+
+
+def test_abort_releases_probe(clock):
+    breaker = CircuitBreaker("host", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.before_request()
+    breaker.abort()
+    # 中断的探测不计为失败，下一个请求可以再次探测
+    assert breaker.state == HALF_OPEN
+    breaker.before_request()
+
+
+class Flaky:
+    def __init__(self, failures: int, error: BaseException | None = None) -> None:
+        self.failures = failures
+        self.error = error or aiohttp.ClientConnectionError("down")
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return "ok"
+
+
+def test_idempotent_call_retries_with_backoff(clock):
+    func = Flaky(failures=plugin_config.valorant_retry_attempts)
+    assert asyncio.run(call_with_retry("retry.example", func)) == "ok"
+    assert func.calls == plugin_config.valorant_retry_attempts + 1
+    assert len(clock.sleeps) == plugin_config.valorant_retry_attempts
+    assert all(0 <= delay <= plugin_config.valorant_retry_backoff_max for delay in clock.sleeps)
+    assert get_breaker("retry.example").state == CLOSED
+
+
+def test_retries_exhausted_raise(clock):
+    func = Flaky(failures=100)
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(call_with_retry("exhausted.example", func))
+    assert func.calls == plugin_config.valorant_retry_attempts + 1
+
+
+def test_non_idempotent_call_is_not_retried(clock):
+    func = Flaky(failures=1)
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(call_with_retry("post.example", func, idempotent=False))
+    assert func.calls == 1
+    assert clock.sleeps == []
+
+
+def test_non_transient_error_is_not_retried(clock):
+    func = Flaky(failures=1, error=ValueError("bad payload"))
+    with pytest.raises(ValueError):
+        asyncio.run(call_with_retry("value.example", func))
+    assert func.calls == 1
+    assert get_breaker("value.example").failures == 0
+
+
+def test_open_breaker_stops_retries(clock, monkeypatch):
+    monkeypatch.setattr(plugin_config, "valorant_retry_attempts", 10)
+    monkeypatch.setattr(plugin_config, "valorant_breaker_failure_threshold", 2)
+    func = Flaky(failures=100)
+    with pytest.raises(ServiceDegradedError):
+        asyncio.run(call_with_retry("degraded.example", func))
+    assert func.calls == 2
+    assert get_breaker("degraded.example").state == OPEN
+
+
+def test_cancelled_probe_is_aborted(clock):
+    breaker = get_breaker("cancel.example")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    clock.now += breaker.recovery_timeout
+
+    async def main():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+
+        task = asyncio.create_task(call_with_retry("cancel.example", hang))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    # 被取消的探测释放名额，熔断器仍为半开
+    assert breaker.state == HALF_OPEN
+    breaker.before_request()
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from nonebot_plugin_valorant.utils.requestlib.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"value": calls}
+
+        tasks = [asyncio.create_task(flight.do("key", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert len(flight) == 1
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        assert len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_different_keys_run_separately():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch(value):
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(flight.do("a", lambda: fetch(1)), flight.do("b", lambda: fetch(2))) == [1, 2]
+
+    asyncio.run(main())
+
+
+def test_exception_is_shared_and_key_released():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def fail():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        assert calls == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        assert results[0] is results[1] is results[2]
+        assert len(flight) == 0
+
+        async def succeed():
+            return "ok"
+
+        assert await flight.do("key", succeed) == "ok"
+
+    asyncio.run(main())
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def main():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        assert await second == "done"
+        assert len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_key_released_after_call_is_cancelled():
+    async def main():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+
+        caller = asyncio.create_task(flight.do("key", hang))
+        await started.wait()
+        # 取消共享的调用本身，所有等待者都得到 CancelledError，键随之释放
+        flight._calls["key"].cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        assert len(flight) == 0
+
+        async def succeed():
+            return "again"
+
+        assert await flight.do("key", succeed) == "again"
+
+    asyncio.run(main())
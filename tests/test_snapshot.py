@@ -0,0 +1,95 @@
+import pytest
+
+from nonebot_plugin_valorant.database.snapshot import HEADER, open_snapshot, write_snapshot
+
+VERSION = {"manifestId": "ABCDEF0123456789", "branch": "release-07.00", "version": "07.00.00.1234567"}
+TIERS = [
+    {"uuid": "12683d76-48d7-84a3-4e09-6985794f0445", "name": "Select Edition", "icon": "https://example.com/t1.png"},
+    {"uuid": "0cebb8be-46d7-c12a-d306-e9907bfc5a25", "name": "Deluxe Edition", "icon": None},
+]
+SKINS = [
+    {
+        "uuid": "ff5b4d9b-4d4b-8e5a-6f9f-7a88d6c1a5a1",
+        "names": {"zh-CN": "幻象 「侦察力量」", "en-US": "Recon Phantom"},
+        "icon": "https://example.com/s1.png",
+        "tier": TIERS[0]["uuid"],
+    },
+    {
+        "uuid": "00000001-0000-0000-0000-000000000000",
+        "names": {"en-US": "Standard Vandal"},
+        "icon": None,
+        "tier": "None",
+    },
+    {
+        "uuid": "8d3c1a2b-4e5f-6a7b-8c9d-0e1f2a3b4c5d",
+        "names": None,
+        "icon": "",
+        "tier": TIERS[1]["uuid"],
+    },
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / "catalog.snapshot"
+    size = write_snapshot(path, VERSION, SKINS, TIERS)
+    assert size == path.stat().st_size
+    opened = open_snapshot(path)
+    assert opened is not None
+    yield opened
+    opened.close()
+
+
+def test_round_trip(snapshot):
+    assert snapshot.version == VERSION
+    assert snapshot.manifest_id == VERSION["manifestId"]
+    assert (snapshot.skin_count, snapshot.tier_count) == (len(SKINS), len(TIERS))
+    for skin in SKINS:
+        assert snapshot.get_skin(skin["uuid"]) == skin
+    for tier in TIERS:
+        assert snapshot.get_tier(tier["uuid"]) == tier
+
+
+def test_iteration_is_sorted(snapshot):
+    skins = list(snapshot.iter_skins())
+    tiers = list(snapshot.iter_tiers())
+    assert sorted(skins, key=lambda skin: skin["uuid"]) == sorted(SKINS, key=lambda skin: skin["uuid"])
+    assert [skin["uuid"] for skin in skins] == sorted(skin["uuid"] for skin in SKINS)
+    assert [tier["uuid"] for tier in tiers] == sorted(tier["uuid"] for tier in TIERS)
+
+
+def test_missing_uuid(snapshot):
+    assert snapshot.get_skin("ffffffff-ffff-ffff-ffff-ffffffffffff") is None
+    assert snapshot.get_skin("not-a-uuid") is None
+    assert snapshot.get_tier(SKINS[0]["uuid"]) is None
+
+
+def test_empty_snapshot(tmp_path):
+    path = tmp_path / "empty.snapshot"
+    write_snapshot(path, VERSION, [], [])
+    snapshot = open_snapshot(path)
+    assert snapshot is not None
+    assert list(snapshot.iter_skins()) == []
+    assert snapshot.get_skin(SKINS[0]["uuid"]) is None
+    snapshot.close()
+
+
+def test_missing_file(tmp_path):
+    assert open_snapshot(tmp_path / "missing.snapshot") is None
+
+
+@pytest.mark.parametrize("damage", ["magic", "truncated", "appended", "short"])
+def test_invalid_file(tmp_path, damage: str):
+    path = tmp_path / "catalog.snapshot"
+    write_snapshot(path, VERSION, SKINS, TIERS)
+    data = path.read_bytes()
+    if damage == "magic":
+        data = b"XXXX" + data[4:]
+    elif damage == "truncated":
+        data = data[:-1]
+    elif damage == "appended":
+        data += b"\0"
+    else:
+        data = data[: HEADER.size - 1]
+    path.write_bytes(data)
+    assert open_snapshot(path) is None
@@ -0,0 +1,70 @@
+import json
+import asyncio
+
+import pytest
+
+from nonebot_plugin_valorant.utils.requestlib import streaming
+from nonebot_plugin_valorant.utils.errors import DataParseError
+from nonebot_plugin_valorant.utils.requestlib.streaming import iter_json_array
+
+DOCUMENT = {
+    "status": 200,
+    "data": [
+        {"uuid": "a", "displayName": {"zh-CN": "幻象 「侦察力量」", "en-US": "Recon Phantom"}, "levels": [1, 2]},
+        {"uuid": "b", "displayName": None, "data": [], "text": 'a "quoted", ] [ string'},
+        [1, 2.5, True, None],
+        "x",
+        42,
+    ],
+}
+
+
+async def _chunks(raw: bytes, size: int):
+    for start in range(0, len(raw), size):
+        yield raw[start : start + size]
+
+
+def _collect(raw: bytes, size: int, key: str = "data") -> list:
+    async def collect():
+        return [item async for item in iter_json_array(_chunks(raw, size), key=key)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+def test_matches_full_parse(size: int):
+    raw = json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode()
+    assert _collect(raw, size) == DOCUMENT["data"]
+
+
+def test_compact_document():
+    raw = json.dumps(DOCUMENT, ensure_ascii=False, separators=(",", ":")).encode()
+    assert _collect(raw, 5) == DOCUMENT["data"]
+
+
+def test_empty_array():
+    assert _collect(b'{"status": 200, "data": [ ]}', 3) == []
+
+
+@pytest.mark.parametrize("raw", [b'{"status": 200, "data": [{"uuid": "a"}, {"uu', b'{"status": 404, "error": "x"}'])
+def test_incomplete_document(raw: bytes):
+    with pytest.raises(DataParseError):
+        _collect(raw, 4)
+
+
+def test_large_element_is_parsed_linearly(monkeypatch: pytest.MonkeyPatch):
+    calls = 0
+
+    class CountingDecoder(json.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            nonlocal calls
+            calls += 1
+            return super().raw_decode(s, idx)
+
+    monkeypatch.setattr(streaming.json, "JSONDecoder", CountingDecoder)
+    element = {"uuid": "a", "levels": [{"index": i, "name": "x" * 32} for i in range(2000)]}
+    raw = json.dumps({"data": [element, element]}).encode()
+
+    assert _collect(raw, 256) == [element, element]
+    # 每个元素约 10 万字节、400 个分块，逐块重试需要数百次解析
+    assert calls <= 40
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+import aiohttp
+
+from nonebot_plugin_valorant.resources.image import skin
+from nonebot_plugin_valorant.utils.errors import ResponseError, ServiceDegradedError
+
+
+class FakeStore:
+    """按 uuid 依次返回预设结果的资源存储。"""
+
+    def __init__(self, outcomes: dict[str, list[BaseException | None]]) -> None:
+        self.outcomes = outcomes
+        self.calls: list[str] = []
+
+    async def open(self) -> None:
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+    async def prepare(self, uuids, concurrency: int = 1) -> int:
+        return len(list(uuids))
+
+    async def fetch(self, uuid: str, url: str) -> None:
+        self.calls.append(uuid)
+        outcomes = self.outcomes.get(uuid)
+        error = outcomes.pop(0) if outcomes else None
+        if error is not None:
+            raise error
+
+
+@pytest.fixture
+def store(monkeypatch):
+    def install(outcomes):
+        store = FakeStore(outcomes)
+        monkeypatch.setattr(skin, "asset_store", store)
+        return store
+
+    async def plan(assets):
+        return assets
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(skin, "plan_sync", plan)
+    monkeypatch.setattr(skin.asyncio, "sleep", no_sleep)
+    return install
+
+
+def _assets(count: int) -> list[tuple[str, str]]:
+    return [(str(index), f"https://media.example/{index}.png") for index in range(count)]
+
+
+def test_only_payload_errors_are_retried(store):
+    fake = store(
+        {
+            "0": [aiohttp.ClientPayloadError("cut off")],
+            "1": [aiohttp.ClientConnectionError("down")],
+            "2": [ResponseError("errors.API.REQUEST_FAILED")],
+        }
+    )
+    result = asyncio.run(skin.sync_assets(_assets(3), concurrency=1, attempts=3))
+    assert result == {"downloaded": 1, "failed": 2, "skipped": 0}
+    # 连接错误已由 HTTPClient 重试，不再重复
+    assert fake.calls == ["0", "0", "1", "2"]
+
+
+def test_open_breaker_stops_the_queue(store):
+    fake = store({"1": [ServiceDegradedError("errors.API.SERVICE_DEGRADED")]})
+    result = asyncio.run(skin.sync_assets(_assets(10), concurrency=1))
+    assert result == {"downloaded": 1, "failed": 9, "skipped": 0}
+    assert fake.calls == ["0", "1"]